@@ -5,3 +5,10 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.authentication"
     verbose_name = "Authentication"
+
+    def ready(self):
+        from apps.authentication.keys import install_token_backend
+        from apps.authentication.signals import connect_signals
+
+        connect_signals()
+        install_token_backend()
@@ -0,0 +1,50 @@
+"""
+DRF authentication classes for the authentication app.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from apps.authentication.services.token_cache import (
+    cache_token,
+    get_cached_token,
+    is_token_revoked,
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that validates each distinct token once per process.
+
+    Repeat requests with the same token skip decoding and signature
+    verification. Revocation and the user are still checked on every
+    request, so logout, deactivation and password changes take effect
+    immediately in every process. The revocation check costs one shared
+    cache read per authenticated request, as tokens that are not revoked
+    are not remembered locally.
+    """
+
+    def get_validated_token(self, raw_token):
+        """
+        Return the validated token, from the token cache when possible.
+        """
+        token = get_cached_token(raw_token)
+        cached = token is not None
+        if not cached:
+            token = super().get_validated_token(raw_token)
+
+        if is_token_revoked(token):
+            raise InvalidToken(_("Token has been revoked"))
+        if not cached:
+            cache_token(raw_token, token)
+        return token
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """
+    OpenAPI security scheme for ``CachedJWTAuthentication``.
+    """
+
+    target_class = CachedJWTAuthentication
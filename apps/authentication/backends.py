@@ -5,12 +5,18 @@ Authentication backends for the authentication app.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
 
+from apps.authentication.services.permission_cache import get_cached_permissions
+
 User = get_user_model()
 
 
 class EmailBackend(ModelBackend):
     """
     Authentication backend that allows users to authenticate with their email.
+
+    Permission lookups are served from the permission cache, so ``has_perm``
+    is a set membership test instead of a query joining groups and
+    permissions.
     """
     
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -25,18 +31,53 @@ class EmailBackend(ModelBackend):
         Returns:
             The authenticated user or None.
         """
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
         if username is None or password is None:
             return None
         
-        try:
-            user = User.objects.get(email=username)
-        except User.DoesNotExist:
+        # Case-insensitive, served by the UPPER(email) index
+        users = list(User.objects.filter(email__iexact=username))
+        if len(users) > 1:
+            # Addresses differing only in case need an exact match
+            users = [user for user in users if user.email == username]
+        if len(users) != 1:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user.
             User().set_password(password)
             return None
+        user = users[0]
         
         if user.check_password(password) and self.user_can_authenticate(user):
             return user
         
         return None
+
+    def get_user_permissions(self, user_obj, obj=None):
+        """
+        Return the permissions granted to the user directly.
+        """
+        return self._get_cached_permissions(user_obj, obj, "user")
+
+    def get_group_permissions(self, user_obj, obj=None):
+        """
+        Return the permissions the user has through their groups.
+        """
+        return self._get_cached_permissions(user_obj, obj, "group")
+
+    def _get_cached_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if not hasattr(user_obj, perm_cache_name):
+            permissions = get_cached_permissions(
+                user_obj,
+                lambda: {
+                    "user": super(EmailBackend, self).get_user_permissions(user_obj),
+                    "group": super(EmailBackend, self).get_group_permissions(user_obj),
+                },
+            )
+            user_obj._user_perm_cache = set(permissions["user"])
+            user_obj._group_perm_cache = set(permissions["group"])
+        return getattr(user_obj, perm_cache_name)
@@ -0,0 +1,183 @@
+"""
+Asymmetric JWT signing keys for the authentication app.
+
+Keys are PEM files listed in ``JWT_KEY_FILES``. The first must be a private
+key and signs new tokens; the rest (private or public) only verify, so a key
+can be rotated by prepending its successor and dropping it once every token
+it signed has expired. Each key is identified by its RFC 7638 thumbprint,
+sent as the ``kid`` header of tokens and published in the JWKS document.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import jwt
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import (
+    TokenBackendError,
+    TokenBackendExpiredToken,
+)
+
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+    from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+except ImportError:  # pragma: no cover
+    serialization = None
+
+# Members of each key type's JWK that make up its RFC 7638 thumbprint
+THUMBPRINT_MEMBERS = {"OKP": ("crv", "kty", "x"), "RSA": ("e", "kty", "n")}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """
+    A parsed JWT key and the metadata needed to use and publish it.
+    """
+
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Optional[Any] = None
+
+    def to_jwk(self) -> Dict[str, str]:
+        """
+        Return the public JWK for this key.
+        """
+        if self.algorithm == "EdDSA":
+            jwk = OKPAlgorithm.to_jwk(self.public_key, as_dict=True)
+        else:
+            jwk = RSAAlgorithm.to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+def load_key(pem: bytes) -> SigningKey:
+    """
+    Parse a PEM encoded Ed25519 or RSA key, private or public.
+
+    Raises:
+        ValueError: If the key is of an unsupported type.
+    """
+    if serialization is None:  # pragma: no cover
+        raise ImportError("Asymmetric JWT keys require the cryptography package.")
+
+    if b"PRIVATE KEY" in pem:
+        private_key = serialization.load_pem_private_key(pem, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = serialization.load_pem_public_key(pem)
+
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        algorithm = "EdDSA"
+        jwk = OKPAlgorithm.to_jwk(public_key, as_dict=True)
+    elif isinstance(public_key, rsa.RSAPublicKey):
+        algorithm = "RS256"
+        jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    else:
+        raise ValueError("JWT keys must be Ed25519 or RSA keys.")
+
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(
+        json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+    ).digest()
+    kid = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    return SigningKey(kid, algorithm, public_key, private_key)
+
+
+@lru_cache(maxsize=None)
+def get_signing_keys() -> Tuple[SigningKey, ...]:
+    """
+    Return the configured keys, read and parsed once per process.
+    """
+    keys = []
+    for path in settings.JWT_KEY_FILES:
+        with open(path, "rb") as file:
+            keys.append(load_key(file.read()))
+    if keys and keys[0].private_key is None:
+        raise ValueError("The first entry of JWT_KEY_FILES must be a private key.")
+    return tuple(keys)
+
+
+def get_jwks() -> Dict[str, Any]:
+    """
+    Return the JSON Web Key Set of the configured keys.
+    """
+    return {"keys": [key.to_jwk() for key in get_signing_keys()]}
+
+
+class KeySetTokenBackend(TokenBackend):
+    """
+    Token backend signing with the newest key and verifying by ``kid``.
+    """
+
+    def __init__(self, keys: Sequence[SigningKey], **kwargs):
+        super().__init__(keys[0].algorithm, **kwargs)
+        self.current_key = keys[0]
+        self.keys = {key.kid: key for key in keys}
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+        return jwt.encode(
+            jwt_payload,
+            self.current_key.private_key,
+            algorithm=self.current_key.algorithm,
+            headers={"kid": self.current_key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        try:
+            key = self.keys.get(jwt.get_unverified_header(str(token)).get("kid"))
+            if key is None:
+                raise TokenBackendError(_("Token is invalid"))
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise TokenBackendExpiredToken(_("Token is expired")) from e
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+
+def install_token_backend() -> None:
+    """
+    Make simplejwt sign and verify with ``JWT_KEY_FILES``, if configured.
+
+    simplejwt's token classes resolve ``rest_framework_simplejwt.state.
+    token_backend`` on first use, so replacing it at startup covers token
+    issue, refresh, verification and ``JWTAuthentication``.
+    """
+    keys = get_signing_keys()
+    if not keys:
+        return
+
+    from rest_framework_simplejwt import state
+    from rest_framework_simplejwt.settings import api_settings
+
+    state.token_backend = KeySetTokenBackend(
+        keys,
+        audience=api_settings.AUDIENCE,
+        issuer=api_settings.ISSUER,
+        leeway=api_settings.LEEWAY,
+        json_encoder=api_settings.JSON_ENCODER,
+    )
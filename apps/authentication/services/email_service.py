@@ -0,0 +1,62 @@
+"""
+Email service for the authentication app.
+"""
+
+from django.conf import settings
+
+from apps.authentication.services.token_service import (
+    generate_email_verification_token,
+    generate_password_reset_token,
+)
+from apps.emails.services.outbox import enqueue_email
+
+
+def send_password_reset_email(user):
+    """
+    Queue a password reset email for a user.
+
+    Args:
+        user: The user who requested the reset.
+
+    Returns:
+        The relative reset link included in the email.
+    """
+    uid, token = generate_password_reset_token(user)
+    reset_link = f"/reset-password/{uid}/{token}/"
+
+    enqueue_email(
+        subject="Reset your password",
+        body=(
+            f"Hi {user.get_short_name() or user.email},\n\n"
+            "Use the link below to choose a new password:\n\n"
+            f"{settings.FRONTEND_URL}{reset_link}\n\n"
+            "If you did not request a password reset, you can ignore this email."
+        ),
+        to=[user.email],
+    )
+    return reset_link
+
+
+def send_verification_email(user):
+    """
+    Queue an email address verification email for a user.
+
+    Args:
+        user: The user whose email should be verified.
+
+    Returns:
+        The relative verification link included in the email.
+    """
+    uid, token = generate_email_verification_token(user)
+    verification_link = f"/verify-email/{uid}/{token}/"
+
+    enqueue_email(
+        subject="Verify your email address",
+        body=(
+            f"Hi {user.get_short_name() or user.email},\n\n"
+            "Please confirm your email address by opening the link below:\n\n"
+            f"{settings.FRONTEND_URL}{verification_link}\n"
+        ),
+        to=[user.email],
+    )
+    return verification_link
@@ -0,0 +1,107 @@
+"""
+Permission cache service for the authentication app.
+
+Each user's resolved permissions are stored in two tiers: a small in-process
+LRU and the shared Django cache. Shared entries are keyed by a per-user
+version and a global version, so invalidation only has to bump a counter:
+the user's version when their groups or direct permissions change, the
+global one when a group's permissions change. In-process entries live for
+``PERMISSION_CACHE_LOCAL_TIMEOUT`` seconds, which bounds how long other
+processes may serve permissions that were just revoked.
+"""
+
+import time
+from typing import Callable, Dict, FrozenSet, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.utils.cache import LRUCache
+
+CACHE_PREFIX = "auth:perms"
+GLOBAL_VERSION_KEY = f"{CACHE_PREFIX}:version"
+
+local_cache = LRUCache(maxsize=getattr(settings, "PERMISSION_CACHE_LOCAL_SIZE", 10000))
+
+
+def _user_version_key(user_id) -> str:
+    return f"{CACHE_PREFIX}:version:{user_id}"
+
+
+def _new_version() -> int:
+    # Versions restart from the clock, never from a value that may still
+    # name entries written before the counter was evicted.
+    return time.time_ns()
+
+
+def _get_versions(user_id):
+    user_key = _user_version_key(user_id)
+    versions = cache.get_many([GLOBAL_VERSION_KEY, user_key])
+    missing = {
+        key: _new_version()
+        for key in (GLOBAL_VERSION_KEY, user_key)
+        if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions[user_key], versions[GLOBAL_VERSION_KEY]
+
+
+def get_cached_permissions(
+    user, loader: Callable[[], Dict[str, FrozenSet[str]]]
+) -> Dict[str, FrozenSet[str]]:
+    """
+    Return a user's permissions, resolving them with ``loader`` on a miss.
+
+    Args:
+        user: An active, saved user.
+        loader: Returns ``{"user": ..., "group": ...}`` permission name sets.
+
+    Returns:
+        A mapping of ``"user"`` and ``"group"`` to frozensets of
+        ``"app_label.codename"`` strings.
+    """
+    local_key = (user.pk, user.is_superuser)
+    permissions = local_cache.get(local_key)
+    if permissions is not None:
+        return permissions
+
+    user_version, global_version = _get_versions(user.pk)
+    key = (
+        f"{CACHE_PREFIX}:{user.pk}:{int(user.is_superuser)}"
+        f":{user_version}:{global_version}"
+    )
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = {name: frozenset(perms) for name, perms in loader().items()}
+        cache.set(key, permissions, settings.PERMISSION_CACHE_TIMEOUT)
+
+    local_cache.set(
+        local_key,
+        permissions,
+        local_cache.clock() + settings.PERMISSION_CACHE_LOCAL_TIMEOUT,
+    )
+    return permissions
+
+
+def invalidate_users(user_ids: Iterable) -> None:
+    """
+    Drop the cached permissions of the given users.
+    """
+    user_ids = list(user_ids)
+    cache.set_many(
+        {_user_version_key(user_id): _new_version() for user_id in user_ids},
+        timeout=None,
+    )
+    for user_id in user_ids:
+        local_cache.delete((user_id, False))
+        local_cache.delete((user_id, True))
+
+
+def invalidate_all() -> None:
+    """
+    Drop the cached permissions of every user.
+    """
+    cache.set(GLOBAL_VERSION_KEY, _new_version(), timeout=None)
+    local_cache.clear()
@@ -0,0 +1,81 @@
+"""
+Verified token cache service for the authentication app.
+
+Validating an access token means decoding it, checking its signature and
+checking its claims, and clients send the same token on every request
+until it expires. Validated tokens are kept in a per-process LRU keyed by
+a digest of the raw token, until the sooner of the token's ``exp`` and
+``TOKEN_CACHE_LOCAL_TIMEOUT`` seconds. Revoked token IDs are recorded in
+the shared Django cache until the token would have expired, and checked on
+every request, cache hit or not, so a revocation applies in every process
+at once.
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from apps.core.utils.cache import LRUCache
+
+CACHE_PREFIX = "auth:revoked"
+
+local_cache = LRUCache(maxsize=getattr(settings, "TOKEN_CACHE_LOCAL_SIZE", 10000))
+
+
+def get_token_digest(raw_token) -> bytes:
+    """
+    Return the cache key of an encoded token.
+    """
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).digest()
+
+
+def _revoked_key(jti) -> str:
+    return f"{CACHE_PREFIX}:{jti}"
+
+
+def _seconds_left(token: Token) -> float:
+    return token.get("exp", 0) - time.time()
+
+
+def get_cached_token(raw_token) -> Optional[Token]:
+    """
+    Return the validated token cached for ``raw_token``, if any.
+    """
+    return local_cache.get(get_token_digest(raw_token))
+
+
+def cache_token(raw_token, token: Token) -> None:
+    """
+    Cache a freshly validated token until it expires or must be rechecked.
+    """
+    lifetime = min(_seconds_left(token), settings.TOKEN_CACHE_LOCAL_TIMEOUT)
+    if lifetime > 0:
+        local_cache.set(
+            get_token_digest(raw_token), token, local_cache.clock() + lifetime
+        )
+
+
+def is_token_revoked(token: Token) -> bool:
+    """
+    Return whether ``token`` has been revoked with ``revoke_token``.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti is not None and cache.get(_revoked_key(jti)) is not None
+
+
+def revoke_token(token: Token) -> None:
+    """
+    Reject ``token`` from now until it expires.
+    """
+    local_cache.delete(get_token_digest(str(token)))
+    jti = token.get(api_settings.JTI_CLAIM)
+    seconds_left = _seconds_left(token)
+    if jti is not None and seconds_left > 0:
+        cache.set(_revoked_key(jti), True, int(seconds_left) + 1)
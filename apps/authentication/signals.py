@@ -0,0 +1,76 @@
+"""
+Signal handlers for the authentication app.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete
+
+from apps.authentication.services.permission_cache import (
+    invalidate_all,
+    invalidate_users,
+)
+
+User = get_user_model()
+
+CHANGE_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+
+def user_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidate users whose groups or direct permissions changed.
+    """
+    if action not in CHANGE_ACTIONS:
+        return
+    if not reverse:
+        user_ids = [instance.pk]
+    elif pk_set is not None:
+        user_ids = list(pk_set)
+    else:
+        # A group or permission was cleared of all its users
+        transaction.on_commit(invalidate_all)
+        return
+    transaction.on_commit(lambda: invalidate_users(user_ids))
+
+
+def group_permissions_changed(sender, action, **kwargs):
+    """
+    Invalidate everyone when a group's permissions change.
+    """
+    if action in CHANGE_ACTIONS:
+        transaction.on_commit(invalidate_all)
+
+
+def permission_source_deleted(sender, **kwargs):
+    """
+    Invalidate everyone when a group or permission is deleted.
+    """
+    transaction.on_commit(invalidate_all)
+
+
+def connect_signals():
+    """
+    Connect the permission cache invalidation handlers.
+    """
+    m2m_changed.connect(
+        user_relations_changed,
+        sender=User.groups.through,
+        dispatch_uid="auth_perm_cache_user_groups",
+    )
+    m2m_changed.connect(
+        user_relations_changed,
+        sender=User.user_permissions.through,
+        dispatch_uid="auth_perm_cache_user_permissions",
+    )
+    m2m_changed.connect(
+        group_permissions_changed,
+        sender=Group.permissions.through,
+        dispatch_uid="auth_perm_cache_group_permissions",
+    )
+    for model in (Group, Permission):
+        post_delete.connect(
+            permission_source_deleted,
+            sender=model,
+            dispatch_uid=f"auth_perm_cache_{model.__name__.lower()}_deleted",
+        )
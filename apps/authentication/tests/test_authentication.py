@@ -0,0 +1,122 @@
+"""
+Tests for the authentication app authentication classes.
+"""
+
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.authentication.authentication import CachedJWTAuthentication
+from apps.authentication.services import token_cache
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Tests for authenticating with cached verified tokens.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        cache.clear()
+        token_cache.local_cache.clear()
+        self.addCleanup(token_cache.local_cache.clear)
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def _authenticate(self, token=None):
+        request = RequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token or self.token}"
+        )
+        return self.authentication.authenticate(request)
+
+    def test_token_is_verified_once(self):
+        """
+        Test that repeat requests reuse the verified token.
+        """
+        with mock.patch.object(
+            AccessToken, "verify", autospec=True, side_effect=AccessToken.verify
+        ) as verify:
+            first_user, first_token = self._authenticate()
+            user, token = self._authenticate()
+
+        self.assertEqual(verify.call_count, 1)
+        self.assertIs(token, first_token)
+        self.assertEqual(user, self.user)
+
+    @override_settings(TOKEN_CACHE_LOCAL_TIMEOUT=60)
+    def test_entries_expire_with_the_token(self):
+        """
+        Test that a token is cached until it expires, at most the local timeout.
+        """
+        now = [1000.0]
+        token_cache.local_cache.clock = lambda: now[0]
+        self.addCleanup(setattr, token_cache.local_cache, "clock", time.monotonic)
+
+        short_lived = AccessToken.for_user(self.user)
+        short_lived.set_exp(lifetime=timedelta(seconds=10))
+        self._authenticate(short_lived)
+        self._authenticate()
+
+        now[0] += 11
+        self.assertIsNone(token_cache.get_cached_token(str(short_lived)))
+        self.assertIsNotNone(token_cache.get_cached_token(str(self.token)))
+
+        now[0] += 60
+        self.assertIsNone(token_cache.get_cached_token(str(self.token)))
+
+    def test_revoked_tokens_are_rejected(self):
+        """
+        Test that a revoked token stops authenticating.
+        """
+        self._authenticate()
+        token_cache.revoke_token(self.token)
+        with self.assertRaises(InvalidToken):
+            self._authenticate()
+
+    def test_logout_applies_to_warm_caches(self):
+        """
+        Test that a token logged out elsewhere is rejected on a cache hit.
+        """
+        self._authenticate()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        # Blacklisting the refresh token is not under test here
+        with mock.patch.object(RefreshToken, "blacklist", create=True):
+            response = client.post(
+                reverse("logout"),
+                {"refresh": str(RefreshToken.for_user(self.user))},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Another process still holds the verified token in its local cache
+        token_cache.cache_token(str(self.token), self.token)
+        self.assertIsNotNone(token_cache.get_cached_token(str(self.token)))
+        with self.assertRaises(InvalidToken):
+            self._authenticate()
+
+    def test_user_state_is_checked_on_cache_hits(self):
+        """
+        Test that deactivating a user takes effect immediately.
+        """
+        self._authenticate()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
@@ -0,0 +1,51 @@
+"""
+Tests for the authentication app backends.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.authentication.backends import EmailBackend
+
+User = get_user_model()
+
+
+class EmailBackendTests(TestCase):
+    """
+    Tests for the email authentication backend.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.backend = EmailBackend()
+        self.user = User.objects.create_user(
+            email="Test@example.com", password="testpassword"
+        )
+
+    def test_email_lookup_is_case_insensitive(self):
+        """
+        Test that users can log in regardless of email case.
+        """
+        user = self.backend.authenticate(
+            None, username="test@EXAMPLE.com", password="testpassword"
+        )
+        self.assertEqual(user, self.user)
+
+    def test_case_duplicates_require_exact_match(self):
+        """
+        Test that addresses differing only in case are told apart exactly.
+        """
+        other = User.objects.create_user(
+            email="test@example.com", password="otherpassword"
+        )
+        user = self.backend.authenticate(
+            None, username="test@example.com", password="otherpassword"
+        )
+        self.assertEqual(user, other)
+        self.assertIsNone(
+            self.backend.authenticate(
+                None, username="TEST@example.com", password="otherpassword"
+            )
+        )
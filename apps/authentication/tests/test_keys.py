@@ -0,0 +1,123 @@
+"""
+Tests for the authentication app asymmetric JWT keys.
+"""
+
+import os
+import shutil
+import tempfile
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.authentication import keys
+
+User = get_user_model()
+
+
+def write_key(directory, name, private_key, public_only=False):
+    if public_only:
+        pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    else:
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    path = os.path.join(directory, name)
+    with open(path, "wb") as file:
+        file.write(pem)
+    return path
+
+
+class SigningKeyTests(APITestCase):
+    """
+    Tests for signing tokens with rotating asymmetric keys.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.new_key = ed25519.Ed25519PrivateKey.generate()
+        self.old_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.new_path = write_key(self.directory, "new.pem", self.new_key)
+        self.old_path = write_key(
+            self.directory, "old.pem", self.old_key, public_only=True
+        )
+        self.user = User.objects.create_user(email="test@example.com", password="pw")
+
+        original_backend = state.token_backend
+        self.addCleanup(setattr, state, "token_backend", original_backend)
+        self.addCleanup(keys.get_signing_keys.cache_clear)
+
+    def _use_keys(self, *paths):
+        keys.get_signing_keys.cache_clear()
+        with override_settings(JWT_KEY_FILES=list(paths)):
+            keys.install_token_backend()
+
+    def test_tokens_are_signed_with_newest_key(self):
+        """
+        Test that new tokens carry the newest key's kid and algorithm.
+        """
+        self._use_keys(self.new_path, self.old_path)
+        token = str(RefreshToken.for_user(self.user).access_token)
+        header = jwt.get_unverified_header(token)
+        self.assertEqual(header["alg"], "EdDSA")
+        self.assertEqual(header["kid"], keys.get_signing_keys()[0].kid)
+
+        # Verifiable with nothing but the published public key
+        jwk = jwt.PyJWK(keys.get_jwks()["keys"][0])
+        payload = jwt.decode(token, jwk.key, algorithms=["EdDSA"])
+        self.assertEqual(payload["user_id"], str(self.user.pk))
+
+    def test_tokens_from_previous_key_still_verify(self):
+        """
+        Test that rotating keys keeps older tokens valid until removed.
+        """
+        old_signer = write_key(self.directory, "old-private.pem", self.old_key)
+        self._use_keys(old_signer)
+        token = str(RefreshToken.for_user(self.user).access_token)
+
+        self._use_keys(self.new_path, self.old_path)
+        self.assertEqual(AccessToken(token)["user_id"], str(self.user.pk))
+
+        self._use_keys(self.new_path)
+        with self.assertRaises(TokenError):
+            AccessToken(token)
+
+    def test_jwks_endpoint(self):
+        """
+        Test that the key set is published with cache headers.
+        """
+        self._use_keys(self.new_path, self.old_path)
+        response = self.client.get(reverse("jwks"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age=", response["Cache-Control"])
+        published = response.json()["keys"]
+        self.assertEqual([key["alg"] for key in published], ["EdDSA", "RS256"])
+        self.assertEqual(
+            [key["kid"] for key in published],
+            [key.kid for key in keys.get_signing_keys()],
+        )
+
+    def test_first_key_must_be_private(self):
+        """
+        Test that a public key cannot be the signing key.
+        """
+        keys.get_signing_keys.cache_clear()
+        with override_settings(JWT_KEY_FILES=[self.old_path]):
+            with self.assertRaises(ValueError):
+                keys.get_signing_keys()
@@ -0,0 +1,99 @@
+"""
+Tests for the authentication app permission cache.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.authentication.services import permission_cache
+
+User = get_user_model()
+
+
+class PermissionCacheTests(TestCase):
+    """
+    Tests for cached permission resolution and its invalidation.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        cache.clear()
+        permission_cache.local_cache.clear()
+        self.addCleanup(permission_cache.local_cache.clear)
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        self.group = Group.objects.create(name="editors")
+        self.view_user = Permission.objects.get(codename="view_user")
+        self.change_user = Permission.objects.get(codename="change_user")
+
+    def _fresh_user(self):
+        # Django also caches permissions on the instance for one request
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissions_are_cached(self):
+        """
+        Test that repeat checks on new instances do not query the database.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.view_user)
+        self.assertTrue(self._fresh_user().has_perm("users.view_user"))
+
+        user = self._fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("users.view_user"))
+            self.assertFalse(user.has_perm("users.change_user"))
+
+    def test_user_permission_changes_invalidate(self):
+        """
+        Test that adding a direct permission is visible immediately.
+        """
+        self.assertFalse(self._fresh_user().has_perm("users.change_user"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.change_user)
+        self.assertTrue(self._fresh_user().has_perm("users.change_user"))
+
+    def test_group_membership_changes_invalidate(self):
+        """
+        Test that joining or leaving a group is visible immediately.
+        """
+        self.group.permissions.add(self.change_user)
+        self.assertFalse(self._fresh_user().has_perm("users.change_user"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.add(self.user)
+        self.assertTrue(self._fresh_user().has_perm("users.change_user"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.clear()
+        self.assertFalse(self._fresh_user().has_perm("users.change_user"))
+
+    def test_group_permission_changes_invalidate(self):
+        """
+        Test that editing a group's permissions reaches its members.
+        """
+        self.user.groups.add(self.group)
+        self.assertFalse(self._fresh_user().has_perm("users.change_user"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(self.change_user)
+        self.assertEqual(
+            self._fresh_user().get_group_permissions(), {"users.change_user"}
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.delete()
+        self.assertFalse(self._fresh_user().has_perm("users.change_user"))
+
+    def test_inactive_users_have_no_permissions(self):
+        """
+        Test that inactive users get no permissions from the cache.
+        """
+        self.user.user_permissions.add(self.view_user)
+        user = self._fresh_user()
+        user.is_active = False
+        self.assertEqual(user.get_all_permissions(), set())
@@ -9,6 +9,7 @@ from apps.authentication.views import (
     CustomTokenObtainPairView,
     CustomTokenRefreshView,
     EmailVerificationView,
+    JWKSView,
     LoginView,
     LogoutView,
     PasswordResetConfirmView,
@@ -20,6 +21,7 @@ urlpatterns = [
     path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path(".well-known/jwks.json", JWKSView.as_view(), name="jwks"),
     
     # Login and logout
     path("login/", LoginView.as_view(), name="login"),
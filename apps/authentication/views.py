@@ -2,17 +2,21 @@
 Views for the authentication app.
 """
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.encoding import force_bytes, force_str
-from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.cache import patch_cache_control
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import RefreshToken, Token
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.authentication.keys import get_jwks
 from apps.authentication.serializers import (
     CustomTokenObtainPairSerializer,
     EmailVerificationSerializer,
@@ -20,6 +24,8 @@ from apps.authentication.serializers import (
     PasswordResetConfirmSerializer,
     PasswordResetRequestSerializer,
 )
+from apps.authentication.services.email_service import send_password_reset_email
+from apps.authentication.services.token_cache import revoke_token
 from apps.core.utils.helpers import format_response
 from apps.core.schemas import custom_extend_schema
 
@@ -130,7 +136,10 @@ class LogoutView(APIView):
             "required": ["refresh"],
         },
         summary="User logout",
-        description="Log out a user by blacklisting their refresh token",
+        description=(
+            "Log out a user by blacklisting their refresh token and revoking "
+            "the access token used for the request"
+        ),
         tags=["Authentication"],
     )
     def post(self, request):
@@ -142,6 +151,8 @@ class LogoutView(APIView):
             if refresh_token:
                 token = RefreshToken(refresh_token)
                 token.blacklist()
+            if isinstance(request.auth, Token):
+                revoke_token(request.auth)
 
             return Response(
                 format_response(message="Logout successful"),
@@ -180,32 +191,18 @@ class PasswordResetRequestView(APIView):
 
         email = serializer.validated_data["email"]
 
-        try:
-            user = User.objects.get(email=email)
-
-            # Generate token and UID
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            token = default_token_generator.make_token(user)
-
-            # In a real application, you would send an email with the reset link
-            # For this template, we'll just return the token and UID
-            reset_link = f"/reset-password/{uid}/{token}/"
-
-            # TODO: Send email with reset link
+        user = User.objects.filter(email=email).first()
+        if user is not None:
+            # The email is queued in the outbox and sent by a worker, so the
+            # response does not wait on the mail server
+            send_password_reset_email(user)
 
-            return Response(
-                format_response(
-                    message="Password reset email sent",
-                    data={"reset_link": reset_link},  # Remove this in production
-                ),
-                status=status.HTTP_200_OK,
-            )
-        except User.DoesNotExist:
-            # We don't want to reveal that the email doesn't exist
-            return Response(
-                format_response(message="Password reset email sent"),
-                status=status.HTTP_200_OK,
-            )
+        # The same response either way, so it reveals neither whether the
+        # email exists nor the reset link, which only the email carries
+        return Response(
+            format_response(message="Password reset email sent"),
+            status=status.HTTP_200_OK,
+        )
 
 
 class PasswordResetConfirmView(APIView):
@@ -330,3 +327,30 @@ class EmailVerificationView(APIView):
                 ),
                 status=error_code,
             )
+
+
+class JWKSView(APIView):
+    """
+    View publishing the public keys that verify our JWTs.
+
+    Returns a bare JSON Web Key Set, as JWT libraries expect, so other
+    services can verify access tokens locally instead of calling
+    ``token/verify/``.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer]
+
+    @custom_extend_schema(
+        summary="JSON Web Key Set",
+        description="Public keys for verifying access tokens, keyed by kid",
+        tags=["Authentication"],
+    )
+    def get(self, request):
+        """
+        Return the JSON Web Key Set.
+        """
+        response = Response(get_jwks())
+        patch_cache_control(response, public=True, max_age=settings.JWKS_MAX_AGE)
+        return response
@@ -0,0 +1,37 @@
+"""
+Admin helpers for the project.
+"""
+
+from django.utils.text import smart_split, unescape_string_literal
+
+from apps.core.filters import is_indexable_search_field, search_queryset
+
+
+class IndexedSearchAdminMixin:
+    """
+    ModelAdmin mixin that answers the changelist search from search indexes.
+
+    Applies when every entry in ``search_fields`` is a plain text field;
+    otherwise the default ``ILIKE`` search is used.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        terms = [
+            (
+                unescape_string_literal(term)
+                if term[0] in "\"'" and term[-1] == term[0]
+                else term
+            )
+            for term in smart_split(search_term)
+        ]
+        if (
+            not search_fields
+            or not terms
+            or not all(
+                is_indexable_search_field(queryset.model, field)
+                for field in search_fields
+            )
+        ):
+            return super().get_search_results(request, queryset, search_term)
+        return search_queryset(queryset, search_fields, terms), False
@@ -1,7 +1,36 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
     verbose_name = "Core"
+
+    def ready(self):
+        from apps.core.tracing import configure_tracing, connect_task_signals
+
+        configure_tracing()
+        connect_task_signals()
+
+        from apps.core.db.slow_queries import connect_recorder
+
+        connect_recorder()
+
+        if any(database.get("POOL") for database in settings.DATABASES.values()):
+            from apps.core.db.metrics import register_pool_metrics
+
+            register_pool_metrics()
+
+        # Checked before importing, as the cache backends load redis
+        if any(
+            cache["BACKEND"].startswith("apps.core.cache.")
+            for cache in settings.CACHES.values()
+        ):
+            from apps.core.cache.metrics import (
+                get_tiered_aliases,
+                register_cache_metrics,
+            )
+
+            if get_tiered_aliases():
+                register_cache_metrics()
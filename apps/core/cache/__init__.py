@@ -0,0 +1,3 @@
+"""
+Cache backends for the project.
+"""
@@ -0,0 +1,495 @@
+"""
+Two-tier cache backend for the project.
+
+``TieredRedisCache`` is django-redis's ``RedisCache`` with a bounded
+in-process LRU in front of it, so hot keys are served from memory instead
+of costing a round trip each. Writes go to Redis first, then update the
+local tier and publish the changed keys on a pub/sub channel; every other
+process drops them from its own local tier.
+
+Local entries also expire after ``LOCAL_TIMEOUT`` seconds, which bounds how
+stale a value may be if an invalidation is lost, or sooner if the key
+expires sooner in Redis. While a process is not
+subscribed to the channel, it bypasses its local tier entirely. Keys
+matching a ``LOCAL_EXCLUDE`` pattern are never cached locally nor
+broadcast. Use this for keys that change on most requests, such as
+throttle counters.
+
+``OPTIONS`` accepts django-redis's options and:
+
+- ``LOCAL_MAX_ENTRIES``: size of the local tier; 0 disables it.
+- ``LOCAL_TIMEOUT``: seconds a value is served from memory.
+- ``LOCAL_EXCLUDE``: ``fnmatch`` patterns of keys kept out of the local tier.
+- ``INVALIDATION_CHANNEL``: the pub/sub channel name.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache, omit_exception
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+
+from apps.core.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Values of these types are cached as is; anything else is pickled, so
+# callers cannot mutate the cached copy
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class _Pickled(bytes):
+    pass
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits or misses else 0.0
+
+
+class LocalTier:
+    """
+    The in-process tier shared by one process's instances of a cache.
+
+    Django creates a cache backend per thread, so the LRU, its statistics
+    and the invalidation subscriber live here instead, one per process.
+    """
+
+    reconnect_delay = 0.5
+    max_reconnect_delay = 30.0
+    poll_interval = 1.0
+
+    def __init__(self, channel: str, maxsize: int):
+        self.channel = channel
+        self.local = LRUCache(maxsize=maxsize)
+        self.sender = uuid.uuid4().hex
+        # Bumped on every invalidation; a value read from Redis is only
+        # cached if no invalidation arrived while it was being read
+        self.generation = 0
+        self.subscribed = False
+        self.pid = os.getpid()
+        self.thread: Optional[threading.Thread] = None
+        self.local_hits = 0
+        self.local_misses = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether values may be served from and stored in memory.
+        """
+        return self.subscribed and self.local.maxsize > 0
+
+    def start(self, client) -> None:
+        """
+        Subscribe to invalidations in a daemon thread, once per process.
+
+        Args:
+            client: A raw redis-py client.
+        """
+        with self._lock:
+            if self.pid != os.getpid():
+                # Forked: the parent's thread and subscription are gone
+                self.pid = os.getpid()
+                self.thread = None
+                self.sender = uuid.uuid4().hex
+                self._reset()
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(
+                target=self._listen,
+                args=(client,),
+                name=f"cache-invalidation-{self.channel}",
+                daemon=True,
+            )
+            self.thread.start()
+
+    def _listen(self, client) -> None:
+        delay = self.reconnect_delay
+        while True:
+            pubsub = client.pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                while True:
+                    message = pubsub.get_message(timeout=self.poll_interval)
+                    if message is not None:
+                        self.handle(message)
+                        delay = self.reconnect_delay
+            except (RedisError, OSError) as error:
+                logger.warning("Cache invalidation subscriber failed: %s", error)
+            finally:
+                self._reset()
+                try:
+                    pubsub.close()
+                except (RedisError, OSError):  # pragma: no cover
+                    pass
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _reset(self) -> None:
+        # Invalidations may have been missed, so nothing cached is trusted
+        self.subscribed = False
+        self.clear()
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        """
+        Apply a pub/sub message.
+        """
+        if message["type"] == "subscribe":
+            self.clear()
+            self.subscribed = True
+            return
+        if message["type"] != "message":
+            return
+
+        try:
+            payload = json.loads(message["data"])
+            sender, keys = payload["sender"], payload.get("keys", [])
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Ignoring malformed cache invalidation %r", message["data"])
+            return
+        if sender == self.sender:
+            return
+        if payload.get("clear"):
+            self.clear()
+        else:
+            self.discard(keys)
+
+    def clear(self) -> None:
+        """
+        Empty the local tier.
+        """
+        self.generation += 1
+        self.local.clear()
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """
+        Drop keys from the local tier.
+        """
+        self.generation += 1
+        for key in keys:
+            self.local.delete(key)
+
+    def store(
+        self, key: str, value: Any, timeout: Optional[float], generation: int
+    ) -> None:
+        """
+        Cache a value read or written at ``generation`` for ``timeout`` seconds.
+        """
+        if timeout is None or timeout <= 0 or generation != self.generation:
+            return
+        if not isinstance(value, IMMUTABLE_TYPES):
+            value = _Pickled(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self.local.set(key, value, self.local.clock() + timeout)
+
+    def load(self, key: str) -> Any:
+        """
+        Return the locally cached value of ``key``, or ``_MISSING``.
+        """
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            self.local_misses += 1
+            return _MISSING
+        self.local_hits += 1
+        if isinstance(value, _Pickled):
+            return pickle.loads(value)
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return hit statistics per tier.
+
+        Redis statistics count the reads the local tier could not serve.
+        """
+        return {
+            "subscribed": self.subscribed,
+            "local": {
+                "hits": self.local_hits,
+                "misses": self.local_misses,
+                "hit_ratio": _hit_ratio(self.local_hits, self.local_misses),
+                "entries": len(self.local),
+            },
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "hit_ratio": _hit_ratio(self.redis_hits, self.redis_misses),
+            },
+        }
+
+
+_tiers: Dict[Tuple[str, str], LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+def get_local_tier(server: Any, channel: str, maxsize: int) -> LocalTier:
+    """
+    Return the process-wide local tier of a cache.
+    """
+    key = (str(server), channel)
+    with _tiers_lock:
+        if key not in _tiers:
+            _tiers[key] = LocalTier(channel, maxsize)
+        return _tiers[key]
+
+
+class TieredRedisCache(RedisCache):
+    """
+    django-redis cache with a per-process LRU in front of Redis.
+    """
+
+    def __init__(self, server: str, params: Dict[str, Any]) -> None:
+        super().__init__(server, params)
+        options = params.get("OPTIONS", {})
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        patterns = options.get("LOCAL_EXCLUDE", [])
+        self._exclude = (
+            re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+            if patterns
+            else None
+        )
+        self.tier = get_local_tier(
+            server,
+            options.get("INVALIDATION_CHANNEL", "cache:invalidate"),
+            options.get("LOCAL_MAX_ENTRIES", 1000),
+        )
+
+    def _local_tier(self) -> Optional[LocalTier]:
+        # The tier to use for a call, starting its subscriber if needed
+        tier = self.tier
+        if tier.thread is None or tier.pid != os.getpid():
+            tier.start(self.client.get_client(write=True))
+        return tier if tier.active else None
+
+    def _is_local(self, key: Any) -> bool:
+        return self._exclude is None or not self._exclude.match(str(key))
+
+    def _local_timeout(self, timeout: Any) -> Optional[float]:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    @omit_exception(return_value={})
+    def _fetch(self, keys: Iterable[Any], version: Optional[int] = None) -> Dict:
+        # Values with how long each may be served locally, from one pipeline
+        client = self.client.get_client(write=False)
+        keys = list(keys)
+        pipeline = client.pipeline(transaction=False)
+        for key in keys:
+            redis_key = self.make_key(key, version)
+            pipeline.get(redis_key)
+            pipeline.pttl(redis_key)
+        try:
+            results = pipeline.execute()
+        except (RedisError, OSError) as error:
+            raise ConnectionInterrupted(connection=client) from error
+
+        found = {}
+        for key, value, ttl in zip(keys, results[::2], results[1::2]):
+            if value is None:
+                continue
+            if ttl == -1:
+                timeout = self.local_timeout
+            else:
+                timeout = min(max(ttl, 0) / 1000, self.local_timeout)
+            found[key] = (self.client.decode(value), timeout)
+        return found
+
+    def _publish(self, message: Dict[str, Any]) -> None:
+        message["sender"] = self.tier.sender
+        try:
+            self.client.get_client(write=True).publish(
+                self.tier.channel, json.dumps(message)
+            )
+        except (RedisError, OSError) as error:
+            # Other processes serve the old value until LOCAL_TIMEOUT
+            logger.warning("Could not publish cache invalidation: %s", error)
+
+    def invalidate(self, keys: Iterable[Any], version: Optional[int] = None) -> None:
+        """
+        Drop keys from every process's local tier.
+        """
+        keys = [self.make_key(key, version) for key in keys if self._is_local(key)]
+        if keys:
+            self.tier.discard(keys)
+            self._publish({"keys": keys})
+
+    def invalidate_all(self) -> None:
+        """
+        Empty every process's local tier.
+        """
+        self.tier.clear()
+        self._publish({"clear": True})
+
+    def get(self, key, default=None, version=None, client=None):
+        tier = self._local_tier() if client is None and self._is_local(key) else None
+        if tier is not None:
+            local_key = self.make_key(key, version)
+            value = tier.load(local_key)
+            if value is not _MISSING:
+                return value
+            generation = tier.generation
+            found = self._fetch([key], version)
+            if key not in found:
+                self.tier.redis_misses += 1
+                return default
+            self.tier.redis_hits += 1
+            value, timeout = found[key]
+            if timeout > 0:
+                tier.store(local_key, value, timeout, generation)
+            return value
+
+        value = super().get(key, _MISSING, version, client)
+        if value is _MISSING:
+            self.tier.redis_misses += 1
+            return default
+        self.tier.redis_hits += 1
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        tier = self._local_tier() if client is None else None
+        found = {}
+        remote_keys = []
+        for key in keys:
+            if tier is not None and self._is_local(key):
+                value = tier.load(self.make_key(key, version))
+                if value is not _MISSING:
+                    found[key] = value
+                    continue
+            remote_keys.append(key)
+        if not remote_keys:
+            return found
+
+        if tier is None:
+            values = super().get_many(remote_keys, version=version, client=client)
+        else:
+            generation = tier.generation
+            values = {}
+            for key, (value, timeout) in self._fetch(remote_keys, version).items():
+                values[key] = value
+                if timeout > 0 and self._is_local(key):
+                    tier.store(self.make_key(key, version), value, timeout, generation)
+        self.tier.redis_hits += len(values)
+        self.tier.redis_misses += len(remote_keys) - len(values)
+        found.update(values)
+        return found
+
+    def has_key(self, key, version=None, client=None):
+        tier = self._local_tier() if client is None and self._is_local(key) else None
+        if tier is not None and self.make_key(key, version) in tier.local:
+            return True
+        return super().has_key(key, version=version, client=client)
+
+    def set(
+        self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, **kwargs
+    ):
+        result = super().set(
+            key, value, timeout=timeout, version=version, client=client, **kwargs
+        )
+        if result and self._is_local(key):
+            self.invalidate([key], version)
+            tier = self._local_tier()
+            if tier is not None:
+                tier.store(
+                    self.make_key(key, version),
+                    value,
+                    self._local_timeout(timeout),
+                    tier.generation,
+                )
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().add(
+            key, value, timeout=timeout, version=version, client=client
+        )
+        if result and self._is_local(key):
+            self.invalidate([key], version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().set_many(data, timeout=timeout, version=version, client=client)
+        self.invalidate(data, version)
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version=version, prefix=prefix, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        result = super().delete_many(keys, version=version, client=client)
+        self.invalidate(keys, version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.invalidate_all()
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.invalidate_all()
+        return result
+
+    def incr(self, key, delta=1, version=None, client=None, **kwargs):
+        result = super().incr(key, delta, version=version, client=client, **kwargs)
+        self.invalidate([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, client=None, **kwargs):
+        result = super().decr(key, delta, version=version, client=client, **kwargs)
+        self.invalidate([key], version)
+        return result
+
+    def incr_version(self, key, delta=1, version=None, client=None):
+        result = super().incr_version(key, delta, version=version, client=client)
+        self.invalidate([key], version)
+        self.invalidate([key], result)
+        return result
+
+    # Calls that change an entry's expiry; a local copy could outlive it
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().touch(key, timeout=timeout, version=version, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def expire(self, key, timeout, version=None, client=None):
+        result = super().expire(key, timeout, version=version, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def pexpire(self, key, timeout, version=None, client=None):
+        result = super().pexpire(key, timeout, version=version, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def expire_at(self, key, when, version=None, client=None):
+        result = super().expire_at(key, when, version=version, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def pexpire_at(self, key, when, version=None, client=None):
+        result = super().pexpire_at(key, when, version=version, client=client)
+        self.invalidate([key], version)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return this process's hit statistics per tier.
+        """
+        return self.tier.get_stats()
@@ -0,0 +1,94 @@
+"""
+Two-tier cache metrics.
+"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from apps.core.cache.backends import TieredRedisCache
+
+try:
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # pragma: no cover
+    CounterMetricFamily = GaugeMetricFamily = None
+
+TIERS = ("local", "redis")
+
+
+def get_tiered_aliases():
+    """
+    Return the aliases of the configured ``TieredRedisCache`` caches.
+    """
+    return [
+        alias
+        for alias, config in settings.CACHES.items()
+        if issubclass(import_string(config["BACKEND"]), TieredRedisCache)
+    ]
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    """
+    Return this process's per-tier statistics for every two-tier cache.
+
+    Returns:
+        A mapping of alias to the statistics of ``LocalTier.get_stats()``.
+    """
+    return {alias: caches[alias].get_stats() for alias in get_tiered_aliases()}
+
+
+class CacheMetricsCollector:
+    """
+    Prometheus collector exporting two-tier cache hit statistics.
+    """
+
+    def collect(self):
+        stats = get_cache_stats()
+
+        hits = CounterMetricFamily(
+            "django_cache_tier_hits",
+            "Reads served by a cache tier",
+            labels=["alias", "tier"],
+        )
+        misses = CounterMetricFamily(
+            "django_cache_tier_misses",
+            "Reads a cache tier could not serve",
+            labels=["alias", "tier"],
+        )
+        hit_ratio = GaugeMetricFamily(
+            "django_cache_tier_hit_ratio",
+            "Share of a cache tier's reads served",
+            labels=["alias", "tier"],
+        )
+        entries = GaugeMetricFamily(
+            "django_cache_local_entries",
+            "Entries in the in-process cache tier",
+            labels=["alias"],
+        )
+        for alias, alias_stats in stats.items():
+            for tier in TIERS:
+                hits.add_metric([alias, tier], alias_stats[tier]["hits"])
+                misses.add_metric([alias, tier], alias_stats[tier]["misses"])
+                hit_ratio.add_metric([alias, tier], alias_stats[tier]["hit_ratio"])
+            entries.add_metric([alias], alias_stats["local"]["entries"])
+        yield hits
+        yield misses
+        yield hit_ratio
+        yield entries
+
+
+def register_cache_metrics() -> bool:
+    """
+    Register the cache collector with the default Prometheus registry.
+
+    Returns:
+        True if registered, False if prometheus_client is not installed.
+    """
+    if GaugeMetricFamily is None:
+        return False
+    from prometheus_client import REGISTRY
+
+    REGISTRY.register(CacheMetricsCollector())
+    return True
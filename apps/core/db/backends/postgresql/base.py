@@ -0,0 +1,110 @@
+"""
+PostgreSQL database backend with an in-process connection pool.
+
+Use ``"ENGINE": "apps.core.db.backends.postgresql"`` together with a
+``"POOL"`` dictionary in the database settings. Each process keeps one
+``psycopg_pool.ConnectionPool`` per database alias; Django checks a
+connection out when it first needs one and returns it when it would
+otherwise close it, so ``CONN_MAX_AGE`` should be 0.
+
+Without ``"POOL"`` (or with psycopg2) the backend behaves exactly like
+Django's built-in PostgreSQL backend.
+"""
+
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+from django.utils.asyncio import async_unsafe
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover
+    ConnectionPool = None
+
+# Process-wide pools and checkout statistics, keyed by database alias.
+pools = {}
+checkout_stats = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL wrapper that borrows connections from a shared pool.
+    """
+
+    @property
+    def pool_settings(self):
+        return self.settings_dict.get("POOL")
+
+    def get_pool(self, conn_params):
+        """
+        Return the pool for this alias, creating it on first use.
+        """
+        pool_settings = self.pool_settings
+        if not pool_settings:
+            return None
+        if not is_psycopg3 or ConnectionPool is None:
+            raise ImproperlyConfigured(
+                "DATABASES['%s']['POOL'] requires psycopg 3 and psycopg_pool."
+                % self.alias
+            )
+
+        with _pools_lock:
+            pool = pools.get(self.alias)
+            if pool is None:
+                pool = ConnectionPool(
+                    kwargs=conn_params,
+                    min_size=pool_settings.get("MIN_SIZE", 2),
+                    max_size=pool_settings.get("MAX_SIZE", 10),
+                    timeout=pool_settings.get("TIMEOUT", 10.0),
+                    max_idle=pool_settings.get("MAX_IDLE", 600.0),
+                    max_lifetime=pool_settings.get("MAX_LIFETIME", 3600.0),
+                    # Ping connections on checkout so a dead one is replaced
+                    # instead of failing the request.
+                    check=ConnectionPool.check_connection,
+                    name=self.alias,
+                    open=True,
+                )
+                pools[self.alias] = pool
+                checkout_stats[self.alias] = {
+                    "checkouts": 0,
+                    "checkout_seconds_total": 0.0,
+                    "checkout_seconds_max": 0.0,
+                }
+            return pool
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        started = time.perf_counter()
+        connection = pool.getconn()
+        self._record_checkout(time.perf_counter() - started)
+
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        pool = pools.get(self.alias) if self.pool_settings else None
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool rolls back any open transaction before reuse.
+            pool.putconn(self.connection)
+
+    def _record_checkout(self, seconds):
+        stats = checkout_stats[self.alias]
+        with _pools_lock:
+            stats["checkouts"] += 1
+            stats["checkout_seconds_total"] += seconds
+            stats["checkout_seconds_max"] = max(stats["checkout_seconds_max"], seconds)
@@ -0,0 +1,53 @@
+"""
+sqlcommenter-style query tagging.
+
+Appends a comment such as ``/*route='user-list',view='UserViewSet.list'*/``
+to each query, so database tools can attribute load to the endpoint that
+caused it. Keys are sorted and values URL-encoded as the sqlcommenter
+specification requires, which also keeps ``*/`` out of the comment.
+"""
+
+from typing import Callable, Mapping, Optional
+from urllib.parse import quote
+
+
+def format_sql_comment(tags: Mapping[str, Optional[str]]) -> str:
+    """
+    Return the sqlcommenter comment for ``tags``, skipping empty values.
+    """
+    pairs = [
+        f"{quote(key, safe='')}='{quote(str(value), safe='')}'"
+        for key, value in sorted(tags.items())
+        if value not in (None, "")
+    ]
+    return f"/*{','.join(pairs)}*/" if pairs else ""
+
+
+class QueryCommenter:
+    """
+    ``connection.execute_wrapper`` appending a comment to every query.
+
+    The comment is rebuilt only when ``tags`` are updated, not per query.
+    Queries with parameters get a copy with ``%`` doubled, as the driver
+    formats them and would read the URL encoding as placeholders.
+    """
+
+    def __init__(self, tags: Optional[Mapping[str, Optional[str]]] = None):
+        self.tags = {}
+        self.comment = ""
+        self.escaped_comment = ""
+        self.update(tags or {})
+
+    def update(self, tags: Mapping[str, Optional[str]]) -> None:
+        """
+        Add or replace tags.
+        """
+        self.tags.update(tags)
+        self.comment = format_sql_comment(self.tags)
+        self.escaped_comment = self.comment.replace("%", "%%")
+
+    def __call__(self, execute: Callable, sql, params, many, context):
+        if self.comment:
+            comment = self.comment if params is None else self.escaped_comment
+            sql = f"{sql} {comment}"
+        return execute(sql, params, many, context)
@@ -0,0 +1,93 @@
+"""
+Database connection pool metrics.
+"""
+
+from typing import Dict
+
+from apps.core.db.backends.postgresql import base as pooled_backend
+
+try:
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # pragma: no cover
+    CounterMetricFamily = GaugeMetricFamily = None
+
+# Stats reported by psycopg_pool.ConnectionPool.get_stats(), with help text.
+POOL_GAUGES = {
+    "pool_size": "Connections currently managed by the pool",
+    "pool_available": "Idle connections available for checkout",
+    "requests_waiting": "Checkouts currently waiting for a connection",
+}
+
+
+def get_pool_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Return pool and checkout statistics for every pooled database alias.
+
+    Returns:
+        A mapping of alias to a flat dictionary of statistics.
+    """
+    stats = {}
+    for alias, pool in list(pooled_backend.pools.items()):
+        alias_stats = dict(pool.get_stats())
+        alias_stats.update(pooled_backend.checkout_stats.get(alias, {}))
+        stats[alias] = alias_stats
+    return stats
+
+
+class PoolMetricsCollector:
+    """
+    Prometheus collector exporting connection pool statistics.
+    """
+
+    def collect(self):
+        stats = get_pool_stats()
+
+        for key, documentation in POOL_GAUGES.items():
+            gauge = GaugeMetricFamily(
+                f"django_db_{key}", documentation, labels=["alias"]
+            )
+            for alias, alias_stats in stats.items():
+                gauge.add_metric([alias], alias_stats.get(key, 0))
+            yield gauge
+
+        checkouts = CounterMetricFamily(
+            "django_db_pool_checkouts",
+            "Connections checked out of the pool",
+            labels=["alias"],
+        )
+        checkout_seconds = CounterMetricFamily(
+            "django_db_pool_checkout_seconds",
+            "Total time spent waiting to check out a connection",
+            labels=["alias"],
+        )
+        checkout_seconds_max = GaugeMetricFamily(
+            "django_db_pool_checkout_seconds_max",
+            "Longest time spent waiting to check out a connection",
+            labels=["alias"],
+        )
+        for alias, alias_stats in stats.items():
+            checkouts.add_metric([alias], alias_stats.get("checkouts", 0))
+            checkout_seconds.add_metric(
+                [alias], alias_stats.get("checkout_seconds_total", 0.0)
+            )
+            checkout_seconds_max.add_metric(
+                [alias], alias_stats.get("checkout_seconds_max", 0.0)
+            )
+        yield checkouts
+        yield checkout_seconds
+        yield checkout_seconds_max
+
+
+def register_pool_metrics() -> bool:
+    """
+    Register the pool collector with the default Prometheus registry.
+
+    Returns:
+        True if registered, False if prometheus_client is not installed.
+    """
+    if GaugeMetricFamily is None:
+        return False
+    from prometheus_client import REGISTRY
+
+    REGISTRY.register(PoolMetricsCollector())
+    return True
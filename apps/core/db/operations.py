@@ -0,0 +1,102 @@
+"""
+Migration operations for the project.
+"""
+
+from django.db import NotSupportedError
+from django.db.migrations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+from apps.core.db.search import create_search_index_sql, drop_search_index_sql
+
+
+def is_concurrent(schema_editor, operation) -> bool:
+    """
+    Whether ``operation`` should build its indexes concurrently.
+
+    Raises:
+        NotSupportedError: On PostgreSQL inside an atomic migration.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return False
+    if schema_editor.atomic_migration:
+        raise NotSupportedError(
+            f"{type(operation).__name__} requires the migration to set atomic = False."
+        )
+    return True
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    Add an index without blocking writes where the database supports it.
+
+    On PostgreSQL this runs ``CREATE INDEX CONCURRENTLY``, so the migration
+    containing it must set ``atomic = False``. Other backends create the
+    index normally, which keeps SQLite development databases working.
+    """
+
+    def describe(self):
+        return f"Concurrently create index {self.index.name} on {self.model_name}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_concurrent(schema_editor, self):
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not is_concurrent(schema_editor, self):
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class AddSearchIndex(Operation):
+    """
+    Index text fields of a model for ``apps.core.filters`` searches.
+
+    Builds ``pg_trgm`` indexes on PostgreSQL (concurrently, so the migration
+    must set ``atomic = False``) and an FTS5 table on SQLite. The index is
+    invisible to the migration state, so it is safe to re-run.
+    """
+
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name, fields):
+        self.model_name = model_name
+        self.fields = list(fields)
+
+    def deconstruct(self):
+        return (
+            self.__class__.__name__,
+            [],
+            {"model_name": self.model_name, "fields": self.fields},
+        )
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            for statement in create_search_index_sql(
+                schema_editor, model, self.fields, is_concurrent(schema_editor, self)
+            ):
+                schema_editor.execute(statement)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            for statement in drop_search_index_sql(
+                schema_editor, model, self.fields, is_concurrent(schema_editor, self)
+            ):
+                schema_editor.execute(statement)
+
+    def describe(self):
+        return f"Create search index on {self.model_name} ({', '.join(self.fields)})"
@@ -0,0 +1,124 @@
+"""
+Database routers for the project.
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from apps.core.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Replica that reads in the current request or task should go to, if any
+_read_alias: ContextVar[Optional[str]] = ContextVar("read_alias", default=None)
+
+# Measured replica lag in seconds, per alias, refreshed periodically
+lag_cache = LRUCache(maxsize=64)
+
+# Seconds a replica is behind its primary; 0 when fully replayed
+REPLICA_LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE COALESCE("
+        "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0"
+        ") END"
+    ),
+}
+
+
+def get_replica_lag(alias: str) -> float:
+    """
+    Measure how far a replica is behind the primary.
+
+    Backends without a lag query are assumed to be in sync.
+
+    Returns:
+        The lag in seconds, or infinity if the replica cannot be reached.
+    """
+    connection = connections[alias]
+    query = REPLICA_LAG_QUERIES.get(connection.vendor)
+    if query is None:
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable", alias, exc_info=True)
+        return float("inf")
+
+
+def get_cached_replica_lag(alias: str) -> float:
+    """
+    Return the lag of a replica, measuring it at most once per check interval.
+    """
+    lag = lag_cache.get(alias)
+    if lag is None:
+        lag = get_replica_lag(alias)
+        lag_cache.set(
+            alias, lag, time.monotonic() + settings.REPLICA_LAG_CHECK_INTERVAL
+        )
+    return lag
+
+
+def select_replica() -> Optional[str]:
+    """
+    Pick a replica that is within the allowed lag.
+
+    Returns:
+        A database alias, or None if reads should stay on the primary.
+    """
+    replicas = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if get_cached_replica_lag(alias) <= settings.REPLICA_MAX_LAG
+    ]
+    if not replicas:
+        return None
+    return random.choice(replicas)
+
+
+@contextmanager
+def read_from(alias: Optional[str]):
+    """
+    Send reads inside the block to ``alias``, or to the primary if None.
+    """
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Router sending writes to the primary and opted-in reads to a replica.
+
+    Reads only go to a replica inside ``read_from()``, which
+    ``ReplicaRoutingMiddleware`` enters for safe requests from clients that
+    have not written recently. Everything else, including management
+    commands and background tasks, reads from the primary. Reads inside a
+    transaction on the primary stay there so they see its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,120 @@
+"""
+Search index DDL for the project.
+
+PostgreSQL searches use ``pg_trgm`` GIN indexes on ``UPPER(column)``, which
+serve the ``UPPER(column::text) LIKE UPPER(%term%)`` that ``icontains``
+compiles to. SQLite searches use an FTS5 table with the trigram tokenizer,
+kept in sync with the source table by triggers. Other backends get no index.
+"""
+
+from typing import Iterable, List
+
+
+def get_search_table_name(model) -> str:
+    """
+    Return the name of the SQLite FTS5 table indexing ``model``.
+    """
+    return f"{model._meta.db_table}_search"
+
+
+def get_search_columns(connection, model) -> List[str]:
+    """
+    Return the columns of ``model``'s FTS5 table, or [] if it has none.
+    """
+    if connection.vendor != "sqlite":
+        return []
+    table = connection.ops.quote_name(get_search_table_name(model))
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+
+
+def create_search_index_sql(
+    schema_editor, model, fields: Iterable[str], concurrently: bool = False
+) -> List[str]:
+    """
+    Return the statements creating a search index over ``fields``.
+    """
+    columns = [model._meta.get_field(field).column for field in fields]
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        return _create_trigram_sql(schema_editor, model, columns, concurrently)
+    if vendor == "sqlite":
+        return _create_fts5_sql(schema_editor, model, columns)
+    return []
+
+
+def drop_search_index_sql(
+    schema_editor, model, fields: Iterable[str], concurrently: bool = False
+) -> List[str]:
+    """
+    Return the statements dropping a search index over ``fields``.
+    """
+    columns = [model._meta.get_field(field).column for field in fields]
+    quote = schema_editor.quote_name
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        keyword = " CONCURRENTLY" if concurrently else ""
+        return [
+            f"DROP INDEX{keyword} IF EXISTS {quote(_trigram_index_name(model, column))}"
+            for column in columns
+        ]
+    if vendor == "sqlite":
+        search_table = get_search_table_name(model)
+        return [
+            *(
+                f"DROP TRIGGER IF EXISTS {quote(f'{search_table}_{suffix}')}"
+                for suffix in ("ai", "ad", "au")
+            ),
+            f"DROP TABLE IF EXISTS {quote(search_table)}",
+        ]
+    return []
+
+
+def _trigram_index_name(model, column: str) -> str:
+    return f"{model._meta.db_table}_{column}_trgm"[:63]
+
+
+def _create_trigram_sql(schema_editor, model, columns, concurrently):
+    quote = schema_editor.quote_name
+    keyword = " CONCURRENTLY" if concurrently else ""
+    table = quote(model._meta.db_table)
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for column in columns:
+        statements.append(
+            f"CREATE INDEX{keyword} IF NOT EXISTS "
+            f"{quote(_trigram_index_name(model, column))} ON {table} "
+            f"USING gin (UPPER({quote(column)}::text) gin_trgm_ops)"
+        )
+    return statements
+
+
+def _create_fts5_sql(schema_editor, model, columns):
+    # Table rebuilds in later SQLite migrations drop these triggers and
+    # renumber rowids; re-run the operation after such a migration.
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    search_table = get_search_table_name(model)
+    column_list = ", ".join(quote(column) for column in columns)
+    new_values = ", ".join(f"new.{quote(column)}" for column in columns)
+    old_values = ", ".join(f"old.{quote(column)}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {quote(search_table)}({quote(search_table)}, rowid, "
+        f"{column_list}) VALUES ('delete', old.rowid, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {quote(search_table)}(rowid, {column_list}) "
+        f"VALUES (new.rowid, {new_values});"
+    )
+    return [
+        *drop_search_index_sql(schema_editor, model, []),
+        f"CREATE VIRTUAL TABLE {quote(search_table)} USING fts5({column_list}, "
+        f"content='{table}', content_rowid='rowid', tokenize='trigram')",
+        f"CREATE TRIGGER {quote(f'{search_table}_ai')} AFTER INSERT ON "
+        f"{quote(table)} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {quote(f'{search_table}_ad')} AFTER DELETE ON "
+        f"{quote(table)} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {quote(f'{search_table}_au')} AFTER UPDATE ON "
+        f"{quote(table)} BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {quote(search_table)}({quote(search_table)}) VALUES ('rebuild')",
+    ]
@@ -0,0 +1,256 @@
+"""
+Slow query recorder for the project.
+
+Every connection gets an execute wrapper that times its queries. Those
+taking ``SLOW_QUERY_THRESHOLD_MS`` or longer are recorded with:
+
+- the SQL, with parameters replaced by their types, so no user data is kept;
+- the innermost frame under ``apps/`` that issued the query;
+- the request and trace IDs current at the time;
+- the query plan, for ``SELECT`` statements: ``EXPLAIN (FORMAT JSON)`` on
+  PostgreSQL, with ``ANALYZE`` when ``SLOW_QUERY_EXPLAIN_ANALYZE`` is set,
+  and ``EXPLAIN QUERY PLAN`` on SQLite.
+
+Samples are logged as JSON to the ``apps.core.db.slow_queries`` logger and
+kept in a per-process ring buffer of ``SLOW_QUERY_BUFFER_SIZE`` entries,
+which staff can read from the slow query endpoint.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from apps.core.tracing import get_current_trace
+
+logger = logging.getLogger(__name__)
+
+APPS_DIR = Path(__file__).resolve().parents[2]
+# Frames in this package belong to the instrumentation, not the caller
+DB_DIR = Path(__file__).resolve().parent
+
+# Set while running EXPLAIN, whose own queries are not recorded
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+
+@dataclass
+class SlowQuery:
+    """
+    A sample of one slow query.
+    """
+
+    time: str
+    duration_ms: float
+    alias: str
+    vendor: str
+    sql: str
+    params: Any
+    many: bool
+    location: Optional[str]
+    request_id: Optional[str]
+    trace_id: Optional[str]
+    plan: Any = None
+    plan_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the sample as a JSON serializable dictionary.
+        """
+        return asdict(self)
+
+
+class SlowQueryBuffer:
+    """
+    Thread-safe ring buffer keeping the most recent samples.
+    """
+
+    def __init__(self, maxsize: int):
+        self._samples = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    def add(self, sample: SlowQuery) -> None:
+        """
+        Add a sample, dropping the oldest when full.
+        """
+        with self._lock:
+            self._samples.append(sample)
+
+    def samples(self) -> List[SlowQuery]:
+        """
+        Return the kept samples, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._samples))
+
+    def clear(self) -> None:
+        """
+        Drop every sample.
+        """
+        with self._lock:
+            self._samples.clear()
+
+
+buffer = SlowQueryBuffer(maxsize=getattr(settings, "SLOW_QUERY_BUFFER_SIZE", 100))
+
+
+def redact_params(params: Any) -> Any:
+    """
+    Replace query parameters with placeholders naming their types.
+
+    ``None`` is kept, as it changes the plan (``IS NULL``) without revealing
+    anything.
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: redact_params(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [redact_params(value) for value in params]
+    return f"<{type(params).__name__}>"
+
+
+def find_location() -> Optional[str]:
+    """
+    Return ``path:line in function`` of the innermost project frame.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename)
+        if path.is_relative_to(APPS_DIR) and not path.is_relative_to(DB_DIR):
+            relative = path.relative_to(APPS_DIR.parent)
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def explain(connection, sql: str, params: Any) -> Any:
+    """
+    Return the plan of a ``SELECT`` statement, or None for other statements.
+
+    The plan is fetched in a savepoint, so a failing ``EXPLAIN`` does not
+    break the caller's transaction.
+
+    Raises:
+        DatabaseError: If ``EXPLAIN`` fails.
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+
+    if connection.vendor == "postgresql":
+        options = "FORMAT JSON"
+        if settings.SLOW_QUERY_EXPLAIN_ANALYZE:
+            options += ", ANALYZE, BUFFERS"
+        prefix = f"EXPLAIN ({options}) "
+    elif connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+
+    token = _explaining.set(True)
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+    finally:
+        _explaining.reset(token)
+
+    if connection.vendor == "sqlite":
+        return [{"id": row[0], "parent": row[1], "detail": row[3]} for row in rows]
+    plan = rows[0][0]
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def record(
+    connection, sql: str, params: Any, many: bool, duration_ms: float
+) -> SlowQuery:
+    """
+    Build, keep and log the sample of a slow query.
+    """
+    trace = get_current_trace()
+    sample = SlowQuery(
+        time=timezone.now().isoformat(),
+        duration_ms=round(duration_ms, 3),
+        alias=connection.alias,
+        vendor=connection.vendor,
+        sql=sql,
+        params=redact_params(params),
+        many=many,
+        location=find_location(),
+        request_id=trace.request_id if trace else None,
+        trace_id=trace.trace_id if trace else None,
+    )
+    if not many:
+        try:
+            sample.plan = explain(connection, sql, params)
+        except DatabaseError as error:
+            sample.plan_error = str(error)
+
+    buffer.add(sample)
+    logger.warning(
+        "Slow query %s",
+        json.dumps(sample.to_dict(), default=str),
+        extra={"slow_query": sample.to_dict()},
+    )
+    return sample
+
+
+class SlowQueryRecorder:
+    """
+    ``connection.execute_wrapper`` recording queries over the threshold.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute: Callable, sql, params, many, context):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if not threshold or _explaining.get():
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= threshold:
+            record(self.connection, sql, params, many, duration_ms)
+        return result
+
+
+def install_recorder(sender=None, connection=None, **kwargs) -> None:
+    """
+    Add the recorder to a connection, outside any other wrapper.
+
+    Connected to ``connection_created``; the wrapper list outlives the
+    underlying connection, so reconnects do not add a second recorder.
+    """
+    if not any(
+        isinstance(wrapper, SlowQueryRecorder)
+        for wrapper in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.insert(0, SlowQueryRecorder(connection))
+
+
+def connect_recorder() -> None:
+    """
+    Record slow queries on every connection, if a threshold is set.
+    """
+    if not settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(install_recorder, dispatch_uid="slow_query_recorder")
+    # Connections opened before the app registry was ready
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            install_recorder(connection=connection)
@@ -2,8 +2,23 @@
 Custom filter backends for the project.
 """
 
+import operator
+from functools import reduce
+from typing import Iterable, List, Sequence
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
 from django_filters import rest_framework as filters
-from rest_framework.filters import BaseFilterBackend
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
+
+from apps.core.db.search import get_search_columns, get_search_table_name
+from apps.core.permissions import Owner, apply_row_policy
+
+# Shortest term the trigram-based indexes can match on their own
+MIN_TRIGRAM_TERM_LENGTH = 3
 
 
 class BaseFilterSet(filters.FilterSet):
@@ -25,4 +40,192 @@ class OwnerFilterBackend(BaseFilterBackend):
     """
     
     def filter_queryset(self, request, queryset, view):
-        return queryset.filter(user=request.user)
+        policy = Owner(getattr(view, "owner_field", "user"))
+        return apply_row_policy(policy, request, queryset)
+
+
+class RowPolicyFilterBackend(BaseFilterBackend):
+    """
+    Filter applying the view's ``row_policy`` as a single queryset filter.
+
+    Applies to lists and, through ``get_object()``, to detail lookups, which
+    then return 404 for rows the policy hides. Views without a policy are
+    left unfiltered, and so are ``BaseViewSet`` views, whose
+    ``get_queryset()`` has already applied it.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        policy = getattr(view, "row_policy", None)
+        if policy is None or getattr(view, "row_policy_applied", False):
+            return queryset
+        return apply_row_policy(policy, request, queryset)
+
+
+class SearchBackend:
+    """
+    Base class for search backends.
+
+    A backend filters a queryset down to rows where every term occurs in at
+    least one of the fields, case-insensitively, and annotates each row with
+    a ``search_rank`` where higher is more relevant.
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+
+    def search(self, queryset: QuerySet, terms: List[str]) -> QuerySet:
+        """
+        Return ``queryset`` filtered by ``terms`` and annotated with a rank.
+        """
+        raise NotImplementedError("Subclasses must implement search()")
+
+    def contains_all(self, terms: Iterable[str]) -> Q:
+        """
+        Return a Q matching rows that contain every term in some field.
+        """
+        matches = Q()
+        for term in terms:
+            matches &= reduce(
+                operator.or_,
+                (Q(**{f"{field}__icontains": term}) for field in self.fields),
+            )
+        return matches
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Unindexed search backend for databases without a search index.
+    """
+
+    def search(self, queryset, terms):
+        return queryset.filter(self.contains_all(terms)).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class TrigramSearchBackend(SearchBackend):
+    """
+    PostgreSQL search backend served by ``pg_trgm`` GIN indexes.
+
+    Filtering keeps the ``icontains`` semantics, which the trigram indexes on
+    ``UPPER(column)`` answer without a sequential scan, and rows are ranked by
+    their best word similarity to the search.
+    """
+
+    def search(self, queryset, terms):
+        # Imported here: django.contrib.postgres loads psycopg
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        text = " ".join(terms)
+        similarities = [TrigramWordSimilarity(text, field) for field in self.fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.filter(self.contains_all(terms)).annotate(search_rank=rank)
+
+
+class FTS5SearchBackend(SearchBackend):
+    """
+    SQLite search backend served by an FTS5 trigram table.
+
+    Terms shorter than a trigram cannot be matched by the index and are
+    filtered with ``icontains`` instead. Rows are ranked by BM25.
+    """
+
+    def search(self, queryset, terms):
+        indexed = [term for term in terms if len(term) >= MIN_TRIGRAM_TERM_LENGTH]
+        short = [term for term in terms if len(term) < MIN_TRIGRAM_TERM_LENGTH]
+        if not indexed:
+            return LikeSearchBackend(self.fields).search(queryset, terms)
+
+        quote = connections[queryset.db].ops.quote_name
+        table = quote(queryset.model._meta.db_table)
+        search_table = quote(get_search_table_name(queryset.model))
+        columns = " ".join(
+            queryset.model._meta.get_field(field).column for field in self.fields
+        )
+        query = "{%s} : (%s)" % (
+            columns,
+            " AND ".join('"%s"' % term.replace('"', '""') for term in indexed),
+        )
+        matches = RawSQL(
+            f"{table}.rowid IN (SELECT rowid FROM {search_table} "
+            f"WHERE {search_table} MATCH %s)",
+            (query,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"SELECT -bm25({search_table}) FROM {search_table} "
+            f"WHERE {search_table} MATCH %s AND rowid = {table}.rowid",
+            (query,),
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(matches)
+            .filter(self.contains_all(short))
+            .annotate(search_rank=rank)
+        )
+
+
+def get_search_backend(queryset: QuerySet, fields: Sequence[str]) -> SearchBackend:
+    """
+    Return the best search backend for ``queryset``'s database.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        return TrigramSearchBackend(fields)
+    if connection.vendor == "sqlite":
+        indexed_columns = set(get_search_columns(connection, queryset.model))
+        columns = {queryset.model._meta.get_field(field).column for field in fields}
+        if indexed_columns and columns <= indexed_columns:
+            return FTS5SearchBackend(fields)
+    return LikeSearchBackend(fields)
+
+
+def is_indexable_search_field(model, field: str) -> bool:
+    """
+    Whether a search field is a plain local text field a backend can index.
+    """
+    if not field.isidentifier():
+        return False
+    try:
+        internal_type = model._meta.get_field(field).get_internal_type()
+    except FieldDoesNotExist:
+        return False
+    return internal_type in ("CharField", "EmailField", "SlugField", "TextField")
+
+
+def search_queryset(
+    queryset: QuerySet, fields: Sequence[str], terms: List[str]
+) -> QuerySet:
+    """
+    Search ``fields`` of ``queryset`` for ``terms`` using an index if possible.
+
+    Returns:
+        The filtered queryset, annotated with ``search_rank``.
+    """
+    return get_search_backend(queryset, fields).search(queryset, terms)
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for ``SearchFilter`` that uses the search indexes.
+
+    Plain text fields in ``search_fields`` are searched through the database's
+    search backend and results are ordered by relevance unless the client
+    asks for an ordering. Views using DRF's field prefixes or related lookups
+    fall back to ``SearchFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        if not all(
+            is_indexable_search_field(queryset.model, field) for field in search_fields
+        ):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search_queryset(queryset, search_fields, search_terms)
+        if not request.query_params.get(OrderingFilter.ordering_param):
+            queryset = queryset.order_by("-search_rank", "pk")
+        return queryset
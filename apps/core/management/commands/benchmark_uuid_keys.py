@@ -0,0 +1,90 @@
+"""
+Management command to compare UUIDv4 and UUIDv7 primary keys.
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.core.utils.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    """
+    Measure insert throughput and primary key index size per UUID version.
+
+    Inserts the same number of rows into a temporary table keyed by each
+    generator and reports rows per second alongside the size of the table and
+    of its primary key index. Requires PostgreSQL.
+    """
+
+    help = "Benchmark UUIDv4 against UUIDv7 primary keys on PostgreSQL"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=200_000, help="Rows to insert per generator"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT statement"
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help="Database alias to use"
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires PostgreSQL.")
+
+        self.stdout.write(
+            f"{'generator':<10} {'rows/s':>10} {'table':>10} {'pkey index':>12}"
+        )
+        for name, generator in GENERATORS.items():
+            rows_per_second, table_size, index_size = self.run_benchmark(
+                connection, name, generator, options["rows"], options["batch_size"]
+            )
+            self.stdout.write(
+                f"{name:<10} {rows_per_second:>10,.0f} "
+                f"{table_size / 2**20:>8.1f}MB {index_size / 2**20:>10.1f}MB"
+            )
+
+    def run_benchmark(self, connection, name, generator, rows, batch_size):
+        """
+        Insert ``rows`` rows keyed by ``generator`` into a temporary table.
+
+        Returns:
+            A tuple of rows per second, table size and index size in bytes.
+        """
+        table = f"benchmark_{name}"
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {table} ("
+                "id uuid PRIMARY KEY, "
+                "created_at timestamptz NOT NULL DEFAULT now(), "
+                "payload text NOT NULL)"
+            )
+            started = time.perf_counter()
+            for offset in range(0, rows, batch_size):
+                count = min(batch_size, rows - offset)
+                params = []
+                for _ in range(count):
+                    params += [generator(), "x" * 64]
+                cursor.execute(
+                    f"INSERT INTO {table} (id, payload) VALUES "
+                    + ", ".join(["(%s, %s)"] * count),
+                    params,
+                )
+            elapsed = time.perf_counter() - started
+
+            cursor.execute(
+                "SELECT pg_relation_size(%s), pg_relation_size(%s)",
+                [table, f"{table}_pkey"],
+            )
+            table_size, index_size = cursor.fetchone()
+            cursor.execute(f"DROP TABLE {table}")
+        return rows / elapsed, table_size, index_size
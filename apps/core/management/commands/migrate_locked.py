@@ -0,0 +1,74 @@
+"""
+Management command to run migrations from one replica at a time.
+"""
+
+import time
+
+from django.core.management.commands import migrate
+from django.db import connections
+
+# Arbitrary, fixed PostgreSQL advisory lock key shared by all replicas
+MIGRATION_LOCK_ID = 7_346_811_052
+
+
+class Command(migrate.Command):
+    """
+    ``migrate`` holding a PostgreSQL advisory lock on the target database.
+
+    When several replicas start at once, one migrates while the others
+    wait for it and then find nothing left to apply, or exit at once with
+    ``--no-wait``. Other databases are migrated without a lock.
+
+    Waiters poll ``pg_try_advisory_lock`` and sleep between attempts
+    rather than blocking in ``pg_advisory_lock``: a blocked statement
+    keeps a snapshot open, and ``CREATE INDEX CONCURRENTLY`` in the
+    holder's migrations would wait on it forever.
+    """
+
+    help = "Run migrate under a database-wide lock so replicas migrate one at a time"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--no-wait",
+            action="store_true",
+            help="Skip migrating if another process holds the lock",
+        )
+        parser.add_argument(
+            "--initial-delay",
+            type=float,
+            default=0.1,
+            help="Seconds before retrying the lock; doubled after each attempt",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=5.0,
+            help="Longest wait between lock attempts",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            return super().handle(*args, **options)
+
+        delay = options["initial_delay"]
+        while not self.try_lock(connection):
+            if options["no_wait"]:
+                self.stdout.write("Another process is migrating; skipping.")
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, options["max_delay"])
+
+        # A session lock: held across the migrations' own transactions
+        try:
+            return super().handle(*args, **options)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+    def try_lock(self, connection):
+        # Autocommit: no statement or transaction stays open between polls
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+            return cursor.fetchone()[0]
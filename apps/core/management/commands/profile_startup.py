@@ -0,0 +1,220 @@
+"""
+Management command to profile import time and startup.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Packages of this project, reported per app rather than as a whole
+LOCAL_PACKAGES = ("apps", "config")
+
+# Run in a fresh interpreter, since -X importtime only sees first imports.
+# Times every AppConfig.ready() and the URLconf import, then prints them
+# as JSON on the last line of stdout.
+PROBE = """
+import json, time
+from django.apps.config import AppConfig
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    app_config = create(cls, entry)
+    ready = app_config.ready
+
+    def timed_ready():
+        started = time.perf_counter()
+        ready()
+        ready_times[app_config.name] = time.perf_counter() - started
+
+    app_config.ready = timed_ready
+    return app_config
+
+AppConfig.create = classmethod(timed_create)
+
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter() - started
+
+from django.urls import get_resolver
+started = time.perf_counter()
+get_resolver()._populate()
+urls = time.perf_counter() - started
+
+print(json.dumps({"setup": setup, "urls": urls, "ready": ready_times}))
+"""
+
+
+@dataclass
+class ImportEntry:
+    """
+    One module from ``-X importtime`` output, with the modules it imported.
+    """
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: List["ImportEntry"] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """
+    Parse ``-X importtime`` output into a tree.
+
+    Returns:
+        The top-level imports, in import order.
+    """
+    # Modules are listed after the modules they import, one level deeper
+    pending = defaultdict(list)
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # The header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entry = ImportEntry(name.strip(), int(self_us), int(cumulative_us), depth)
+        entry.children = pending.pop(depth + 1, [])
+        pending[depth].append(entry)
+    return pending[0]
+
+
+def iter_entries(entries: List[ImportEntry]):
+    """
+    Yield every entry of an import tree.
+    """
+    for entry in entries:
+        yield entry
+        yield from iter_entries(entry.children)
+
+
+def get_package(module: str) -> str:
+    """
+    Return the package a module is reported under.
+    """
+    parts = module.split(".")
+    if parts[0] in LOCAL_PACKAGES:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def aggregate_by_package(entries: List[ImportEntry]) -> Dict[str, int]:
+    """
+    Sum the import time each package spent in its own modules, in µs.
+    """
+    totals = defaultdict(int)
+    for entry in iter_entries(entries):
+        totals[get_package(entry.name)] += entry.self_us
+    return dict(totals)
+
+
+class Command(BaseCommand):
+    """
+    Report where a fresh process spends its startup time.
+
+    Starts ``django.setup()`` and the URLconf import in a new interpreter
+    under ``-X importtime``, then ranks the import time spent per package
+    and per project app, and the time spent in each ``AppConfig.ready``.
+    """
+
+    help = "Profile import time and startup of the project"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module",
+            default=os.environ.get("DJANGO_SETTINGS_MODULE"),
+            help="Settings module to start with (default: the current one)",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=15, help="Rows to show per section"
+        )
+        parser.add_argument(
+            "--tree",
+            action="store_true",
+            help="Also print the import tree of modules above --min-ms",
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=5.0,
+            help="Smallest cumulative import time shown in the tree",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": options["settings_module"]},
+        )
+        if result.returncode != 0:
+            errors = [
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            raise CommandError(f"Startup failed: {errors[-1] if errors else ''}")
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        entries = parse_importtime(result.stderr)
+        packages = aggregate_by_package(entries)
+        limit = options["limit"]
+
+        self.stdout.write(
+            f"Startup with {options['settings_module']}: "
+            f"imports {sum(packages.values()) / 1000:.1f} ms, "
+            f"django.setup() {timings['setup'] * 1000:.1f} ms, "
+            f"URLconf {timings['urls'] * 1000:.1f} ms"
+        )
+
+        self.write_section(
+            "Import time by package (own modules)",
+            {name: us / 1000 for name, us in packages.items()},
+            limit,
+        )
+        self.write_section(
+            "Import time by project app (own modules)",
+            {
+                name: us / 1000
+                for name, us in packages.items()
+                if name.split(".")[0] in LOCAL_PACKAGES
+            },
+            limit,
+        )
+        self.write_section(
+            "AppConfig.ready()",
+            {name: seconds * 1000 for name, seconds in timings["ready"].items()},
+            limit,
+        )
+
+        if options["tree"]:
+            self.stdout.write("\nImport tree (cumulative)")
+            self.write_tree(entries, options["min_ms"] * 1000)
+
+    def write_section(self, title, milliseconds, limit):
+        self.stdout.write(f"\n{title}")
+        ranked = sorted(milliseconds.items(), key=lambda item: item[1], reverse=True)
+        for name, value in ranked[:limit]:
+            self.stdout.write(f"  {name:<40} {value:>9.1f} ms")
+
+    def write_tree(self, entries, min_us, depth=0):
+        for entry in sorted(
+            entries, key=lambda entry: entry.cumulative_us, reverse=True
+        ):
+            if entry.cumulative_us < min_us:
+                continue
+            self.stdout.write(
+                f"  {'  ' * depth + entry.name:<48} "
+                f"{entry.cumulative_us / 1000:>9.1f} ms"
+            )
+            self.write_tree(entry.children, min_us, depth + 1)
@@ -0,0 +1,78 @@
+"""
+Management command to wait until the database and caches accept connections.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    """
+    Block until every configured database and cache is reachable.
+
+    Services are retried with exponential backoff from one process, instead
+    of starting an interpreter per attempt, and the command fails once
+    ``--timeout`` seconds have passed.
+    """
+
+    help = "Wait for the databases and caches to accept connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout", type=float, default=60.0, help="Seconds to wait in total"
+        )
+        parser.add_argument(
+            "--initial-delay",
+            type=float,
+            default=0.1,
+            help="Seconds before the first retry; doubled after each",
+        )
+        parser.add_argument(
+            "--max-delay", type=float, default=5.0, help="Longest wait between retries"
+        )
+
+    def handle(self, *args, **options):
+        pending = {
+            **{
+                f"database '{alias}'": (self.check_database, alias)
+                for alias in settings.DATABASES
+            },
+            **{
+                f"cache '{alias}'": (self.check_cache, alias)
+                for alias in settings.CACHES
+            },
+        }
+        deadline = time.monotonic() + options["timeout"]
+        delay = options["initial_delay"]
+
+        while True:
+            for name, (check, alias) in list(pending.items()):
+                try:
+                    check(alias)
+                except Exception as e:
+                    error = e
+                    self.stderr.write(f"Waiting for {name}: {e}")
+                else:
+                    del pending[name]
+                    self.stdout.write(f"{name.capitalize()} is available")
+            if not pending:
+                return
+
+            if time.monotonic() + delay > deadline:
+                raise CommandError(f"Gave up waiting for {', '.join(pending)}: {error}")
+            time.sleep(delay)
+            delay = min(delay * 2, options["max_delay"])
+
+    def check_database(self, alias):
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+        finally:
+            connection.close()
+
+    def check_cache(self, alias):
+        caches[alias].get("wait_for_services")
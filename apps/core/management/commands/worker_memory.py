@@ -0,0 +1,51 @@
+"""
+Management command to report the memory of each gunicorn worker.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import runtime
+
+
+class Command(BaseCommand):
+    """
+    Report resident, proportional and unique memory per gunicorn worker.
+
+    Unique memory (USS) is what each additional worker costs; the gap
+    between RSS and USS is what it shares with the preloaded master.
+    Requires Linux ``/proc``.
+    """
+
+    help = "Report per-worker memory of the running gunicorn server"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pidfile",
+            default=os.environ.get("GUNICORN_PIDFILE", "/tmp/gunicorn.pid"),
+            help="Gunicorn master PID file",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["pidfile"]) as file:
+                master_pid = int(file.read().strip())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {options['pidfile']}: {e}") from e
+
+        self.stdout.write(f"{'process':<16} {'rss':>10} {'pss':>10} {'uss':>10}")
+        totals = {"rss": 0, "pss": 0, "uss": 0}
+        pids = [master_pid] + runtime.get_child_pids(master_pid)
+        for pid in pids:
+            memory = runtime.get_process_memory(pid)
+            for name in totals:
+                totals[name] += memory[name]
+            label = f"master {pid}" if pid == master_pid else f"worker {pid}"
+            self.stdout.write(self.format_row(label, memory))
+        self.stdout.write(self.format_row("total", totals))
+
+    def format_row(self, label, memory):
+        return f"{label:<16} " + " ".join(
+            f"{memory[name] / 2**20:>8.1f}MB" for name in ("rss", "pss", "uss")
+        )
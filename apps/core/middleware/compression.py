@@ -0,0 +1,299 @@
+"""
+Middleware for compressing response bodies.
+"""
+
+import gzip
+import io
+import re
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Content types that are worth compressing. Images, archives and other
+# already-compressed formats are left alone.
+COMPRESSIBLE_CONTENT_TYPES = re.compile(
+    r"^(text/|application/(json|.*\+json|javascript|xml|.*\+xml|vnd\.oai\.openapi))"
+)
+
+ACCEPT_ENCODING_RE = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q=([0-9.]+))?")
+
+
+class Compressor:
+    """
+    Base class for a content coding.
+
+    Subclasses provide one-shot compression for regular responses and an
+    incremental compressor for streaming responses.
+    """
+
+    encoding = ""
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError("Subclasses must implement compress()")
+
+    def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        raise NotImplementedError("Subclasses must implement stream()")
+
+    async def astream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        raise NotImplementedError("Subclasses must implement astream()")
+
+
+class GzipCompressor(Compressor):
+    """
+    gzip content coding, always available from the standard library.
+    """
+
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps the output deterministic so ETags stay stable.
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def _writer(self, buffer: io.BytesIO) -> gzip.GzipFile:
+        return gzip.GzipFile(
+            mode="wb", compresslevel=self.level, fileobj=buffer, mtime=0
+        )
+
+    def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        buffer = io.BytesIO()
+        with self._writer(buffer) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+                writer.flush()
+                yield _drain(buffer)
+        yield _drain(buffer)
+
+    async def astream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        buffer = io.BytesIO()
+        with self._writer(buffer) as writer:
+            async for chunk in chunks:
+                writer.write(chunk)
+                writer.flush()
+                yield _drain(buffer)
+        yield _drain(buffer)
+
+
+class BrotliCompressor(Compressor):
+    """
+    Brotli content coding, available when the ``brotli`` package is installed.
+    """
+
+    encoding = "br"
+
+    def __init__(self, quality: int = 5):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+    async def astream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = brotli.Compressor(quality=self.quality)
+        async for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdCompressor(Compressor):
+    """
+    Zstandard content coding, available when ``zstandard`` is installed.
+    """
+
+    encoding = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        yield compressor.flush()
+
+    async def astream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        yield compressor.flush()
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    """
+    Return everything written to the buffer so far and reset it.
+    """
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def available_compressors() -> List[Compressor]:
+    """
+    Return the compressors that can be used in this process.
+
+    The order follows ``COMPRESSION_ENCODINGS`` and codings whose optional
+    dependency is not installed are dropped.
+    """
+    factories = {
+        "zstd": (zstandard, lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)),
+        "br": (brotli, lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)),
+        "gzip": (gzip, lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)),
+    }
+    compressors = []
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        module, factory = factories.get(encoding, (None, None))
+        if module is not None:
+            compressors.append(factory())
+    return compressors
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Parse an Accept-Encoding header into a mapping of coding to q-value.
+    """
+    accepted = {}
+    for part in header.split(","):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        coding, quality = match.groups()
+        try:
+            accepted[coding.lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Middleware for compressing responses.
+
+    This middleware:
+    1. Negotiates zstd, brotli or gzip from the Accept-Encoding header
+    2. Skips bodies smaller than ``COMPRESSION_MIN_SIZE``
+    3. Compresses streaming responses chunk by chunk
+
+    It must be listed before ``RequestResponseMiddleware`` so it sees the
+    final, formatted body and compresses it exactly once.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        self.compressors = available_compressors()
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.large_size = settings.COMPRESSION_LARGE_SIZE
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if not self._should_compress(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        size = None if response.streaming else len(response.content)
+        compressor = self.select_compressor(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), size
+        )
+        if compressor is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compressor.astream(
+                    response.streaming_content
+                )
+            else:
+                response.streaming_content = compressor.stream(
+                    response.streaming_content
+                )
+            # The compressed length is unknown until the stream is consumed.
+            del response["Content-Length"]
+        else:
+            compressed = compressor.compress(response.content)
+            if len(compressed) >= size:
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        self._weaken_etag(response)
+        response["Content-Encoding"] = compressor.encoding
+        return response
+
+    def select_compressor(
+        self, accept_encoding: str, size: Optional[int]
+    ) -> Optional[Compressor]:
+        """
+        Pick the best compressor the client accepts for a body of ``size``.
+
+        Brotli gives the smallest output but costs noticeably more CPU on
+        large bodies, so above ``COMPRESSION_LARGE_SIZE`` it is tried last.
+        Streaming bodies (``size`` is None) are treated as large.
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        if not accepted:
+            return None
+
+        candidates = [
+            compressor
+            for compressor in self.compressors
+            if accepted.get(compressor.encoding, accepted.get("*", 0)) > 0
+        ]
+        if size is None or size >= self.large_size:
+            candidates.sort(key=lambda compressor: compressor.encoding == "br")
+        candidates.sort(
+            key=lambda compressor: -accepted.get(
+                compressor.encoding, accepted.get("*", 0)
+            )
+        )
+        return candidates[0] if candidates else None
+
+    def _should_compress(self, response: HttpResponse) -> bool:
+        """
+        Check whether the response is eligible for compression.
+        """
+        if response.has_header("Content-Encoding"):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if not COMPRESSIBLE_CONTENT_TYPES.match(response.get("Content-Type", "")):
+            return False
+        if response.streaming:
+            content_length = response.get("Content-Length")
+            return not (content_length and int(content_length) < self.min_size)
+        return len(response.content) >= self.min_size
+
+    def _weaken_etag(self, response: HttpResponse) -> None:
+        """
+        Mark a strong ETag as weak, since the representation has changed.
+        """
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
@@ -0,0 +1,104 @@
+"""
+Middleware for running different middleware stacks per URL prefix.
+"""
+
+from typing import Callable, Dict, List, Sequence
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+
+class MiddlewareChain:
+    """
+    A middleware stack built once around a ``get_response`` callable.
+
+    Besides the wrapped handler this keeps the stack's ``process_view``,
+    ``process_template_response`` and ``process_exception`` hooks, which
+    Django only collects from ``MIDDLEWARE`` itself.
+    """
+
+    def __init__(self, middleware_paths: Sequence[str], get_response: Callable):
+        self.view_middleware: List[Callable] = []
+        self.template_response_middleware: List[Callable] = []
+        self.exception_middleware: List[Callable] = []
+
+        handler = get_response
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            try:
+                instance = middleware(handler)
+            except MiddlewareNotUsed:
+                continue
+            if instance is None:
+                raise ValueError(f"Middleware factory {middleware_path} returned None.")
+
+            # Hooks run in the same order Django runs those of MIDDLEWARE
+            if hasattr(instance, "process_view"):
+                self.view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, "process_template_response"):
+                self.template_response_middleware.append(
+                    instance.process_template_response
+                )
+            if hasattr(instance, "process_exception"):
+                self.exception_middleware.append(instance.process_exception)
+            handler = instance
+        self.handler = handler
+
+
+class PathMiddlewareDispatcher:
+    """
+    Middleware running a per-path stack from ``SCOPED_MIDDLEWARE``.
+
+    ``SCOPED_MIDDLEWARE`` maps URL prefixes to lists of middleware paths;
+    a request runs the stack of the longest prefix of its path, and ``""``
+    is the fallback. Every stack is built at startup, so a request pays
+    only for the layers its prefix declares.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        self.chains: Dict[str, MiddlewareChain] = {
+            prefix: MiddlewareChain(middleware_paths, get_response)
+            for prefix, middleware_paths in sorted(
+                settings.SCOPED_MIDDLEWARE.items(),
+                key=lambda item: len(item[0]),
+                reverse=True,
+            )
+        }
+        if "" not in self.chains:
+            self.chains[""] = MiddlewareChain([], get_response)
+
+    def get_chain(self, request: HttpRequest) -> MiddlewareChain:
+        """
+        Return the middleware stack for the request's path.
+        """
+        path = request.path_info
+        for prefix, chain in self.chains.items():
+            if path.startswith(prefix):
+                return chain
+        return self.chains[""]
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        request._middleware_chain = self.get_chain(request)
+        return request._middleware_chain.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in request._middleware_chain.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        for process in request._middleware_chain.template_response_middleware:
+            response = process(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        for process_exception in request._middleware_chain.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
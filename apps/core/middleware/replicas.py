@@ -0,0 +1,66 @@
+"""
+Middleware for routing reads to database replicas.
+"""
+
+from typing import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.db.routers import read_from, select_replica
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_SALT = "apps.core.middleware.replicas"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware sending safe requests' reads to a replica.
+
+    Unsafe requests run entirely against the primary and pin the client to it
+    for ``REPLICA_PIN_SECONDS`` with a signed cookie, so a client reading
+    right after a write sees that write even if replicas have not caught up.
+    Without configured replicas the middleware does nothing.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            self._pin_to_primary(response)
+            return response
+
+        alias = None if self._is_pinned(request) else select_replica()
+        with read_from(alias):
+            return self.get_response(request)
+
+    def _is_pinned(self, request: HttpRequest) -> bool:
+        """
+        Whether the client wrote within the pin window.
+        """
+        pinned = request.get_signed_cookie(
+            settings.REPLICA_PIN_COOKIE_NAME,
+            default=None,
+            salt=PIN_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS,
+        )
+        return pinned is not None
+
+    def _pin_to_primary(self, response: HttpResponse) -> None:
+        """
+        Send the client's reads to the primary for the pin window.
+        """
+        response.set_signed_cookie(
+            settings.REPLICA_PIN_COOKIE_NAME,
+            "1",
+            salt=PIN_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite="Lax",
+        )
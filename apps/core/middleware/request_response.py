@@ -5,7 +5,6 @@ Middleware for handling request and response processing.
 import json
 import logging
 import time
-import uuid
 from typing import Any, Callable, Dict, Optional
 
 from django.http import HttpRequest, HttpResponse, JsonResponse
@@ -18,8 +17,8 @@ class RequestResponseMiddleware:
     Middleware for processing requests and responses.
     
     This middleware:
-    1. Adds a request ID to each request
-    2. Logs request and response details
+    1. Logs request and response details, with the request's ID
+    2. Reports the request duration in a response header
     3. Handles response formatting
     """
     
@@ -27,11 +26,6 @@ class RequestResponseMiddleware:
         self.get_response = get_response
     
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        # Generate a unique request ID
-        request_id = str(uuid.uuid4())
-        request.request_id = request_id
-        
-        # Add request ID to response headers
         start_time = time.time()
         
         # Process the request
@@ -42,7 +36,6 @@ class RequestResponseMiddleware:
         duration = time.time() - start_time
         
         # Add headers to response
-        response["X-Request-ID"] = request_id
         response["X-Request-Duration"] = str(int(duration * 1000))  # in milliseconds
         
         # Log the response
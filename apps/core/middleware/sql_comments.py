@@ -0,0 +1,83 @@
+"""
+Middleware for tagging SQL queries with the endpoint that issued them.
+"""
+
+from contextlib import ExitStack
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.db.comments import QueryCommenter
+from apps.core.tracing import get_current_trace
+
+
+def get_view_name(view_func: Callable, method: str) -> str:
+    """
+    Return ``Class.action`` for a view, e.g. ``UserViewSet.list``.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    if view_class is None:
+        return getattr(view_func, "__qualname__", type(view_func).__name__)
+
+    # DRF viewsets map HTTP methods to actions such as "list" or "retrieve"
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return f"{view_class.__name__}.{action}"
+
+
+class SQLCommentMiddleware:
+    """
+    Middleware appending sqlcommenter tags to every query of a request.
+
+    ``SQL_COMMENT_TAGS`` selects the tags:
+
+    - ``route``: the URL name, or the URL pattern if unnamed.
+    - ``view``: the view class and action, such as ``UserViewSet.list``.
+    - ``request_id`` and ``traceparent``: the request's trace context.
+
+    Keep the default ``route`` and ``view``, which repeat across requests.
+    The trace tags make every request's SQL text unique. That still
+    groups correctly in ``pg_stat_statements``, which ignores comments, but
+    defeats caches keyed on statement text, such as psycopg's prepared
+    statements and some log-based query digests.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+        self.tags = set(settings.SQL_COMMENT_TAGS)
+        if not self.tags:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        request._sql_commenter = QueryCommenter(self.get_trace_tags())
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(request._sql_commenter))
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        tags = {}
+        if "route" in self.tags and request.resolver_match is not None:
+            tags["route"] = (
+                request.resolver_match.url_name or request.resolver_match.route
+            )
+        if "view" in self.tags:
+            tags["view"] = get_view_name(view_func, request.method)
+        request._sql_commenter.update(tags)
+        return None
+
+    def get_trace_tags(self) -> Dict[str, Optional[str]]:
+        trace = get_current_trace()
+        if trace is None:
+            return {}
+        tags = {}
+        if "request_id" in self.tags:
+            tags["request_id"] = trace.request_id
+        if "traceparent" in self.tags:
+            tags["traceparent"] = trace.to_traceparent()
+        return tags
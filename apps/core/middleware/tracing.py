@@ -0,0 +1,99 @@
+"""
+Middleware for tracing requests.
+"""
+
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from django.http import HttpRequest, HttpResponse
+
+from apps.core.tracing import (
+    end_span,
+    get_current_span,
+    set_span_attributes,
+    start_span,
+    trace_from_request,
+)
+
+
+def traced_stream(chunks: Iterator[bytes], span: Any) -> Iterator[bytes]:
+    """
+    Yield a streaming body, ending ``span`` once it is sent or closed.
+    """
+    error: Optional[BaseException] = None
+    try:
+        yield from chunks
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        end_span(span, error)
+
+
+async def atraced_stream(
+    chunks: AsyncIterator[bytes], span: Any
+) -> AsyncIterator[bytes]:
+    """
+    Asynchronous version of ``traced_stream``.
+    """
+    error: Optional[BaseException] = None
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        end_span(span, error)
+
+
+class TraceContextMiddleware:
+    """
+    Middleware running each request in a server span.
+
+    Continues the trace and request ID received from upstream (``traceparent``
+    and ``X-Request-ID``) or starts new ones, exposes the request ID as
+    ``request.request_id`` and returns it in the ``X-Request-ID`` header.
+    Should come first so everything logged while handling the request is
+    stamped with it.
+
+    The span of a streaming response ends once its body has been sent, so
+    its duration and any error raised while streaming are recorded.
+    """
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        span = None
+        try:
+            with start_span(
+                f"HTTP {request.method}",
+                parent=trace_from_request(request),
+                kind="server",
+                attributes={
+                    "http.method": request.method,
+                    "http.target": request.path,
+                },
+                end_on_exit=False,
+            ) as trace:
+                span = get_current_span()
+                request.request_id = trace.request_id
+                response = self.get_response(request)
+
+                attributes = {"http.status_code": response.status_code}
+                resolver_match = getattr(request, "resolver_match", None)
+                if resolver_match is not None:
+                    attributes["http.route"] = resolver_match.route
+                set_span_attributes(attributes)
+        except BaseException:
+            end_span(span)
+            raise
+
+        if span is not None and response.streaming:
+            stream = atraced_stream if response.is_async else traced_stream
+            response.streaming_content = stream(response.streaming_content, span)
+        else:
+            end_span(span)
+
+        response["X-Request-ID"] = trace.request_id
+        return response
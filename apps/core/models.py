@@ -4,11 +4,14 @@ Core models for the project.
 This module contains abstract base models that can be used across the project.
 """
 
-import uuid
+import copy
 
 from django.db import models
+from django.db.models.fields.files import FieldFile
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.utils.ids import uuid7
+
 
 class TimeStampedModel(models.Model):
     """
@@ -26,9 +29,14 @@ class TimeStampedModel(models.Model):
 class UUIDModel(models.Model):
     """
     An abstract base model that uses UUID as the primary key.
+
+    IDs are time-ordered UUIDv7s, so inserts append to the primary key index
+    and ``id`` orders rows by creation, e.g. as a keyset pagination cursor.
+    Models whose IDs must not reveal when a row was created can redeclare
+    ``id`` with ``default=uuid.uuid4``.
     """
     id = models.UUIDField(
-        primary_key=True, default=uuid.uuid4, editable=False, verbose_name=_("ID")
+        primary_key=True, default=uuid7, editable=False, verbose_name=_("ID")
     )
 
     class Meta:
@@ -38,6 +46,109 @@ class UUIDModel(models.Model):
 class BaseModel(UUIDModel, TimeStampedModel):
     """
     An abstract base model that combines UUID primary key and timestamp fields.
+
+    Instances loaded from the database remember their field values, and
+    ``save()`` without ``update_fields`` writes only the fields that changed
+    (plus ``auto_now`` fields such as ``updated_at``). When nothing changed
+    the save is skipped entirely, without running ``pre_save``/``post_save``
+    signals; pass ``update_fields`` or ``force_update=True`` to force a write.
+
+    Subclasses that declare their own ``Meta`` should extend ``BaseModel.Meta``
+    and its ``indexes`` so the timestamp indexes are kept.
     """
     class Meta:
         abstract = True
+        indexes = [
+            # Serves created_at range filters and stable (created_at, id) ordering
+            models.Index(
+                fields=["created_at", "id"], name="%(app_label)s_%(class)s_ca_idx"
+            ),
+            models.Index(fields=["updated_at"], name="%(app_label)s_%(class)s_ua_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields(instance._meta.concrete_fields)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None:
+            self._snapshot_fields(self._meta.concrete_fields)
+        else:
+            self._snapshot_fields(
+                [
+                    field
+                    for field in self._meta.concrete_fields
+                    if field.name in fields or field.attname in fields
+                ]
+            )
+
+    def get_dirty_fields(self) -> list:
+        """
+        Return the names of concrete fields changed since the instance was loaded.
+
+        Fields that were deferred when loading but have since been set or
+        fetched count as changed.
+        """
+        loaded_values = getattr(self, "_loaded_values", None)
+        if loaded_values is None:
+            return [field.name for field in self._meta.concrete_fields]
+        deferred = self.get_deferred_fields()
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if field.attname not in loaded_values or (
+                loaded_values[field.attname] != self._get_tracked_value(field)
+            ):
+                dirty.append(field.name)
+        return dirty
+
+    def save(self, *args, **kwargs):
+        if (
+            not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and not kwargs.get("force_update")
+            and not self._state.adding
+            and getattr(self, "_loaded_values", None) is not None
+        ):
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            if self._meta.pk.name not in dirty:
+                auto_now = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if getattr(field, "auto_now", False) and field.name not in dirty
+                ]
+                kwargs["update_fields"] = dirty + auto_now
+
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            fields = self._meta.concrete_fields
+        else:
+            fields = [self._meta.get_field(name) for name in update_fields]
+        self._snapshot_fields(fields)
+
+    def _snapshot_fields(self, fields) -> None:
+        if getattr(self, "_loaded_values", None) is None:
+            self._loaded_values = {}
+        deferred = self.get_deferred_fields()
+        for field in fields:
+            if field.attname not in deferred:
+                self._loaded_values[field.attname] = self._get_tracked_value(field)
+
+    def _get_tracked_value(self, field):
+        value = getattr(self, field.attname)
+        if isinstance(value, FieldFile):
+            # A freshly assigned file is always a change
+            return value.name if value._committed else object()
+        if isinstance(value, (dict, list)):
+            # JSON values can be mutated in place
+            return copy.deepcopy(value)
+        return value
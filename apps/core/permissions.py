@@ -2,8 +2,180 @@
 Custom permissions for the project.
 """
 
+from typing import Union
+
+from django.db.models import Q
 from rest_framework import permissions
 
+# What a row policy compiles to: a filter, or True/False for all/no rows
+Compiled = Union[Q, bool]
+
+
+class RowPolicy:
+    """
+    Base class for declarative row-level access rules.
+
+    A view declares its rules once, e.g. ``row_policy = Staff() | Owner("user")``,
+    and they are compiled into a single queryset filter by
+    ``BaseViewSet.get_queryset()`` (or ``RowPolicyFilterBackend`` for other
+    views) and checked against loaded objects by
+    ``HasRowPolicy`` without further queries. Policies combine with ``|``
+    and ``&``.
+    """
+
+    def compile(self, request, model) -> Compiled:
+        """
+        Return the filter selecting rows of ``model`` visible to the request.
+        """
+        raise NotImplementedError("Subclasses must implement compile()")
+
+    def check(self, request, obj) -> bool:
+        """
+        Whether ``obj`` is visible to the request, decided in memory.
+        """
+        raise NotImplementedError("Subclasses must implement check()")
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+
+class Owner(RowPolicy):
+    """
+    Rows whose ``field`` points at the requesting user.
+
+    Compares the foreign key column (``user_id``) with the user's primary
+    key, so neither the filter nor the check loads the related user. Use
+    ``Owner("pk")`` on the user model itself.
+    """
+
+    def __init__(self, field: str = "user"):
+        self.field = field
+
+    def get_attname(self, model) -> str:
+        if self.field == "pk":
+            return model._meta.pk.attname
+        return model._meta.get_field(self.field).attname
+
+    def compile(self, request, model):
+        if not request.user.is_authenticated:
+            return False
+        return Q(**{self.get_attname(model): request.user.pk})
+
+    def check(self, request, obj):
+        if not request.user.is_authenticated:
+            return False
+        return getattr(obj, self.get_attname(type(obj))) == request.user.pk
+
+
+class Staff(RowPolicy):
+    """
+    Every row, for staff users.
+    """
+
+    def compile(self, request, model):
+        return bool(request.user and request.user.is_staff)
+
+    def check(self, request, obj):
+        return bool(request.user and request.user.is_staff)
+
+
+class FieldEquals(RowPolicy):
+    """
+    Rows whose local fields have the given values, e.g. ``is_public=True``.
+    """
+
+    def __init__(self, **values):
+        self.values = values
+
+    def compile(self, request, model):
+        return Q(**self.values)
+
+    def check(self, request, obj):
+        return all(getattr(obj, name) == value for name, value in self.values.items())
+
+
+class AnyOf(RowPolicy):
+    """
+    Rows allowed by at least one of the policies.
+    """
+
+    def __init__(self, *policies: RowPolicy):
+        self.policies = policies
+
+    def compile(self, request, model):
+        filters = []
+        for policy in self.policies:
+            compiled = policy.compile(request, model)
+            if compiled is True:
+                return True
+            if compiled is not False:
+                filters.append(compiled)
+        if not filters:
+            return False
+        combined = filters[0]
+        for compiled in filters[1:]:
+            combined |= compiled
+        return combined
+
+    def check(self, request, obj):
+        return any(policy.check(request, obj) for policy in self.policies)
+
+
+class AllOf(RowPolicy):
+    """
+    Rows allowed by every one of the policies.
+    """
+
+    def __init__(self, *policies: RowPolicy):
+        self.policies = policies
+
+    def compile(self, request, model):
+        filters = []
+        for policy in self.policies:
+            compiled = policy.compile(request, model)
+            if compiled is False:
+                return False
+            if compiled is not True:
+                filters.append(compiled)
+        if not filters:
+            return True
+        combined = filters[0]
+        for compiled in filters[1:]:
+            combined &= compiled
+        return combined
+
+    def check(self, request, obj):
+        return all(policy.check(request, obj) for policy in self.policies)
+
+
+def apply_row_policy(policy: RowPolicy, request, queryset):
+    """
+    Filter ``queryset`` down to the rows ``policy`` allows for the request.
+    """
+    compiled = policy.compile(request, queryset.model)
+    if compiled is True:
+        return queryset
+    if compiled is False:
+        return queryset.none()
+    return queryset.filter(compiled)
+
+
+class HasRowPolicy(permissions.BasePermission):
+    """
+    Permission enforcing the view's ``row_policy`` on single objects.
+
+    Objects fetched through the view's filtered queryset already satisfy
+    the policy; this re-checks them in memory for views that fetch objects some
+    other way.
+    """
+
+    def has_object_permission(self, request, view, obj):
+        policy = getattr(view, "row_policy", None)
+        return policy is None or policy.check(request, obj)
+
 
 class IsOwner(permissions.BasePermission):
     """
@@ -11,8 +183,8 @@ class IsOwner(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        # Check if the user is the owner of the object
-        return obj.user == request.user
+        # Compare foreign key IDs so the owner is never fetched
+        return Owner(getattr(view, "owner_field", "user")).check(request, obj)
 
 
 class IsAdminUser(permissions.BasePermission):
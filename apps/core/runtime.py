@@ -0,0 +1,119 @@
+"""
+Server runtime helpers for the project.
+
+Used by ``config/gunicorn.py`` to size the worker pool from the limits of
+the container it runs in, and by the ``worker_memory`` command to report
+how much memory each worker shares with the others. Only the standard
+library is used, so the gunicorn config can import this before Django is
+set up.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# cgroup v1 reports "no limit" as a huge page-aligned number
+UNLIMITED_MEMORY = 2**60
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def get_cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """
+    Return the number of CPUs this process may use.
+
+    A cgroup CPU quota is rounded up; without one, the CPUs in the
+    process's affinity mask are counted.
+    """
+    quota = period = None
+    cpu_max = _read(cgroup_root / "cpu.max")
+    if cpu_max:
+        quota, period = cpu_max.split()
+    else:
+        quota = _read(cgroup_root / "cpu" / "cpu.cfs_quota_us")
+        period = _read(cgroup_root / "cpu" / "cpu.cfs_period_us")
+    if quota not in (None, "max", "-1") and period:
+        return max(1, math.ceil(int(quota) / int(period)))
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def get_memory_limit(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """
+    Return the memory available to this process's cgroup, in bytes.
+
+    Falls back to the machine's physical memory.
+    """
+    limit = _read(cgroup_root / "memory.max") or _read(
+        cgroup_root / "memory" / "memory.limit_in_bytes"
+    )
+    if limit and limit != "max" and int(limit) < UNLIMITED_MEMORY:
+        return int(limit)
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def get_worker_count(
+    cpu_limit: int, memory_limit: int, worker_memory: int, master_memory: int
+) -> int:
+    """
+    Return how many workers fit the CPU and memory limits.
+
+    Args:
+        cpu_limit: CPUs available; allows ``2 * cpu_limit + 1`` workers.
+        memory_limit: Memory available in bytes.
+        worker_memory: Memory each worker needs beyond what it shares with
+            the master, in bytes.
+        master_memory: Memory of the preloaded master, in bytes.
+
+    Returns:
+        The smaller of both limits, and at least one.
+    """
+    by_cpu = 2 * cpu_limit + 1
+    by_memory = (memory_limit - master_memory) // worker_memory
+    return max(1, min(by_cpu, by_memory))
+
+
+def get_process_memory(pid: int) -> Dict[str, int]:
+    """
+    Return a process's resident, proportional and unique memory in bytes.
+
+    Unique memory (USS) is what the process alone holds: the memory freed
+    if it exited. Copy-on-write pages still shared with the master or
+    other workers only count towards RSS and, split, towards PSS.
+    """
+    totals = {"rss": 0, "pss": 0, "uss": 0}
+    fields = {
+        "Rss": "rss",
+        "Pss": "pss",
+        "Private_Clean": "uss",
+        "Private_Dirty": "uss",
+    }
+    proc = Path("/proc") / str(pid)
+    smaps = _read(proc / "smaps_rollup") or _read(proc / "smaps") or ""
+    for line in smaps.splitlines():
+        name, _, value = line.partition(":")
+        if name in fields:
+            totals[fields[name]] += int(value.split()[0]) * 1024
+    return totals
+
+
+def get_child_pids(pid: int) -> List[int]:
+    """
+    Return the PIDs of a process's direct children.
+    """
+    children = []
+    for stat_path in Path("/proc").glob("[0-9]*/stat"):
+        stat = _read(stat_path)
+        # The command name may contain spaces; fields resume after its ")"
+        if stat and int(stat.rpartition(")")[2].split()[1]) == pid:
+            children.append(int(stat_path.parent.name))
+    return sorted(children)
@@ -2,8 +2,13 @@
 Base serializers for the project.
 """
 
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from apps.core.utils.images import sniff_image_format
+
 
 class BaseModelSerializer(serializers.ModelSerializer):
     """
@@ -38,3 +43,29 @@ class BaseSerializer(serializers.Serializer):
         Update method must be implemented by subclasses.
         """
         raise NotImplementedError("Subclasses must implement update()")
+
+
+class UploadedImageField(serializers.FileField):
+    """
+    Image upload field that validates without decoding the image.
+
+    Unlike DRF's ``ImageField`` it only checks the file signature and size, so
+    Pillow never runs on the request worker. Full decoding happens in the
+    background image pipeline, which discards files that turn out invalid.
+    """
+
+    default_error_messages = {
+        "invalid_image": _(
+            "Upload a valid image. Supported formats are JPEG, PNG, GIF and WebP."
+        ),
+        "too_large": _("Image files may not be larger than {max_size}."),
+    }
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        max_size = settings.IMAGE_UPLOAD_MAX_SIZE
+        if file.size > max_size:
+            self.fail("too_large", max_size=filesizeformat(max_size))
+        if sniff_image_format(file) is None:
+            self.fail("invalid_image")
+        return file
@@ -2,13 +2,138 @@
 Custom storage backends for the project.
 """
 
+import hashlib
+import os
+import uuid
+
 from django.conf import settings
+from django.core.files import File
 from storages.backends.s3boto3 import S3Boto3Storage
 
+from apps.core.utils.cache import LRUCache
+
 
-class MediaStorage(S3Boto3Storage):
+class CollisionFreeNameMixin:
+    """
+    Storage mixin that names files so they can never collide.
+
+    With ``naming = "hash"`` the name is derived from a SHA-256 of the content,
+    so identical uploads map to a single object. With ``naming = "uuid"`` every
+    upload gets a fresh random name. Either way the storage never needs to ask
+    whether a name is taken, and the mixin must be combined with a backend
+    that overwrites in place (``file_overwrite = True`` for S3).
+
+    The directory and extension of the requested name are kept.
+    """
+
+    naming = "hash"
+    hash_chunk_size = 64 * 1024
+
+    @property
+    def deduplicates(self):
+        """
+        Whether different files may share one stored object.
+
+        Callers must not delete objects from a deduplicating storage merely
+        because one referencing row no longer needs them.
+        """
+        return self.naming == "hash"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.get_collision_free_name(name, content)
+        return super().save(name, content, max_length=max_length)
+
+    def get_collision_free_name(self, name, content):
+        """
+        Return the name to store ``content`` under, given the requested name.
+        """
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        if self.naming == "uuid":
+            key = uuid.uuid4().hex
+        else:
+            key = self.get_content_hash(content)
+        return os.path.join(directory, f"{key}{extension}")
+
+    def get_content_hash(self, content):
+        """
+        Return the hex SHA-256 of ``content``, leaving it rewound.
+        """
+        digest = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks(self.hash_chunk_size):
+            digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+        if hasattr(content, "seek"):
+            content.seek(0)
+        return digest.hexdigest()
+
+
+class CachedURLMixin:
+    """
+    Storage mixin that caches generated URLs per process.
+
+    Unsigned URLs never change for a given name and are memoized. Signed URLs
+    are reused until ``url_cache_margin`` seconds before they expire, so a
+    page of serialized files does one signing operation per distinct file
+    rather than one per row. The cache is a shared, size-capped LRU.
+    """
+
+    url_cache = LRUCache(maxsize=getattr(settings, "MEDIA_URL_CACHE_SIZE", 10000))
+    url_cache_margin = 60
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if parameters or http_method:
+            # Custom responses are rare; sign them individually.
+            return super().url(
+                name, parameters=parameters, expire=expire, http_method=http_method
+            )
+
+        signed = self.is_url_signed()
+        key = (self.url_cache_key(), name, expire if signed else None)
+        url = self.url_cache.get(key)
+        if url is None:
+            url = super().url(name, expire=expire)
+            expires_at = None
+            if signed:
+                lifetime = self.querystring_expire if expire is None else expire
+                expires_at = self.url_cache.clock() + max(
+                    lifetime - self.url_cache_margin, 0
+                )
+            self.url_cache.set(key, url, expires_at)
+        return url
+
+    def url_cache_key(self):
+        """
+        Return what distinguishes this storage's URLs from other instances.
+        """
+        return (
+            type(self),
+            getattr(self, "bucket_name", None),
+            self.location,
+            getattr(self, "custom_domain", None),
+        )
+
+    def is_url_signed(self):
+        """
+        Whether URLs from this storage carry an expiring signature.
+        """
+        if self.custom_domain:
+            return bool(self.querystring_auth and self.cloudfront_signer)
+        return bool(self.querystring_auth)
+
+
+class MediaStorage(CollisionFreeNameMixin, CachedURLMixin, S3Boto3Storage):
     """
     Custom storage backend for media files.
+
+    Names are content-addressed, so uploads overwrite in place instead of
+    issuing ``HEAD`` requests to find a free name, and URLs are cached.
     """
     location = "media"
-    file_overwrite = False
+    file_overwrite = True
+    naming = getattr(settings, "MEDIA_STORAGE_NAMING", "hash")
@@ -0,0 +1,194 @@
+"""
+Tests for the two-tier cache backend.
+"""
+
+import time
+import uuid
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+from apps.core.cache.backends import LocalTier, TieredRedisCache
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+
+class LocalTierTests(SimpleTestCase):
+    """
+    Tests for the in-process tier.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.tier = LocalTier("cache:invalidate", maxsize=10)
+        self.tier.handle({"type": "subscribe", "data": 1})
+
+    def test_values_are_copied(self):
+        """
+        Test that mutating a returned value does not change the cached one.
+        """
+        self.tier.store("key", {"a": 1}, 60, self.tier.generation)
+        self.tier.load("key")["a"] = 2
+        self.assertEqual(self.tier.load("key"), {"a": 1})
+
+    def test_invalidations_from_other_processes(self):
+        """
+        Test that keys published by another process are dropped.
+        """
+        self.tier.store("a", 1, 60, self.tier.generation)
+        self.tier.store("b", 2, 60, self.tier.generation)
+        self.tier.handle(
+            {"type": "message", "data": '{"sender": "other", "keys": ["a"]}'}
+        )
+        self.assertEqual(list(self.tier.local._data), ["b"])
+
+        own = f'{{"sender": "{self.tier.sender}", "clear": true}}'
+        self.tier.handle({"type": "message", "data": own})
+        self.assertEqual(len(self.tier.local), 1)
+
+        self.tier.handle({"type": "message", "data": "not json"})
+        self.tier.handle(
+            {"type": "message", "data": '{"sender": "other", "clear": true}'}
+        )
+        self.assertEqual(len(self.tier.local), 0)
+
+    def test_reads_racing_invalidations_are_not_cached(self):
+        """
+        Test that a value read before an invalidation is not stored.
+        """
+        generation = self.tier.generation
+        self.tier.discard(["key"])
+        self.tier.store("key", "stale", 60, generation)
+        self.assertNotIn("key", self.tier.local)
+
+    def test_stats(self):
+        """
+        Test that hit ratios are reported per tier.
+        """
+        self.tier.store("key", "value", 60, self.tier.generation)
+        self.tier.load("key")
+        self.tier.load("key")
+        self.tier.load("other")
+        stats = self.tier.get_stats()
+        self.assertEqual(stats["local"]["hits"], 2)
+        self.assertAlmostEqual(stats["local"]["hit_ratio"], 2 / 3)
+        self.assertEqual(stats["redis"]["hit_ratio"], 0.0)
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class TieredRedisCacheTests(SimpleTestCase):
+    """
+    Tests for the backend against an in-memory Redis server.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.server = fakeredis.FakeServer()
+        self.channel = f"cache:invalidate:{uuid.uuid4().hex}"
+        self.cache = self.make_cache()
+        # A second process, with its own local tier
+        self.other = self.make_cache()
+        self.other.tier = LocalTier(self.channel, maxsize=100)
+        for cache in (self.cache, self.other):
+            cache.get("warm-up")
+            wait_for(lambda: cache.tier.subscribed)
+
+    def make_cache(self):
+        return TieredRedisCache(
+            "redis://localhost:6379/0",
+            {
+                "OPTIONS": {
+                    "CONNECTION_POOL_KWARGS": {
+                        "connection_class": fakeredis.FakeRedisConnection,
+                        "server": self.server,
+                    },
+                    "INVALIDATION_CHANNEL": self.channel,
+                    "LOCAL_EXCLUDE": ["throttle_*"],
+                },
+            },
+        )
+
+    def delete_from_redis(self, key):
+        # Bypasses the backend, so no invalidation is published
+        self.cache.client.get_client().delete(self.cache.make_key(key))
+
+    def set_in_redis(self, key, value, timeout):
+        # Bypasses the backend, so no invalidation is published
+        self.cache.client.get_client().set(
+            self.cache.make_key(key),
+            self.cache.client.encode(value),
+            px=int(timeout * 1000),
+        )
+
+    def test_hot_keys_are_served_from_memory(self):
+        """
+        Test that repeat reads do not reach Redis.
+        """
+        self.cache.set("key", {"value": 1})
+        self.delete_from_redis("key")
+        self.assertEqual(self.cache.get("key"), {"value": 1})
+        self.assertEqual(self.cache.get_many(["key"]), {"key": {"value": 1}})
+        self.assertEqual(self.cache.get_stats()["local"]["hits"], 2)
+
+    def test_writes_invalidate_other_processes(self):
+        """
+        Test that a write is seen by another process's next read.
+        """
+        self.cache.set("key", "old")
+        self.assertEqual(self.other.get("key"), "old")
+        self.assertIn(self.other.make_key("key"), self.other.tier.local)
+
+        self.cache.set("key", "new")
+        wait_for(lambda: self.other.make_key("key") not in self.other.tier.local)
+        self.assertEqual(self.other.get("key"), "new")
+
+        self.cache.delete("key")
+        wait_for(lambda: self.other.make_key("key") not in self.other.tier.local)
+        self.assertIsNone(self.other.get("key"))
+
+    def test_reads_do_not_outlive_the_redis_ttl(self):
+        """
+        Test that a value read from Redis is not served past its expiry.
+        """
+        for key in ("key", "many"):
+            self.set_in_redis(key, "value", timeout=0.3)
+        self.assertEqual(self.other.get("key"), "value")
+        self.assertEqual(self.other.get_many(["many"]), {"many": "value"})
+        self.assertEqual(len(self.other.tier.local), 2)
+
+        time.sleep(0.4)
+        self.assertIsNone(self.other.get("key"))
+        self.assertEqual(self.other.get_many(["many"]), {})
+
+    def test_excluded_keys_always_read_redis(self):
+        """
+        Test that opted-out keys are neither cached locally nor broadcast.
+        """
+        self.cache.set("throttle_user_1", [1.0])
+        self.cache.get("throttle_user_1")
+        self.assertEqual(len(self.cache.tier.local), 0)
+        self.assertEqual(self.cache.get_stats()["redis"]["hits"], 1)
+
+    def test_local_tier_is_bypassed_while_unsubscribed(self):
+        """
+        Test that nothing is served from memory without invalidations.
+        """
+        self.cache.set("key", "value")
+        self.cache.tier.subscribed = False
+        self.delete_from_redis("key")
+        self.assertIsNone(self.cache.get("key"))
@@ -0,0 +1,102 @@
+"""
+Tests for the compression middleware.
+"""
+
+import gzip
+import json
+from unittest import skipUnless
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.middleware import compression
+from apps.core.middleware.compression import CompressionMiddleware
+
+
+@override_settings(COMPRESSION_ENCODINGS=["gzip"], COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTests(TestCase):
+    """
+    Tests for the CompressionMiddleware.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.factory = RequestFactory()
+        self.payload = {
+            "results": [{"email": f"user{i}@example.com"} for i in range(50)]
+        }
+
+    def _process(self, response, accept_encoding="gzip, deflate, br"):
+        middleware = CompressionMiddleware(lambda request: response)
+        request = self.factory.get(
+            "/api/v1/users/", HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        return middleware(request)
+
+    def test_compresses_large_json_response(self):
+        """
+        Test that a large JSON body is gzip encoded.
+        """
+        response = self._process(JsonResponse(self.payload))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+    def test_skips_small_response(self):
+        """
+        Test that bodies under the threshold are left uncompressed.
+        """
+        response = self._process(JsonResponse({"status": "success"}))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_skips_when_not_accepted(self):
+        """
+        Test that clients without a matching coding get the identity body.
+        """
+        response = self._process(JsonResponse(self.payload), accept_encoding="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_skips_incompressible_content_type(self):
+        """
+        Test that binary content types are not compressed.
+        """
+        response = self._process(HttpResponse(b"\x00" * 1000, content_type="image/png"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compresses_streaming_response(self):
+        """
+        Test that streaming responses are compressed chunk by chunk.
+        """
+        chunks = [b'{"row": %d}\n' % i for i in range(100)]
+        response = self._process(
+            StreamingHttpResponse(iter(chunks), content_type="application/json")
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), b"".join(chunks))
+
+    def test_weakens_etag(self):
+        """
+        Test that a strong ETag becomes weak once the body is encoded.
+        """
+        response = JsonResponse(self.payload)
+        response["ETag"] = '"abc"'
+        response = self._process(response)
+        self.assertEqual(response["ETag"], 'W/"abc"')
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    @override_settings(COMPRESSION_ENCODINGS=["br", "gzip"], COMPRESSION_LARGE_SIZE=100)
+    def test_large_bodies_prefer_cheaper_codec(self):
+        """
+        Test that brotli is deprioritized for bodies above the large size.
+        """
+        middleware = CompressionMiddleware(lambda request: None)
+        selected = middleware.select_compressor("gzip, br", size=1000)
+        self.assertEqual(selected.encoding, "gzip")
+        selected = middleware.select_compressor("gzip;q=0.5, br", size=1000)
+        self.assertEqual(selected.encoding, "br")
+        selected = middleware.select_compressor("gzip, br", size=50)
+        self.assertEqual(selected.encoding, "br")
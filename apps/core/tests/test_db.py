@@ -0,0 +1,106 @@
+"""
+Tests for the database connection pool metrics and migration operations.
+"""
+
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import NotSupportedError, connection, models
+from django.db.migrations.state import ProjectState
+from django.test import SimpleTestCase, TransactionTestCase
+
+from apps.core.db import metrics
+from apps.core.db.operations import AddIndexConcurrently
+from apps.core.db.backends.postgresql import base as pooled_backend
+
+
+class PoolMetricsTests(SimpleTestCase):
+    """
+    Tests for the pool metrics collector.
+    """
+
+    def setUp(self):
+        """
+        Set up a fake pool for the default alias.
+        """
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_waiting": 2,
+        }
+        patcher = mock.patch.dict(pooled_backend.pools, {"default": pool})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(
+            pooled_backend.checkout_stats,
+            {
+                "default": {
+                    "checkouts": 10,
+                    "checkout_seconds_total": 0.5,
+                    "checkout_seconds_max": 0.2,
+                }
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_pool_stats(self):
+        """
+        Test that pool and checkout statistics are merged per alias.
+        """
+        stats = metrics.get_pool_stats()["default"]
+        self.assertEqual(stats["requests_waiting"], 2)
+        self.assertEqual(stats["checkouts"], 10)
+
+    @skipUnless(metrics.GaugeMetricFamily, "prometheus_client is not installed")
+    def test_collector_exports_waiters_and_checkout_latency(self):
+        """
+        Test that the collector yields waiter and checkout latency samples.
+        """
+        samples = {
+            sample.name: sample.value
+            for family in metrics.PoolMetricsCollector().collect()
+            for sample in family.samples
+        }
+        self.assertEqual(samples["django_db_requests_waiting"], 2)
+        self.assertEqual(samples["django_db_pool_checkouts_total"], 10)
+        self.assertEqual(samples["django_db_pool_checkout_seconds_max"], 0.2)
+
+
+class AddIndexConcurrentlyTests(TransactionTestCase):
+    """
+    Tests for the concurrent index migration operation.
+    """
+
+    def test_creates_index_on_non_postgresql(self):
+        """
+        Test that the operation falls back to a plain index elsewhere.
+        """
+        operation = AddIndexConcurrently(
+            "user", models.Index(fields=["bio"], name="users_user_bio_test_idx")
+        )
+        state = ProjectState.from_apps(apps)
+        new_state = state.clone()
+        operation.state_forwards("users", new_state)
+
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_forwards("users", editor, state, new_state)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "users_user")
+        self.assertIn("users_user_bio_test_idx", constraints)
+
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_backwards("users", editor, new_state, state)
+
+    def test_postgresql_requires_non_atomic_migration(self):
+        """
+        Test that a concurrent build inside a transaction is refused.
+        """
+        operation = AddIndexConcurrently(
+            "user", models.Index(fields=["bio"], name="users_user_bio_test_idx")
+        )
+        editor = mock.Mock(atomic_migration=True)
+        editor.connection.vendor = "postgresql"
+        with self.assertRaises(NotSupportedError):
+            operation.database_forwards("users", editor, None, None)
@@ -0,0 +1,61 @@
+"""
+Tests for the path-scoped middleware dispatcher.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+class PathMiddlewareDispatcherTests(TestCase):
+    """
+    Tests for running middleware per URL prefix.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+
+    def test_api_requests_skip_session_layers(self):
+        """
+        Test that API requests load no session and set no session cookie.
+        """
+        client = APIClient()
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        response = client.get(reverse("user-me"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertNotIn("X-Frame-Options", response)
+
+    def test_docs_only_get_framing_protection(self):
+        """
+        Test that documentation pages get X-Frame-Options but no session.
+        """
+        response = self.client.get(reverse("swagger-ui"))
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+
+    def test_admin_keeps_full_stack(self):
+        """
+        Test that the admin still gets sessions, users and CSRF checks.
+        """
+        response = self.client.get(reverse("admin:login"))
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+        self.assertIn("csrftoken", response.cookies)
+
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(
+            reverse("admin:login"),
+            {"username": "test@example.com", "password": "testpassword"},
+        )
+        self.assertEqual(response.status_code, 403)
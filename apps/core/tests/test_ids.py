@@ -0,0 +1,63 @@
+"""
+Tests for the identifier helpers.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.utils.ids import uuid7, uuid7_datetime
+from apps.users.models import User
+
+
+class UUID7Tests(SimpleTestCase):
+    """
+    Tests for the UUIDv7 generator.
+    """
+
+    def test_version_and_variant(self):
+        """
+        Test that generated IDs are RFC 9562 version 7 UUIDs.
+        """
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_ids_are_strictly_increasing(self):
+        """
+        Test that IDs generated in a burst still sort in creation order.
+        """
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_embeds_creation_time(self):
+        """
+        Test that the creation time can be read back from the ID.
+        """
+        created = uuid7_datetime(uuid7())
+        self.assertLess(abs(datetime.now(timezone.utc) - created), timedelta(seconds=5))
+
+
+class UUIDModelTests(TestCase):
+    """
+    Tests for UUIDModel primary keys.
+    """
+
+    def test_new_rows_get_time_ordered_ids(self):
+        """
+        Test that model IDs follow insertion order.
+        """
+        first = User.objects.create_user(email="first@example.com", password="pw")
+        second = User.objects.create_user(email="second@example.com", password="pw")
+        self.assertEqual(first.id.version, 7)
+        self.assertEqual(list(User.objects.order_by("id")), [first, second])
+
+    def test_benchmark_requires_postgresql(self):
+        """
+        Test that the key benchmark refuses to run on other databases.
+        """
+        with self.assertRaises(CommandError):
+            call_command("benchmark_uuid_keys", rows=10)
@@ -0,0 +1,34 @@
+"""
+Tests for access to the Prometheus metrics endpoint.
+"""
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.core.views import is_metrics_client, metrics_view
+
+
+@override_settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8", "::1/128"])
+class MetricsViewTests(SimpleTestCase):
+    """
+    Tests for restricting metrics to internal scrapers.
+    """
+
+    def test_allowed_networks(self):
+        """
+        Test that only addresses in the allowed networks may scrape.
+        """
+        self.assertTrue(is_metrics_client("10.1.2.3"))
+        self.assertTrue(is_metrics_client("::1"))
+        self.assertFalse(is_metrics_client("203.0.113.7"))
+        self.assertFalse(is_metrics_client(""))
+
+    def test_other_clients_get_not_found(self):
+        """
+        Test that a forwarded-for header does not grant access.
+        """
+        request = RequestFactory().get(
+            "/metrics", REMOTE_ADDR="203.0.113.7", HTTP_X_FORWARDED_FOR="10.0.0.1"
+        )
+        with self.assertRaises(Http404):
+            metrics_view(request)
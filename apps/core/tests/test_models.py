@@ -0,0 +1,93 @@
+"""
+Tests for the core abstract models.
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.models import User
+
+
+class DirtyFieldTrackingTests(TestCase):
+    """
+    Tests for BaseModel dirty-field tracking.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        User.objects.create_user(
+            email="test@example.com", password="testpassword", bio="A long bio"
+        )
+        self.user = User.objects.get(email="test@example.com")
+
+    def _save(self, instance, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            instance.save(**kwargs)
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_unchanged_save_is_skipped(self):
+        """
+        Test that saving an unchanged instance issues no query.
+        """
+        updated_at = self.user.updated_at
+        self.assertEqual(self._save(self.user), [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.updated_at, updated_at)
+
+    def test_only_changed_fields_are_written(self):
+        """
+        Test that the UPDATE only sets changed fields and updated_at.
+        """
+        self.user.first_name = "Changed"
+        (sql,) = self._save(self.user)
+        self.assertIn('"first_name"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"bio"', sql)
+        self.assertNotIn('"email"', sql)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Changed")
+
+    def test_tracking_resets_after_save(self):
+        """
+        Test that a second save without changes is skipped.
+        """
+        self.user.set_password("newpassword")
+        self.assertEqual(len(self._save(self.user)), 1)
+        self.assertEqual(self._save(self.user), [])
+
+    def test_in_place_json_changes_are_detected(self):
+        """
+        Test that mutating a JSON value marks the field dirty.
+        """
+        self.user.profile_picture_thumbnails["64"] = {"webp": "a.webp"}
+        self.assertEqual(self.user.get_dirty_fields(), ["profile_picture_thumbnails"])
+
+    def test_explicit_update_fields_are_respected(self):
+        """
+        Test that update_fields and force_update always write.
+        """
+        (sql,) = self._save(self.user, update_fields=["bio"])
+        self.assertIn('"bio"', sql)
+        self.assertEqual(len(self._save(self.user, force_update=True)), 1)
+
+    def test_loaded_deferred_fields_are_written(self):
+        """
+        Test that deferred fields assigned later are saved.
+        """
+        user = User.objects.defer("bio").get(pk=self.user.pk)
+        self.assertEqual(self._save(user), [])
+        user.bio = "New bio"
+        self._save(user)
+        user.refresh_from_db()
+        self.assertEqual(user.bio, "New bio")
+
+    def test_new_instances_are_tracked_after_create(self):
+        """
+        Test that instances created in this process are tracked too.
+        """
+        user = User.objects.create_user(email="new@example.com", password="pw")
+        self.assertEqual(self._save(user), [])
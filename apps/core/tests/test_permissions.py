@@ -0,0 +1,139 @@
+"""
+Tests for the row-level permission policies.
+"""
+
+from unittest import mock
+
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.core.permissions import (
+    FieldEquals,
+    Owner,
+    Staff,
+    apply_row_policy,
+)
+from apps.users.views import UserViewSet
+
+User = get_user_model()
+
+
+class RowPolicyTests(TestCase):
+    """
+    Tests for compiling and checking row policies.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.owner = User.objects.create_user(email="owner@example.com", password="pw")
+        self.other = User.objects.create_user(email="other@example.com", password="pw")
+        content_type = ContentType.objects.get_for_model(User)
+        for user in (self.owner, self.other):
+            LogEntry.objects.create(
+                user=user,
+                content_type=content_type,
+                object_repr=str(user),
+                action_flag=ADDITION,
+            )
+        self.request = RequestFactory().get("/")
+        self.request.user = self.owner
+
+    def test_owner_filter_compares_foreign_key_ids(self):
+        """
+        Test that the owner rule filters on the foreign key column.
+        """
+        compiled = Owner("user").compile(self.request, LogEntry)
+        self.assertEqual(compiled.children, [("user_id", self.owner.pk)])
+
+        entries = apply_row_policy(Owner("user"), self.request, LogEntry.objects.all())
+        self.assertEqual([entry.user_id for entry in entries], [self.owner.pk])
+
+    def test_check_does_not_fetch_related_objects(self):
+        """
+        Test that checking a loaded object needs no queries.
+        """
+        entries = list(LogEntry.objects.all())
+        with self.assertNumQueries(0):
+            allowed = [Owner("user").check(self.request, entry) for entry in entries]
+        self.assertEqual(sorted(allowed), [False, True])
+
+    def test_combined_policies(self):
+        """
+        Test that combined policies compile to one filter or short-circuit.
+        """
+        policy = Staff() | Owner("pk")
+        queryset = apply_row_policy(policy, self.request, User.objects.all())
+        self.assertEqual(list(queryset), [self.owner])
+
+        self.request.user = User(is_staff=True)
+        queryset = apply_row_policy(policy, self.request, User.objects.all())
+        self.assertEqual(queryset.count(), 2)
+
+        self.request.user = AnonymousUser()
+        queryset = apply_row_policy(policy, self.request, User.objects.all())
+        self.assertFalse(queryset.exists())
+
+    def test_all_of(self):
+        """
+        Test that every rule must allow a row.
+        """
+        policy = Owner("pk") & FieldEquals(is_active=False)
+        queryset = apply_row_policy(policy, self.request, User.objects.all())
+        self.assertFalse(queryset.exists())
+        self.assertFalse(policy.check(self.request, self.owner))
+
+
+class UserRowPolicyTests(APITestCase):
+    """
+    Tests for the user endpoints' row policy.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(email="test@example.com", password="pw")
+        self.other = User.objects.create_user(email="other@example.com", password="pw")
+
+    def test_users_only_see_themselves(self):
+        """
+        Test that regular users cannot list or open other profiles.
+        """
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("user-list"))
+        results = response.data["data"]["results"]
+        self.assertEqual([user["email"] for user in results], ["test@example.com"])
+
+        response = self.client.get(reverse("user-detail", kwargs={"pk": self.other.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_staff_see_everyone(self):
+        """
+        Test that staff can open any profile.
+        """
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("user-detail", kwargs={"pk": self.other.pk}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_policy_does_not_depend_on_filter_backends(self):
+        """
+        Test that a view without the policy filter backend still hides rows.
+        """
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(UserViewSet, "filter_backends", []):
+            response = self.client.get(reverse("user-list"))
+            detail = self.client.get(
+                reverse("user-detail", kwargs={"pk": self.other.pk})
+            )
+        results = response.data["data"]["results"]
+        self.assertEqual([user["email"] for user in results], ["test@example.com"])
+        self.assertEqual(detail.status_code, 404)
@@ -0,0 +1,63 @@
+"""
+Tests for the startup profiling command.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from apps.core.management.commands.profile_startup import (
+    aggregate_by_package,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils
+import time:       200 |        300 |   django.conf
+import time:        50 |         50 |   apps.core.utils
+import time:       400 |        750 | apps.core
+import time:        30 |         30 | apps.users.models
+"""
+
+
+class ProfileStartupTests(SimpleTestCase):
+    """
+    Tests for parsing, aggregating and reporting import times.
+    """
+
+    def test_parse_importtime_builds_tree(self):
+        """
+        Test that modules are nested under the module that imported them.
+        """
+        roots = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(
+            [root.name for root in roots], ["apps.core", "apps.users.models"]
+        )
+        core = roots[0]
+        self.assertEqual(core.cumulative_us, 750)
+        self.assertEqual(
+            [child.name for child in core.children], ["django.conf", "apps.core.utils"]
+        )
+        self.assertEqual(core.children[0].children[0].name, "django.utils")
+
+    def test_aggregate_by_package(self):
+        """
+        Test that self times are summed per package and per project app.
+        """
+        totals = aggregate_by_package(parse_importtime(IMPORTTIME_OUTPUT))
+        self.assertEqual(totals, {"django": 300, "apps.core": 450, "apps.users": 30})
+
+    def test_command_reports_sections(self):
+        """
+        Test that a real startup is profiled.
+        """
+        out = StringIO()
+        call_command(
+            "profile_startup", settings_module="config.settings.testing", stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn("Import time by package", output)
+        self.assertIn("AppConfig.ready()", output)
+        self.assertIn("apps.authentication", output)
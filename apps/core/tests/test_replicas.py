@@ -0,0 +1,121 @@
+"""
+Tests for read replica routing.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.db import routers
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Tests for the primary/replica router and middleware.
+
+    The "replica" test database never receives the primary's writes, so a
+    read that finds a freshly written row must have gone to the primary.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        routers.lag_cache.clear()
+        self.addCleanup(routers.lag_cache.clear)
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        self.client = APIClient()
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_reads_default_to_primary(self):
+        """
+        Test that reads outside a routed request go to the primary.
+        """
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_reads_go_to_selected_replica(self):
+        """
+        Test that reads inside read_from() go to the replica.
+        """
+        with routers.read_from("replica"):
+            self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_reads_in_transaction_stay_on_primary(self):
+        """
+        Test that reads inside a transaction see its writes.
+        """
+        with routers.read_from("replica"), transaction.atomic():
+            self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_writes_go_to_primary(self):
+        """
+        Test that writes always go to the primary.
+        """
+        with routers.read_from("replica"):
+            User.objects.create_user(email="other@example.com", password="pw")
+        self.assertTrue(
+            User.objects.using("default").filter(email="other@example.com").exists()
+        )
+        self.assertFalse(
+            User.objects.using("replica").filter(email="other@example.com").exists()
+        )
+
+    def test_safe_request_reads_from_replica(self):
+        """
+        Test that a safe request reads from the replica.
+        """
+        response = self.client.get(reverse("user-me"))
+        # The user only exists on the primary, so authentication fails
+        self.assertEqual(response.status_code, 401)
+
+    def test_write_pins_client_to_primary(self):
+        """
+        Test that a client reads its own writes after an unsafe request.
+        """
+        response = self.client.post(reverse("user-change-password"), {})
+        self.assertIn("db_pin", response.cookies)
+
+        response = self.client.get(reverse("user-me"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_expired_pin_is_ignored(self):
+        """
+        Test that the pin only lasts for the configured window.
+        """
+        self.client.post(reverse("user-change-password"), {})
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            with mock.patch("django.core.signing.time.time", return_value=2**40):
+                response = self.client.get(reverse("user-me"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """
+        Test that replicas behind by more than the threshold are skipped.
+        """
+        with mock.patch.object(routers, "get_replica_lag", return_value=60.0):
+            response = self.client.get(reverse("user-me"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_replica_lag_is_cached(self):
+        """
+        Test that replica lag is measured once per check interval.
+        """
+        with mock.patch.object(
+            routers, "get_replica_lag", return_value=0.0
+        ) as get_replica_lag:
+            routers.select_replica()
+            routers.select_replica()
+        get_replica_lag.assert_called_once_with("replica")
@@ -0,0 +1,80 @@
+"""
+Tests for the server runtime helpers.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from apps.core import runtime
+
+
+class RuntimeTests(SimpleTestCase):
+    """
+    Tests for worker sizing and memory reporting.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cgroup = Path(directory.name)
+
+    def test_cpu_limit_from_cgroup_quota(self):
+        """
+        Test that a fractional CPU quota is rounded up.
+        """
+        (self.cgroup / "cpu.max").write_text("150000 100000\n")
+        self.assertEqual(runtime.get_cpu_limit(self.cgroup), 2)
+
+        (self.cgroup / "cpu.max").write_text("max 100000\n")
+        self.assertEqual(
+            runtime.get_cpu_limit(self.cgroup), len(os.sched_getaffinity(0))
+        )
+
+    def test_memory_limit_from_cgroup(self):
+        """
+        Test that cgroup v2 and v1 limits are read, and "no limit" ignored.
+        """
+        (self.cgroup / "memory.max").write_text(f"{2**30}\n")
+        self.assertEqual(runtime.get_memory_limit(self.cgroup), 2**30)
+
+        (self.cgroup / "memory.max").unlink()
+        (self.cgroup / "memory").mkdir()
+        limit_file = self.cgroup / "memory" / "memory.limit_in_bytes"
+        limit_file.write_text("9223372036854771712\n")
+        physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        self.assertEqual(runtime.get_memory_limit(self.cgroup), physical)
+
+    def test_worker_count(self):
+        """
+        Test that workers are bounded by both CPU and memory.
+        """
+        mb = 2**20
+        self.assertEqual(runtime.get_worker_count(2, 4096 * mb, 128 * mb, 256 * mb), 5)
+        self.assertEqual(runtime.get_worker_count(8, 1024 * mb, 128 * mb, 256 * mb), 6)
+        self.assertEqual(runtime.get_worker_count(8, 256 * mb, 128 * mb, 256 * mb), 1)
+
+    def test_process_memory(self):
+        """
+        Test that a process's memory is broken down from /proc.
+        """
+        memory = runtime.get_process_memory(os.getpid())
+        self.assertGreater(memory["uss"], 0)
+        self.assertGreaterEqual(memory["rss"], memory["pss"])
+        self.assertGreaterEqual(memory["pss"], memory["uss"])
+
+    def test_child_pids(self):
+        """
+        Test that direct children are found.
+        """
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+        self.assertIn(child.pid, runtime.get_child_pids(os.getpid()))
@@ -0,0 +1,140 @@
+"""
+Tests for the indexed search backends.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.core.db.operations import AddSearchIndex
+from apps.core.filters import (
+    FTS5SearchBackend,
+    LikeSearchBackend,
+    get_search_backend,
+    search_queryset,
+)
+
+User = get_user_model()
+
+SEARCH_FIELDS = ["email", "first_name", "last_name"]
+
+
+class SearchIndexTests(TransactionTestCase):
+    """
+    Tests for searching through the SQLite FTS5 index.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.operation = AddSearchIndex(model_name="user", fields=SEARCH_FIELDS)
+        self.state = ProjectState.from_apps(User._meta.apps)
+        with connection.schema_editor(atomic=False) as editor:
+            self.operation.database_forwards("users", editor, self.state, self.state)
+        self.alice = User.objects.create_user(
+            email="alice@example.com",
+            password="pw",
+            first_name="Alice",
+            last_name="Smith",
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", password="pw", first_name="Bob", last_name="Jones"
+        )
+
+    def tearDown(self):
+        with connection.schema_editor(atomic=False) as editor:
+            self.operation.database_backwards("users", editor, self.state, self.state)
+
+    def test_uses_fts5_backend(self):
+        """
+        Test that the FTS5 backend is picked once the index exists.
+        """
+        backend = get_search_backend(User.objects.all(), SEARCH_FIELDS)
+        self.assertIsInstance(backend, FTS5SearchBackend)
+
+    def test_search_matches_substrings(self):
+        """
+        Test that every term must occur somewhere, case-insensitively.
+        """
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["SMI"])
+        self.assertEqual(list(results), [self.alice])
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["example", "jon"])
+        self.assertEqual(list(results), [self.bob])
+
+    def test_short_terms_are_matched(self):
+        """
+        Test that terms shorter than a trigram still filter results.
+        """
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["example", "bo"])
+        self.assertEqual(list(results), [self.bob])
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that the triggers keep the index in sync.
+        """
+        self.bob.last_name = "Smithers"
+        self.bob.save()
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["smith"])
+        self.assertEqual(set(results), {self.alice, self.bob})
+
+        self.alice.delete()
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["smith"])
+        self.assertEqual(list(results), [self.bob])
+
+
+class SearchFallbackTests(TestCase):
+    """
+    Tests for searching without an index.
+    """
+
+    def test_uses_like_backend_without_index(self):
+        """
+        Test that an unindexed table falls back to icontains.
+        """
+        User.objects.create_user(email="alice@example.com", password="pw")
+        backend = get_search_backend(User.objects.all(), SEARCH_FIELDS)
+        self.assertIsInstance(backend, LikeSearchBackend)
+        results = search_queryset(User.objects.all(), SEARCH_FIELDS, ["ALI"])
+        self.assertEqual(results.get().email, "alice@example.com")
+
+
+class SearchIntegrationTests(APITestCase):
+    """
+    Tests for search in the API and the admin.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="pw"
+        )
+        User.objects.create_user(email="alice@example.com", password="pw")
+        User.objects.create_user(email="bob@example.com", password="pw")
+
+    def test_api_search(self):
+        """
+        Test searching users through the API.
+        """
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("user-list"), {"search": "alice"})
+        self.assertEqual(response.status_code, 200)
+        results = response.data["data"]["results"]
+        self.assertEqual([user["email"] for user in results], ["alice@example.com"])
+
+    def test_admin_search(self):
+        """
+        Test searching users in the admin changelist.
+        """
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin:users_user_changelist"), {"q": "bob"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user.email for user in response.context["cl"].result_list],
+            ["bob@example.com"],
+        )
@@ -0,0 +1,155 @@
+"""
+Tests for the slow query recorder.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.core.db import slow_queries
+from apps.core.db.slow_queries import SlowQueryBuffer, SlowQueryRecorder
+from apps.core.tracing import TraceContext, use_trace
+
+User = get_user_model()
+
+
+def lookup_user(email):
+    # Stands in for project code issuing a query
+    return User.objects.filter(email=email).first()
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0.001)
+class SlowQueryRecorderTests(TestCase):
+    """
+    Tests for sampling queries over the threshold.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        slow_queries.buffer.clear()
+        self.addCleanup(slow_queries.buffer.clear)
+        self.recorder = SlowQueryRecorder(connection)
+
+    def test_records_redacted_query_with_plan(self):
+        """
+        Test that a slow select is sampled with its location and plan.
+        """
+        trace = TraceContext(request_id="req-1", trace_id="a" * 32)
+        with connection.execute_wrapper(self.recorder), use_trace(trace):
+            lookup_user("secret@example.com")
+
+        [sample] = slow_queries.buffer.samples()
+        self.assertIn('FROM "users_user"', sample.sql)
+        self.assertEqual(sample.params, ["<str>"])
+        self.assertNotIn("secret", str(sample.to_dict()))
+        self.assertRegex(
+            sample.location,
+            r"^apps/core/tests/test_slow_queries\.py:\d+ in lookup_user$",
+        )
+        self.assertEqual((sample.request_id, sample.trace_id), ("req-1", "a" * 32))
+        self.assertEqual(sample.vendor, "sqlite")
+        self.assertTrue(sample.plan)
+        self.assertIn("users_user", sample.plan[0]["detail"])
+
+    def test_explain_queries_are_not_recorded(self):
+        """
+        Test that only the caller's query is sampled, not the EXPLAIN.
+        """
+        with connection.execute_wrapper(self.recorder):
+            User.objects.exists()
+        [sample] = slow_queries.buffer.samples()
+        self.assertTrue(sample.sql.startswith("SELECT"))
+
+    def test_writes_are_not_explained(self):
+        """
+        Test that statements other than selects are sampled without a plan.
+        """
+        with connection.execute_wrapper(self.recorder):
+            User.objects.create_user(email="test@example.com", password="pw")
+
+        [sample] = slow_queries.buffer.samples()
+        self.assertTrue(sample.sql.startswith("INSERT"))
+        self.assertIsNone(sample.plan)
+        self.assertIsNone(sample.plan_error)
+
+    def test_fast_queries_are_ignored(self):
+        """
+        Test that queries under the threshold are not sampled.
+        """
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=60_000):
+            with connection.execute_wrapper(self.recorder):
+                User.objects.exists()
+        self.assertEqual(slow_queries.buffer.samples(), [])
+
+    def test_samples_are_logged(self):
+        """
+        Test that each sample is logged in structured form.
+        """
+        with self.assertLogs("apps.core.db.slow_queries", "WARNING") as logs:
+            with connection.execute_wrapper(self.recorder):
+                User.objects.exists()
+        self.assertEqual(
+            logs.records[0].slow_query["sql"], slow_queries.buffer.samples()[0].sql
+        )
+        self.assertIn('"duration_ms"', logs.output[0])
+
+    def test_buffer_keeps_newest_samples(self):
+        """
+        Test that the ring buffer drops the oldest samples.
+        """
+        buffer = SlowQueryBuffer(maxsize=2)
+        for number in range(3):
+            buffer.add(number)
+        self.assertEqual(buffer.samples(), [2, 1])
+
+    def test_redact_params(self):
+        """
+        Test that parameter values are replaced by their types.
+        """
+        self.assertEqual(
+            slow_queries.redact_params({"email": "a@b.c", "ids": (1, None)}),
+            {"email": "<str>", "ids": ["<int>", None]},
+        )
+
+
+class SlowQueryListViewTests(APITestCase):
+    """
+    Tests for the slow query endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        slow_queries.buffer.clear()
+        self.addCleanup(slow_queries.buffer.clear)
+        self.user = User.objects.create_user(email="test@example.com", password="pw")
+
+    def test_staff_only(self):
+        """
+        Test that only staff can list slow queries.
+        """
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("slow-queries"))
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.001)
+    def test_lists_samples(self):
+        """
+        Test that staff see the sampled queries, newest first.
+        """
+        with connection.execute_wrapper(SlowQueryRecorder(connection)):
+            User.objects.filter(pk=1).exists()
+            User.objects.count()
+
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("slow-queries"))
+        self.assertEqual(response.status_code, 200)
+        results = response.data["data"]["results"]
+        self.assertEqual(len(results), 2)
+        self.assertIn("COUNT", results[0]["sql"])
@@ -0,0 +1,139 @@
+"""
+Tests for sqlcommenter query tagging.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.db.comments import QueryCommenter, format_sql_comment
+
+User = get_user_model()
+
+
+class SQLCommentFormatTests(SimpleTestCase):
+    """
+    Tests for formatting sqlcommenter comments.
+    """
+
+    def test_keys_are_sorted_and_values_encoded(self):
+        """
+        Test that tags follow the sqlcommenter format.
+        """
+        comment = format_sql_comment(
+            {"view": "UserViewSet.list", "route": "api/v1/users/", "empty": None}
+        )
+        self.assertEqual(
+            comment, "/*route='api%2Fv1%2Fusers%2F',view='UserViewSet.list'*/"
+        )
+
+    def test_values_cannot_close_the_comment(self):
+        """
+        Test that hostile values cannot end the comment early.
+        """
+        comment = format_sql_comment({"route": "x*/ DROP TABLE users; /*'"})
+        self.assertEqual(comment.count("*/"), 1)
+        self.assertNotIn("'x", comment.replace("route='", ""))
+
+    def test_commenter_appends_comment(self):
+        """
+        Test that the execute wrapper appends the comment to queries.
+        """
+        commenter = QueryCommenter({"route": "users"})
+        executed = []
+        commenter(lambda *args: executed.append(args), "SELECT 1", None, False, {})
+        self.assertEqual(executed[0][0], "SELECT 1 /*route='users'*/")
+
+    def test_percent_signs_are_escaped_for_parameterized_queries(self):
+        """
+        Test that encoded values survive the driver's parameter formatting.
+        """
+        commenter = QueryCommenter({"route": "admin/(?P<url>.*)$"})
+        executed = []
+        execute = lambda *args: executed.append(args)  # noqa: E731
+        commenter(execute, "SELECT %s", (1,), False, {})
+        commenter(execute, "SELECT 1", None, False, {})
+
+        self.assertEqual(
+            executed[0][0] % executed[0][1],
+            "SELECT 1 /*route='admin%2F%28%3FP%3Curl%3E.%2A%29%24'*/",
+        )
+        self.assertEqual(
+            executed[1][0], "SELECT 1 /*route='admin%2F%28%3FP%3Curl%3E.%2A%29%24'*/"
+        )
+
+
+class SQLCommentMiddlewareTests(TestCase):
+    """
+    Tests for tagging a request's queries.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def executed_queries(self, *args, **kwargs):
+        # Captured queries predate execute wrappers; SQLite reports what ran
+        statements = []
+        connection.ensure_connection()
+        connection.connection.set_trace_callback(statements.append)
+        try:
+            response = self.client.get(*args, **kwargs)
+        finally:
+            connection.connection.set_trace_callback(None)
+        return response, [sql for sql in statements if sql.startswith("SELECT")]
+
+    def test_queries_are_tagged_with_the_endpoint(self):
+        """
+        Test that queries carry the route and view action.
+        """
+        _, queries = self.executed_queries(reverse("user-me"))
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertTrue(
+                sql.endswith("/*route='user-me',view='UserViewSet.me'*/"), sql
+            )
+
+    def test_unnamed_regex_routes(self):
+        """
+        Test that parameterized queries run under a route with no name.
+        """
+        staff = User.objects.create_user(
+            email="staff@example.com", password="pw", is_staff=True
+        )
+        self.client.force_login(staff)
+        response, queries = self.executed_queries("/admin/no-such-page/")
+        self.assertEqual(response.status_code, 404)
+        tagged = [sql for sql in queries if "route='admin%2F" in sql]
+        self.assertTrue(tagged)
+        self.assertFalse([sql for sql in tagged if "%%" in sql])
+
+    @override_settings(SQL_COMMENT_TAGS=["view", "request_id"])
+    def test_trace_tags_are_opt_in(self):
+        """
+        Test that the request ID is added when configured.
+        """
+        response, queries = self.executed_queries(
+            reverse("user-me"), HTTP_X_REQUEST_ID="req-7"
+        )
+        self.assertEqual(response["X-Request-ID"], "req-7")
+        self.assertIn("request_id='req-7'", queries[0])
+        self.assertNotIn("route=", queries[0])
+
+    @override_settings(SQL_COMMENT_TAGS=[])
+    def test_disabled(self):
+        """
+        Test that queries are left alone without tags.
+        """
+        _, queries = self.executed_queries(reverse("user-me"))
+        self.assertNotIn("/*", queries[0])
@@ -0,0 +1,121 @@
+"""
+Tests for the container startup commands.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.core.management.commands import migrate
+from django.test import TransactionTestCase
+
+from apps.core.management.commands import migrate_locked, wait_for_services
+
+
+class WaitForServicesTests(TransactionTestCase):
+    """
+    Tests for waiting on databases and caches.
+    """
+
+    databases = {"default", "replica"}
+
+    def test_available_services(self):
+        """
+        Test that the command returns once every service answers.
+        """
+        out = StringIO()
+        call_command("wait_for_services", stdout=out)
+        self.assertIn("Database 'default' is available", out.getvalue())
+        self.assertIn("Cache 'default' is available", out.getvalue())
+
+    def test_retries_with_backoff(self):
+        """
+        Test that failing services are retried with doubling delays.
+        """
+        check_cache = mock.Mock(side_effect=[ConnectionError, ConnectionError, None])
+        with (
+            mock.patch.object(wait_for_services.Command, "check_cache", check_cache),
+            mock.patch.object(wait_for_services.time, "sleep") as sleep,
+        ):
+            call_command("wait_for_services", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.1, 0.2])
+        self.assertEqual(check_cache.call_count, 3)
+
+    def test_gives_up_after_timeout(self):
+        """
+        Test that the command fails once the timeout is reached.
+        """
+        check_cache = mock.Mock(side_effect=ConnectionError("refused"))
+        with mock.patch.object(wait_for_services.Command, "check_cache", check_cache):
+            with self.assertRaisesMessage(CommandError, "cache 'default'"):
+                call_command(
+                    "wait_for_services",
+                    timeout=0.05,
+                    initial_delay=0.01,
+                    stdout=StringIO(),
+                    stderr=StringIO(),
+                )
+
+
+class MigrateLockedTests(TransactionTestCase):
+    """
+    Tests for migrating under an advisory lock.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.connection = mock.MagicMock(vendor="postgresql")
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        patcher = mock.patch.object(
+            migrate_locked, "connections", {"default": self.connection}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def executed(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+
+    def test_migrates_holding_the_lock(self):
+        """
+        Test that migrations run between taking and releasing the lock.
+        """
+        self.cursor.fetchone.return_value = (True,)
+        with mock.patch.object(migrate.Command, "handle", return_value=None) as handle:
+            call_command("migrate_locked", verbosity=0)
+        handle.assert_called_once()
+        self.assertEqual(
+            self.executed(),
+            ["SELECT pg_try_advisory_lock(%s)", "SELECT pg_advisory_unlock(%s)"],
+        )
+
+    def test_waiters_poll_without_blocking(self):
+        """
+        Test that waiting replicas retry the try-lock instead of blocking.
+        """
+        self.cursor.fetchone.side_effect = [(False,), (False,), (True,)]
+        with (
+            mock.patch.object(migrate.Command, "handle", return_value=None) as handle,
+            mock.patch.object(migrate_locked.time, "sleep") as sleep,
+        ):
+            call_command("migrate_locked", verbosity=0)
+        handle.assert_called_once()
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.1, 0.2])
+        self.assertNotIn("SELECT pg_advisory_lock(%s)", self.executed())
+        self.assertEqual(
+            self.executed(),
+            ["SELECT pg_try_advisory_lock(%s)"] * 3 + ["SELECT pg_advisory_unlock(%s)"],
+        )
+
+    def test_no_wait_skips_when_locked(self):
+        """
+        Test that --no-wait skips migrating while another process holds the lock.
+        """
+        self.cursor.fetchone.return_value = (False,)
+        out = StringIO()
+        with mock.patch.object(migrate.Command, "handle", return_value=None) as handle:
+            call_command("migrate_locked", no_wait=True, stdout=out)
+        handle.assert_not_called()
+        self.assertIn("skipping", out.getvalue())
+        self.assertEqual(self.executed(), ["SELECT pg_try_advisory_lock(%s)"])
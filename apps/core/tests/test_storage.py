@@ -0,0 +1,151 @@
+"""
+Tests for the custom storage backends.
+"""
+
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage
+from django.test import SimpleTestCase
+
+from apps.core.storage import CachedURLMixin, CollisionFreeNameMixin
+from apps.core.utils.cache import LRUCache
+
+
+class CollisionFreeInMemoryStorage(CollisionFreeNameMixin, InMemoryStorage):
+    """
+    In-memory storage with collision-free names, standing in for S3.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+
+class CollisionFreeNameMixinTests(SimpleTestCase):
+    """
+    Tests for the CollisionFreeNameMixin.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.storage = CollisionFreeInMemoryStorage()
+
+    def test_identical_content_is_deduplicated(self):
+        """
+        Test that identical uploads are stored under one content hash name.
+        """
+        first = self.storage.save("profile_pictures/a.PNG", ContentFile(b"same"))
+        second = self.storage.save("profile_pictures/b.png", ContentFile(b"same"))
+        self.assertEqual(first, second)
+        self.assertRegex(first, r"^profile_pictures/[0-9a-f]{64}\.png$")
+        self.assertTrue(self.storage.deduplicates)
+
+    def test_different_content_gets_different_names(self):
+        """
+        Test that different uploads never share a name.
+        """
+        first = self.storage.save("profile_pictures/a.png", ContentFile(b"one"))
+        second = self.storage.save("profile_pictures/a.png", ContentFile(b"two"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.storage.open(second).read(), b"two")
+
+    def test_no_existence_checks(self):
+        """
+        Test that saving never asks the backend whether a name is taken.
+        """
+        with mock.patch.object(self.storage, "exists") as exists:
+            self.storage.save("profile_pictures/a.png", ContentFile(b"data"))
+        exists.assert_not_called()
+
+    def test_uuid_naming(self):
+        """
+        Test that UUID naming gives identical uploads separate names.
+        """
+        self.storage.naming = "uuid"
+        first = self.storage.save("profile_pictures/a.png", ContentFile(b"same"))
+        second = self.storage.save("profile_pictures/a.png", ContentFile(b"same"))
+        self.assertNotEqual(first, second)
+        self.assertFalse(self.storage.deduplicates)
+
+
+class SigningStorage(InMemoryStorage):
+    """
+    Storage that mimics S3 URL signing and counts signing operations.
+    """
+
+    location = "media"
+    custom_domain = None
+    cloudfront_signer = None
+    querystring_auth = True
+    querystring_expire = 3600
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.signed = 0
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        self.signed += 1
+        return f"https://bucket/{name}?signature={self.signed}"
+
+
+class CachedSigningStorage(CachedURLMixin, SigningStorage):
+    """
+    Signing storage with URL caching.
+    """
+
+
+class CachedURLMixinTests(SimpleTestCase):
+    """
+    Tests for the CachedURLMixin.
+    """
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.clock = mock.Mock(return_value=1000.0)
+        self.storage = CachedSigningStorage()
+        self.storage.url_cache = LRUCache(maxsize=2, clock=self.clock)
+
+    def test_signed_urls_are_reused_until_near_expiry(self):
+        """
+        Test that a signed URL is only regenerated shortly before it expires.
+        """
+        for _ in range(100):
+            url = self.storage.url("profile_pictures/a.png")
+        self.assertEqual(self.storage.signed, 1)
+
+        self.clock.return_value = 1000.0 + 3600 - 30
+        self.assertNotEqual(self.storage.url("profile_pictures/a.png"), url)
+        self.assertEqual(self.storage.signed, 2)
+
+    def test_unsigned_urls_are_memoized(self):
+        """
+        Test that unsigned URLs never expire from the cache.
+        """
+        self.storage.querystring_auth = False
+        self.storage.url("profile_pictures/a.png")
+        self.clock.return_value = 10**9
+        self.storage.url("profile_pictures/a.png")
+        self.assertEqual(self.storage.signed, 1)
+
+    def test_cache_is_bounded(self):
+        """
+        Test that the least recently used URL is evicted at capacity.
+        """
+        for name in ("a.png", "b.png", "c.png"):
+            self.storage.url(name)
+        self.assertEqual(len(self.storage.url_cache), 2)
+        self.storage.url("a.png")
+        self.assertEqual(self.storage.signed, 4)
+
+    def test_custom_parameters_bypass_cache(self):
+        """
+        Test that URLs with response parameters are always signed afresh.
+        """
+        params = {"ResponseContentDisposition": "attachment"}
+        self.storage.url("a.png", parameters=params)
+        self.storage.url("a.png", parameters=params)
+        self.assertEqual(self.storage.signed, 2)
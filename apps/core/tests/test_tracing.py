@@ -0,0 +1,210 @@
+"""
+Tests for trace context propagation.
+"""
+
+import logging
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.core import tracing
+from apps.core.middleware.tracing import TraceContextMiddleware
+
+try:
+    import opentelemetry.sdk.trace as otel_sdk
+except ImportError:  # pragma: no cover
+    otel_sdk = None
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+class TraceContextTests(SimpleTestCase):
+    """
+    Tests for parsing, propagating and logging trace context.
+    """
+
+    def test_parse_traceparent(self):
+        """
+        Test that valid headers are parsed and invalid ones ignored.
+        """
+        self.assertEqual(
+            tracing.parse_traceparent(TRACEPARENT),
+            {"trace_id": TRACE_ID, "span_id": PARENT_ID, "sampled": True},
+        )
+        for value in (
+            None,
+            "garbage",
+            f"ff-{TRACE_ID}-{PARENT_ID}-01",
+            f"00-{'0' * 32}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+        ):
+            self.assertIsNone(tracing.parse_traceparent(value))
+
+    def test_upstream_request_ids_are_validated(self):
+        """
+        Test that only plain upstream request IDs are kept.
+        """
+        self.assertEqual(
+            tracing.trace_from_headers("abc-123", None).request_id, "abc-123"
+        )
+        self.assertNotEqual(
+            tracing.trace_from_headers("bad\nvalue", None).request_id, "bad\nvalue"
+        )
+
+    def test_spans_continue_the_parent_trace(self):
+        """
+        Test that spans nest under the current trace and restore it after.
+        """
+        parent = tracing.trace_from_headers("req-1", TRACEPARENT)
+        with tracing.start_span("outer", parent=parent) as outer:
+            with tracing.start_span("inner") as inner:
+                self.assertEqual(tracing.get_current_trace(), inner)
+            self.assertEqual(tracing.get_current_trace(), outer)
+        self.assertIsNone(tracing.get_current_trace())
+
+        self.assertEqual(outer.trace_id, TRACE_ID)
+        self.assertEqual(outer.parent_id, PARENT_ID)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.request_id, "req-1")
+
+    def test_log_records_carry_the_trace(self):
+        """
+        Test that the logging filter stamps records with the current trace.
+        """
+        record = logging.LogRecord("apps", logging.INFO, "", 0, "message", (), None)
+        log_filter = tracing.TraceContextFilter()
+        log_filter.filter(record)
+        self.assertEqual((record.request_id, record.trace_id), ("-", "-"))
+
+        with tracing.start_span("span") as trace:
+            log_filter.filter(record)
+        self.assertEqual(record.request_id, trace.request_id)
+        self.assertEqual(record.span_id, trace.span_id)
+
+    def test_tasks_continue_the_publishing_trace(self):
+        """
+        Test that task messages carry the trace into the worker's span.
+        """
+        headers = {}
+        with tracing.start_span("request") as publisher:
+            tracing.inject_task_headers(headers=headers)
+
+        task = SimpleNamespace(
+            name="emails.drain_outbox", request=SimpleNamespace(**headers)
+        )
+        tracing.start_task_span(task_id="task-1", task=task)
+        worker = tracing.get_current_trace()
+        tracing.end_task_span(task_id="task-1")
+
+        self.assertEqual(worker.request_id, publisher.request_id)
+        self.assertEqual(worker.trace_id, publisher.trace_id)
+        self.assertEqual(worker.parent_id, publisher.span_id)
+        self.assertIsNone(tracing.get_current_trace())
+
+    @skipUnless(otel_sdk, "opentelemetry-sdk is not installed")
+    @override_settings(TRACING_EXPORTER="memory")
+    def test_spans_are_exported(self):
+        """
+        Test that spans are recorded with OpenTelemetry when enabled.
+        """
+        tracing.configure_tracing()
+        self.addCleanup(tracing.configure_tracing)
+        parent = tracing.trace_from_headers(None, TRACEPARENT)
+        with tracing.start_span("outer", parent=parent) as trace:
+            tracing.set_span_attributes({"answer": 42})
+
+        (span,) = tracing.memory_exporter.get_finished_spans()
+        self.assertEqual(format(span.context.trace_id, "032x"), TRACE_ID)
+        self.assertEqual(format(span.context.span_id, "016x"), trace.span_id)
+        self.assertEqual(span.attributes["answer"], 42)
+
+
+class TraceContextMiddlewareTests(TestCase):
+    """
+    Tests for tracing requests.
+    """
+
+    def test_upstream_request_id_is_returned(self):
+        """
+        Test that the upstream request ID is used and echoed back.
+        """
+        response = self.client.get(
+            reverse("schema"),
+            HTTP_X_REQUEST_ID="nginx-42",
+            HTTP_TRACEPARENT=TRACEPARENT,
+        )
+        self.assertEqual(response["X-Request-ID"], "nginx-42")
+        self.assertEqual(response.wsgi_request.request_id, "nginx-42")
+
+    def test_logs_during_a_request_carry_its_trace(self):
+        """
+        Test that records logged while handling a request carry its trace.
+        """
+        records = []
+        handler = logging.Handler()
+        handler.addFilter(tracing.TraceContextFilter())
+        handler.emit = records.append
+        logger = logging.getLogger("apps.core.middleware.request_response")
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        logger.setLevel(logging.INFO)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+
+        response = self.client.get(reverse("schema"), HTTP_TRACEPARENT=TRACEPARENT)
+
+        self.assertTrue(records)
+        for record in records:
+            self.assertEqual(record.request_id, response["X-Request-ID"])
+            self.assertEqual(record.trace_id, TRACE_ID)
+
+    @skipUnless(otel_sdk, "opentelemetry-sdk is not installed")
+    @override_settings(TRACING_EXPORTER="memory")
+    def test_streaming_spans_end_after_the_body(self):
+        """
+        Test that a streaming response's span covers sending its body.
+        """
+        tracing.configure_tracing()
+        self.addCleanup(tracing.configure_tracing)
+
+        def body():
+            yield b"first"
+            raise ConnectionError("upstream went away")
+
+        middleware = TraceContextMiddleware(
+            lambda request: StreamingHttpResponse(body())
+        )
+        response = middleware(RequestFactory().get("/stream"))
+        self.assertEqual(tracing.memory_exporter.get_finished_spans(), ())
+
+        chunks = iter(response)
+        self.assertEqual(next(chunks), b"first")
+        with self.assertRaises(ConnectionError):
+            next(chunks)
+
+        (span,) = tracing.memory_exporter.get_finished_spans()
+        self.assertFalse(span.status.is_ok)
+        self.assertEqual(span.events[0].name, "exception")
+
+    @skipUnless(otel_sdk, "opentelemetry-sdk is not installed")
+    @override_settings(TRACING_EXPORTER="memory")
+    def test_closing_a_stream_ends_its_span(self):
+        """
+        Test that a stream closed before it is consumed still ends its span.
+        """
+        tracing.configure_tracing()
+        self.addCleanup(tracing.configure_tracing)
+
+        middleware = TraceContextMiddleware(
+            lambda request: StreamingHttpResponse(iter([b"a", b"b"]))
+        )
+        response = middleware(RequestFactory().get("/stream"))
+        self.assertEqual(next(iter(response)), b"a")
+        response.close()
+
+        (span,) = tracing.memory_exporter.get_finished_spans()
+        self.assertTrue(span.status.is_ok)
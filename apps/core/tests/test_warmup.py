@@ -0,0 +1,76 @@
+"""
+Tests for worker warm-up.
+"""
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.core import warmup
+from apps.users.serializers import UserSerializer
+
+
+class WarmUpTests(SimpleTestCase):
+    """
+    Tests for running and timing warm-up phases.
+    """
+
+    def test_phases_are_timed(self):
+        """
+        Test that every phase runs and reports its duration.
+        """
+        calls = []
+        phases = [("one", lambda: calls.append(1)), ("two", lambda: calls.append(2))]
+        with self.assertLogs("apps.core.warmup", "INFO"):
+            timings = warmup.warm_up(phases)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(list(timings), ["one", "two"])
+        self.assertTrue(all(timing >= 0 for timing in timings.values()))
+
+    def test_failing_phase_does_not_stop_warm_up(self):
+        """
+        Test that a failing phase is logged and the next one still runs.
+        """
+        calls = []
+
+        def fail():
+            raise ConnectionError("unavailable")
+
+        with self.assertLogs("apps.core.warmup", "WARNING") as logs:
+            timings = warmup.warm_up([("fail", fail), ("ok", lambda: calls.append(1))])
+        self.assertEqual(list(timings), ["fail", "ok"])
+        self.assertEqual(calls, [1])
+        self.assertIn("fail", logs.output[0])
+
+    @override_settings(WARMUP_ENABLED=False)
+    def test_disabled(self):
+        """
+        Test that nothing runs when warm-up is disabled.
+        """
+        self.assertEqual(warmup.warm_up([("fail", lambda: 1 / 0)]), {})
+
+    @override_settings(WARMUP_DEFER_CONNECTIONS=True)
+    def test_connections_can_be_deferred(self):
+        """
+        Test that connection phases can be left to run after fork.
+        """
+        with self.assertLogs("apps.core.warmup", "INFO"):
+            timings = warmup.warm_up()
+        self.assertEqual(list(timings), [name for name, _ in warmup.PRELOAD_PHASES])
+
+    def test_asgi_skips_database_connections(self):
+        """
+        Test that ASGI processes do not open database connections.
+        """
+        with self.assertLogs("apps.core.warmup", "INFO"):
+            timings = warmup.warm_up(asgi=True)
+        self.assertNotIn("databases", timings)
+        self.assertIn("caches", timings)
+
+    def test_view_classes_are_found(self):
+        """
+        Test that view classes are collected from the URLconf.
+        """
+        serializer_classes = {
+            getattr(view_class, "serializer_class", None)
+            for view_class in warmup.iter_view_classes()
+        }
+        self.assertIn(UserSerializer, serializer_classes)
@@ -0,0 +1,388 @@
+"""
+Trace context for the project.
+
+The trace of the current request or task lives in a context variable, so
+it follows the work through threads and coroutines without being passed
+around. It carries:
+
+- ``request_id``: taken from an upstream ``X-Request-ID`` (nginx's
+  ``$request_id``) when present, and returned to the client.
+- ``trace_id``/``span_id``: W3C Trace Context identifiers, continued from
+  an upstream ``traceparent`` header when present.
+
+Log records are stamped with both by ``TraceContextFilter``, Celery tasks
+carry them to the worker in their message headers, and, when
+``TRACING_EXPORTER`` is set, every span is also recorded with OpenTelemetry.
+"""
+
+import json
+import logging
+import re
+import secrets
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Upstream request IDs are echoed back, so only accept plain tokens
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+TRACEPARENT_PATTERN = re.compile(
+    r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$"
+)
+# Celery message headers carrying the trace to the worker
+TASK_TRACEPARENT_HEADER = "traceparent"
+TASK_REQUEST_ID_HEADER = "x_request_id"
+
+_current_trace: ContextVar[Optional["TraceContext"]] = ContextVar(
+    "current_trace", default=None
+)
+_current_span: ContextVar[Any] = ContextVar("current_otel_span", default=None)
+
+# Set by configure_tracing(), which imports OpenTelemetry only when enabled
+otel_trace = None
+tracer = None
+memory_exporter = None
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """
+    The identifiers of the current unit of work.
+
+    ``trace_id`` and ``span_id`` are None until a span is started, unless
+    they were received from upstream.
+    """
+
+    request_id: str
+    trace_id: Optional[str] = None
+    span_id: Optional[str] = None
+    parent_id: Optional[str] = None
+    sampled: bool = True
+
+    def child(self) -> "TraceContext":
+        """
+        Return the context of a new span under this one.
+        """
+        return replace(
+            self,
+            trace_id=self.trace_id or secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=self.span_id,
+        )
+
+    def to_traceparent(self) -> Optional[str]:
+        """
+        Return the W3C ``traceparent`` header value, if in a span.
+        """
+        if self.trace_id is None or self.span_id is None:
+            return None
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def new_request_id() -> str:
+    """
+    Return a new request ID.
+    """
+    return uuid.uuid4().hex
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a W3C ``traceparent`` header.
+
+    Returns:
+        ``trace_id``, ``span_id`` and ``sampled`` of the upstream span, or
+        None if the header is missing or invalid.
+    """
+    match = TRACEPARENT_PATTERN.match((value or "").strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags, rest = match.groups()
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return {
+        "trace_id": trace_id,
+        "span_id": span_id,
+        "sampled": bool(int(flags, 16) & 1),
+    }
+
+
+def trace_from_headers(
+    request_id: Optional[str], traceparent: Optional[str]
+) -> TraceContext:
+    """
+    Return the context received from upstream, with a new request ID if needed.
+    """
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = new_request_id()
+    return TraceContext(request_id=request_id, **(parse_traceparent(traceparent) or {}))
+
+
+def trace_from_request(request) -> TraceContext:
+    """
+    Return the context received with an HTTP request.
+    """
+    return trace_from_headers(
+        request.META.get("HTTP_X_REQUEST_ID"), request.META.get("HTTP_TRACEPARENT")
+    )
+
+
+def get_current_trace() -> Optional[TraceContext]:
+    """
+    Return the trace context of the current request or task, if any.
+    """
+    return _current_trace.get()
+
+
+@contextmanager
+def use_trace(trace: Optional[TraceContext]) -> Iterator[Optional[TraceContext]]:
+    """
+    Make ``trace`` the current trace context within the block.
+    """
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def start_span(
+    name: str,
+    parent: Optional[TraceContext] = None,
+    kind: str = "internal",
+    attributes: Optional[Mapping[str, Any]] = None,
+    end_on_exit: bool = True,
+) -> Iterator[TraceContext]:
+    """
+    Run the block in a new span, current for its duration.
+
+    Args:
+        name: The span name.
+        parent: The parent context; defaults to the current one, and a
+            new trace is started without either.
+        kind: ``"server"``, ``"consumer"``, ``"producer"`` or ``"internal"``.
+        attributes: Span attributes recorded with OpenTelemetry.
+        end_on_exit: False to leave the OpenTelemetry span open after the
+            block, to be finished later with ``end_span``.
+
+    Yields:
+        The span's trace context.
+    """
+    if parent is None:
+        parent = get_current_trace() or TraceContext(request_id=new_request_id())
+
+    if tracer is None:
+        with use_trace(parent.child()) as trace:
+            yield trace
+        return
+
+    otel_context = None
+    if parent.trace_id and parent.span_id:
+        otel_context = otel_trace.set_span_in_context(
+            otel_trace.NonRecordingSpan(
+                otel_trace.SpanContext(
+                    trace_id=int(parent.trace_id, 16),
+                    span_id=int(parent.span_id, 16),
+                    is_remote=True,
+                    trace_flags=otel_trace.TraceFlags(int(parent.sampled)),
+                )
+            )
+        )
+    with tracer.start_as_current_span(
+        name,
+        context=otel_context,
+        kind=getattr(otel_trace.SpanKind, kind.upper()),
+        attributes={"request.id": parent.request_id, **(attributes or {})},
+        end_on_exit=end_on_exit,
+    ) as span:
+        span_context = span.get_span_context()
+        trace = replace(
+            parent,
+            trace_id=format(span_context.trace_id, "032x"),
+            span_id=format(span_context.span_id, "016x"),
+            parent_id=parent.span_id,
+            sampled=span_context.trace_flags.sampled,
+        )
+        token = _current_span.set(span)
+        try:
+            with use_trace(trace):
+                yield trace
+        finally:
+            _current_span.reset(token)
+
+
+def get_current_span() -> Any:
+    """
+    Return the current OpenTelemetry span, or None if spans are not recorded.
+    """
+    return _current_span.get()
+
+
+def end_span(span: Any, error: Optional[BaseException] = None) -> None:
+    """
+    Finish a span left open with ``end_on_exit=False``.
+
+    Args:
+        span: The span, as returned by ``get_current_span``; None is ignored.
+        error: An exception raised after the block, recorded on the span.
+    """
+    if span is None:
+        return
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(
+            otel_trace.Status(
+                otel_trace.StatusCode.ERROR, f"{type(error).__name__}: {error}"
+            )
+        )
+    span.end()
+
+
+def set_span_attributes(attributes: Mapping[str, Any]) -> None:
+    """
+    Record attributes on the current span, if spans are being recorded.
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(dict(attributes))
+
+
+def configure_tracing() -> None:
+    """
+    Set up OpenTelemetry span export as configured by ``TRACING_EXPORTER``.
+
+    ``"memory"`` keeps finished spans in ``memory_exporter``, ``"file"``
+    appends them as JSON lines to ``TRACING_FILE`` and ``"otlp"`` sends
+    them to the collector named by the standard ``OTEL_EXPORTER_OTLP_*``
+    variables. Empty disables span export; trace IDs are still propagated.
+    """
+    global otel_trace, tracer, memory_exporter
+
+    exporter_name = settings.TRACING_EXPORTER
+    if not exporter_name:
+        tracer = None
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "TRACING_EXPORTER requires the opentelemetry-sdk package."
+        ) from e
+
+    if exporter_name == "memory":
+        memory_exporter = InMemorySpanExporter()
+        processor = SimpleSpanProcessor(memory_exporter)
+    elif exporter_name == "file":
+        processor = SimpleSpanProcessor(
+            ConsoleSpanExporter(
+                out=open(settings.TRACING_FILE, "a"),
+                formatter=lambda span: json.dumps(json.loads(span.to_json())) + "\n",
+            )
+        )
+    elif exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        processor = BatchSpanProcessor(OTLPSpanExporter())
+    else:
+        raise ImproperlyConfigured(f"Unknown TRACING_EXPORTER {exporter_name!r}.")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME})
+    )
+    provider.add_span_processor(processor)
+    otel_trace = trace
+    tracer = provider.get_tracer(__name__)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Logging filter adding ``request_id``, ``trace_id`` and ``span_id``.
+
+    Records logged outside a request or task get ``"-"``.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace = get_current_trace()
+        record.request_id = trace.request_id if trace else "-"
+        record.trace_id = (trace.trace_id if trace else None) or "-"
+        record.span_id = (trace.span_id if trace else None) or "-"
+        return True
+
+
+# Celery propagation. Connected by connect_task_signals() when Celery is
+# installed; a task's span is kept here between task_prerun and task_postrun.
+_task_spans: Dict[str, Any] = {}
+
+
+def inject_task_headers(headers: Optional[Dict] = None, **kwargs) -> None:
+    """
+    Add the current trace to an outgoing Celery task message.
+    """
+    trace = get_current_trace()
+    if trace is None or headers is None:
+        return
+    headers.setdefault(TASK_REQUEST_ID_HEADER, trace.request_id)
+    traceparent = trace.to_traceparent()
+    if traceparent:
+        headers.setdefault(TASK_TRACEPARENT_HEADER, traceparent)
+
+
+def start_task_span(task_id=None, task=None, **kwargs) -> None:
+    """
+    Enter a span continuing the trace a Celery task was sent with.
+    """
+    parent = trace_from_headers(
+        getattr(task.request, TASK_REQUEST_ID_HEADER, None),
+        getattr(task.request, TASK_TRACEPARENT_HEADER, None),
+    )
+    span = start_span(
+        f"celery.task {task.name}",
+        parent=parent,
+        kind="consumer",
+        attributes={"celery.task_id": task_id},
+    )
+    span.__enter__()
+    _task_spans[task_id] = span
+
+
+def end_task_span(task_id=None, **kwargs) -> None:
+    """
+    Leave the span entered by ``start_task_span``.
+    """
+    span = _task_spans.pop(task_id, None)
+    if span is not None:
+        span.__exit__(None, None, None)
+
+
+def connect_task_signals() -> None:
+    """
+    Propagate trace context through Celery, if installed.
+    """
+    try:
+        from celery import signals
+    except ImportError:  # pragma: no cover
+        return
+    signals.before_task_publish.connect(
+        inject_task_headers, dispatch_uid="trace_inject_task_headers"
+    )
+    signals.task_prerun.connect(start_task_span, dispatch_uid="trace_start_task_span")
+    signals.task_postrun.connect(end_task_span, dispatch_uid="trace_end_task_span")
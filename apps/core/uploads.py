@@ -0,0 +1,145 @@
+"""
+Direct-to-storage upload backends for the project.
+
+Clients ask the API for an upload intent, send the file straight to storage
+using the returned URL, then tell the API the upload is complete. The API
+worker never handles the file body.
+"""
+
+import uuid
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+UPLOAD_SALT = "apps.core.uploads"
+LOCAL_UPLOAD_SALT = "apps.core.uploads.local"
+
+
+class DirectUploadBackend:
+    """
+    Base class for direct upload backends.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def create_upload(
+        self, name: str, content_type: str, max_size: int, expires_in: int, request=None
+    ) -> Dict[str, Any]:
+        """
+        Return the instructions a client needs to upload ``name``.
+
+        Returns:
+            A dictionary with ``method``, ``url``, ``fields`` (form fields for a
+            POST upload) and ``headers`` (headers for a PUT upload).
+        """
+        raise NotImplementedError("Subclasses must implement create_upload()")
+
+    def get_size(self, name: str) -> Optional[int]:
+        """
+        Return the size of an uploaded object, or None if it does not exist.
+        """
+        if not self.storage.exists(name):
+            return None
+        return self.storage.size(name)
+
+
+class S3DirectUploadBackend(DirectUploadBackend):
+    """
+    Upload backend issuing presigned S3 POST policies for ``MediaStorage``.
+
+    The policy pins the key, content type and maximum size, so S3 itself
+    rejects anything the API did not authorize.
+    """
+
+    def create_upload(self, name, content_type, max_size, expires_in, request=None):
+        key = self.storage._normalize_name(name)
+        client = self.storage.connection.meta.client
+        fields = {"Content-Type": content_type}
+        conditions = [
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_size],
+        ]
+        acl = self.storage.default_acl
+        if acl:
+            fields["acl"] = acl
+            conditions.append({"acl": acl})
+
+        presigned = client.generate_presigned_post(
+            Bucket=self.storage.bucket_name,
+            Key=key,
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=expires_in,
+        )
+        return {
+            "method": "POST",
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "headers": {},
+        }
+
+
+class LocalDirectUploadBackend(DirectUploadBackend):
+    """
+    Stand-in upload backend for development and tests.
+
+    Returns a signed URL served by ``LocalDirectUploadView`` that accepts a raw
+    PUT body and writes it to the default storage, mimicking a presigned S3 PUT.
+    """
+
+    def create_upload(self, name, content_type, max_size, expires_in, request=None):
+        token = signing.dumps(
+            {"name": name, "content_type": content_type, "max_size": max_size},
+            salt=LOCAL_UPLOAD_SALT,
+        )
+        url = reverse("local-direct-upload", kwargs={"token": token})
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return {
+            "method": "PUT",
+            "url": url,
+            "fields": {},
+            "headers": {"Content-Type": content_type},
+        }
+
+
+def get_upload_backend(storage) -> DirectUploadBackend:
+    """
+    Return the configured direct upload backend for a storage.
+    """
+    return import_string(settings.DIRECT_UPLOAD_BACKEND)(storage)
+
+
+def generate_upload_name(directory: str, extension: str) -> str:
+    """
+    Generate a new, unguessable storage name for a direct upload.
+    """
+    return f"{directory.rstrip('/')}/{uuid.uuid4().hex}.{extension}"
+
+
+def create_upload_id(name: str, user_id: Any) -> str:
+    """
+    Sign an upload intent so completion can be trusted without storing it.
+    """
+    return signing.dumps({"name": name, "user": str(user_id)}, salt=UPLOAD_SALT)
+
+
+def read_upload_id(upload_id: str, user_id: Any) -> Optional[str]:
+    """
+    Return the storage name of a valid upload intent owned by ``user_id``.
+
+    Intents expire together with the upload URL they were issued with.
+    """
+    try:
+        intent = signing.loads(
+            upload_id, salt=UPLOAD_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES
+        )
+    except signing.BadSignature:
+        return None
+    if intent.get("user") != str(user_id):
+        return None
+    return intent["name"]
@@ -0,0 +1,16 @@
+"""
+URL configuration for the core app.
+"""
+
+from django.urls import path
+
+from apps.core.views import LocalDirectUploadView
+
+urlpatterns = [
+    # Stand-in for presigned storage URLs when using LocalDirectUploadBackend
+    path(
+        "local/<str:token>/",
+        LocalDirectUploadView.as_view(),
+        name="local-direct-upload",
+    ),
+]
@@ -0,0 +1,53 @@
+"""
+Identifier helper functions for the project.
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+_lock = threading.Lock()
+_last_timestamp = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 bits a
+    sub-millisecond fraction, so IDs sort by creation time and new rows are
+    appended to the right edge of a B-tree index. Within a process the
+    timestamp is bumped when needed, so IDs are strictly increasing even if
+    generated in the same clock tick. The remaining 62 bits are random.
+
+    Note that the creation time can be read back from the ID.
+    """
+    global _last_timestamp
+
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    # 60-bit timestamp: milliseconds plus a 12-bit fraction of a millisecond
+    timestamp = (milliseconds << 12) | (remainder * 4096 // 1_000_000)
+    with _lock:
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp + 1
+        _last_timestamp = timestamp
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp >> 12) << 80
+        | 0x7 << 76
+        | (timestamp & 0xFFF) << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_datetime(value: uuid.UUID) -> datetime:
+    """
+    Return the creation time embedded in a version 7 UUID.
+    """
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
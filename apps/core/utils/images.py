@@ -0,0 +1,91 @@
+"""
+Image helper functions for the project.
+
+Pillow is imported by the functions that decode or encode images, so
+processes that only sniff uploads never load it.
+"""
+
+import io
+from typing import BinaryIO, Dict, Iterable, Optional
+
+# Leading bytes of the image formats we accept for uploads.
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "jpeg",
+    b"\x89PNG\r\n\x1a\n": "png",
+    b"GIF87a": "gif",
+    b"GIF89a": "gif",
+}
+
+# Pillow save options per output format.
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+
+
+def sniff_image_format(file: BinaryIO) -> Optional[str]:
+    """
+    Detect an image format from its leading bytes without decoding it.
+
+    Args:
+        file: A readable, seekable file object.
+
+    Returns:
+        The format name, or None if the file is not a supported image.
+    """
+    position = file.tell()
+    header = file.read(16)
+    file.seek(position)
+
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    for signature, image_format in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            return image_format
+    return None
+
+
+def supported_output_formats(formats: Iterable[str]) -> list:
+    """
+    Filter output formats down to those this Pillow build can encode.
+    """
+    from PIL import features
+
+    return [image_format for image_format in formats if features.check(image_format)]
+
+
+def make_thumbnails(
+    file: BinaryIO, sizes: Iterable[int], formats: Iterable[str]
+) -> Dict[int, Dict[str, bytes]]:
+    """
+    Decode an image once and encode square thumbnails of it.
+
+    Args:
+        file: The source image.
+        sizes: Edge lengths, in pixels, of the thumbnails to produce.
+        formats: Output formats, e.g. ``["webp", "avif"]``.
+
+    Returns:
+        A mapping of size to format to encoded bytes.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the file is not a valid image.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(file) as image:
+        # Decompression bombs and truncated files fail here, off the request path
+        image.load()
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        thumbnails = {}
+        for size in sorted(sizes, reverse=True):
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            thumbnails[size] = {}
+            for image_format in formats:
+                buffer = io.BytesIO()
+                thumbnail.save(buffer, **SAVE_OPTIONS[image_format])
+                thumbnails[size][image_format] = buffer.getvalue()
+        return thumbnails
@@ -2,9 +2,26 @@
 Base views for the project.
 """
 
+import ipaddress
+import tempfile
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import mixins, viewsets
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from apps.core.db import slow_queries
+from apps.core.permissions import apply_row_policy
+from apps.core.schemas import custom_extend_schema
+from apps.core.uploads import LOCAL_UPLOAD_SALT
 from apps.core.utils.helpers import format_response
 
 
@@ -12,9 +29,24 @@ class BaseViewSet(viewsets.GenericViewSet):
     """
     Base viewset for all viewsets.
 
-    This viewset provides common functionality for all viewsets.
+    This viewset provides common functionality for all viewsets, including
+    applying the view's ``row_policy`` to its queryset.
     """
 
+    def get_queryset(self):
+        """
+        Return the queryset, limited to the rows ``row_policy`` allows.
+
+        Applied here rather than only by ``RowPolicyFilterBackend``, so a
+        view overriding ``filter_backends`` cannot expose hidden rows.
+        """
+        queryset = super().get_queryset()
+        policy = getattr(self, "row_policy", None)
+        if policy is None:
+            return queryset
+        self.row_policy_applied = True
+        return apply_row_policy(policy, self.request, queryset)
+
     def get_success_headers(self, data):
         """
         Get success headers for create operations.
@@ -158,3 +190,106 @@ class ModelViewSet(viewsets.ModelViewSet, BaseViewSet):
             ),
             status=204,
         )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class LocalDirectUploadView(View):
+    """
+    Receive a raw PUT upload for ``LocalDirectUploadBackend``.
+
+    This is a development stand-in for a presigned S3 URL: the signed token in
+    the URL authorizes exactly one storage name, content type and size.
+    """
+
+    chunk_size = 64 * 1024
+
+    def put(self, request, token):
+        try:
+            upload = signing.loads(
+                token, salt=LOCAL_UPLOAD_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES
+            )
+        except signing.BadSignature:
+            return HttpResponse("Invalid or expired upload URL.", status=403)
+
+        if request.content_type != upload["content_type"]:
+            return HttpResponse("Content type does not match.", status=400)
+
+        with tempfile.SpooledTemporaryFile(max_size=self.chunk_size * 16) as buffer:
+            size = 0
+            while True:
+                chunk = request.read(self.chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > upload["max_size"]:
+                    return HttpResponse("Upload too large.", status=413)
+                buffer.write(chunk)
+            if not size:
+                return HttpResponse("Empty upload.", status=400)
+
+            buffer.seek(0)
+            default_storage.delete(upload["name"])
+            default_storage.save(upload["name"], File(buffer))
+
+        return HttpResponse(status=200)
+
+
+class SlowQueryListView(APIView):
+    """
+    View listing the slow queries sampled by this process, newest first.
+
+    Each worker keeps its own samples, so consecutive requests may show
+    different lists; the logs hold every sample.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @custom_extend_schema(
+        summary="List slow queries",
+        description="Recent queries over the slow query threshold, with plans",
+        tags=["Diagnostics"],
+    )
+    def get(self, request):
+        """
+        Return the sampled slow queries.
+        """
+        return Response(
+            format_response(
+                data={
+                    "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                    "results": [
+                        sample.to_dict() for sample in slow_queries.buffer.samples()
+                    ],
+                },
+                message="Slow queries retrieved successfully",
+            )
+        )
+
+
+def is_metrics_client(address: str) -> bool:
+    """
+    Return whether ``address`` is in ``METRICS_ALLOWED_NETWORKS``.
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        ip in ipaddress.ip_network(network, strict=False)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    )
+
+
+def metrics_view(request):
+    """
+    Export Prometheus metrics to scrapers on an allowed network.
+
+    Anyone else gets a 404. The check uses the connecting address, which
+    behind nginx is the proxy, so nginx also refuses ``/metrics``.
+    Prometheus scrapes the web container directly.
+    """
+    if not is_metrics_client(request.META.get("REMOTE_ADDR", "")):
+        raise Http404
+    from django_prometheus.exports import ExportToDjangoView
+
+    return ExportToDjangoView(request)
@@ -0,0 +1,181 @@
+"""
+Worker warm-up for the project.
+
+The first requests a new worker serves otherwise pay for work done lazily
+once per process: importing every view while populating the URL resolver,
+building serializer fields, loading translation catalogs and the common
+password list, and opening database and cache connections. ``warm_up``
+does that work at startup instead, phase by phase, and logs how long each
+phase took.
+"""
+
+import logging
+import time
+from importlib import import_module
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.core.cache import caches
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+# DRF settings naming classes that are imported on first access
+DRF_CLASS_SETTINGS = (
+    "DEFAULT_AUTHENTICATION_CLASSES",
+    "DEFAULT_PERMISSION_CLASSES",
+    "DEFAULT_RENDERER_CLASSES",
+    "DEFAULT_PARSER_CLASSES",
+    "DEFAULT_FILTER_BACKENDS",
+    "DEFAULT_PAGINATION_CLASS",
+    "DEFAULT_SCHEMA_CLASS",
+    "EXCEPTION_HANDLER",
+)
+
+
+def iter_view_classes(patterns=None) -> Iterator[type]:
+    """
+    Yield the class of every class-based view in the URLconf.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None) or getattr(
+                pattern.callback, "view_class", None
+            )
+            if view_class is not None:
+                yield view_class
+
+
+def warm_urls() -> None:
+    """
+    Populate the URL resolver, importing every view module.
+    """
+    get_resolver()._populate()
+
+
+def warm_imports() -> None:
+    """
+    Import DRF's configured classes and the modules in ``WARMUP_IMPORTS``.
+    """
+    from rest_framework.settings import api_settings
+
+    for name in DRF_CLASS_SETTINGS:
+        getattr(api_settings, name)
+    for module in settings.WARMUP_IMPORTS:
+        import_module(module)
+
+
+def warm_serializers() -> None:
+    """
+    Build the fields of every view's serializer class.
+    """
+    serializer_classes = {
+        view_class.serializer_class
+        for view_class in iter_view_classes()
+        if getattr(view_class, "serializer_class", None) is not None
+    }
+    for serializer_class in serializer_classes:
+        try:
+            serializer_class().fields
+        except Exception:
+            logger.debug("Could not warm %s", serializer_class, exc_info=True)
+
+
+def warm_translations() -> None:
+    """
+    Load the translation catalogs of the default language.
+    """
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("This field is required.")
+
+
+def warm_password_validators() -> None:
+    """
+    Instantiate the password validators, loading the common password list.
+    """
+    password_validation.get_default_password_validators()
+
+
+def warm_databases() -> None:
+    """
+    Open a connection to every configured database.
+    """
+    for alias in settings.DATABASES:
+        connections[alias].ensure_connection()
+
+
+def warm_caches() -> None:
+    """
+    Open a connection to every configured cache.
+    """
+    for alias in settings.CACHES:
+        caches[alias].get("warmup")
+
+
+# Phases whose results are shared by processes forked after they run
+PRELOAD_PHASES: List[Tuple[str, Callable[[], None]]] = [
+    ("urls", warm_urls),
+    ("imports", warm_imports),
+    ("serializers", warm_serializers),
+    ("translations", warm_translations),
+    ("password_validators", warm_password_validators),
+]
+# Phases that must run in the process that will use the connections
+CONNECTION_PHASES: List[Tuple[str, Callable[[], None]]] = [
+    ("databases", warm_databases),
+    ("caches", warm_caches),
+]
+WARMUP_PHASES = PRELOAD_PHASES + CONNECTION_PHASES
+# Under ASGI, sync views run in executor threads with their own database
+# connections, so one opened in the importing thread is never used
+ASGI_SKIPPED_PHASES = ("databases",)
+
+
+def warm_up(phases=None, asgi: bool = False) -> Dict[str, float]:
+    """
+    Run the warm-up phases and log their timings.
+
+    A failing phase is logged and skipped, so an unavailable service
+    delays nothing but its own warm-up.
+
+    Args:
+        phases: ``(name, callable)`` pairs. Defaults to ``WARMUP_PHASES``,
+            or ``PRELOAD_PHASES`` if ``WARMUP_DEFER_CONNECTIONS`` is set.
+        asgi: Whether the process serves ASGI; the default phases then
+            leave out ``ASGI_SKIPPED_PHASES``.
+
+    Returns:
+        A mapping of phase name to duration in milliseconds.
+    """
+    if not settings.WARMUP_ENABLED:
+        return {}
+
+    if phases is None:
+        phases = PRELOAD_PHASES if settings.WARMUP_DEFER_CONNECTIONS else WARMUP_PHASES
+        if asgi:
+            phases = [
+                (name, phase)
+                for name, phase in phases
+                if name not in ASGI_SKIPPED_PHASES
+            ]
+
+    timings = {}
+    started = time.perf_counter()
+    for name, phase in phases:
+        phase_started = time.perf_counter()
+        try:
+            phase()
+        except Exception:
+            logger.warning("Warm-up phase %s failed", name, exc_info=True)
+        timings[name] = (time.perf_counter() - phase_started) * 1000
+        logger.info("Warm-up phase %s took %.1f ms", name, timings[name])
+
+    logger.info("Warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
+    return timings
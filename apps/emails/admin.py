@@ -0,0 +1,20 @@
+"""
+Admin configuration for the emails app.
+"""
+
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the OutboxMessage model.
+    """
+
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    ordering = ("-created_at",)
+    readonly_fields = ("attempts", "last_error", "sent_at", "created_at", "updated_at")
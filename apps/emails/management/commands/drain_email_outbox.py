@@ -0,0 +1,29 @@
+"""
+Management command to deliver queued emails.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.emails.services.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    """
+    Deliver due outbox messages in the current process.
+
+    Useful from cron, or where no Celery worker is running.
+    """
+
+    help = "Deliver queued outbox emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of messages to claim per batch",
+        )
+
+    def handle(self, *args, **options):
+        sent = deliver_pending(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} email(s)."))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+from apps.core.db.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction
+    atomic = False
+
+    dependencies = [
+        ("emails", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="outboxmessage",
+            index=models.Index(
+                fields=["created_at", "id"], name="emails_outboxmessage_ca_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="outboxmessage",
+            index=models.Index(
+                fields=["updated_at"], name="emails_outboxmessage_ua_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""
+Email models for the project.
+"""
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models import BaseModel
+
+
+class OutboxMessage(BaseModel):
+    """
+    An email waiting to be delivered by the outbox worker.
+
+    Messages are written in the same transaction as the change that caused
+    them and delivered out of band, so request latency never depends on the
+    mail server.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENDING = "sending", _("Sending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    subject = models.CharField(_("Subject"), max_length=255)
+    body = models.TextField(_("Body"))
+    html_body = models.TextField(_("HTML body"), blank=True)
+    from_email = models.CharField(_("From email"), max_length=254, blank=True)
+    to = models.JSONField(_("To"), default=list)
+    status = models.CharField(
+        _("Status"), max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("Next attempt at"), default=timezone.now)
+    last_error = models.TextField(_("Last error"), blank=True)
+    sent_at = models.DateTimeField(_("Sent at"), blank=True, null=True)
+
+    class Meta(BaseModel.Meta):
+        verbose_name = _("outbox message")
+        verbose_name_plural = _("outbox messages")
+        indexes = BaseModel.Meta.indexes + [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="emails_outbox_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
@@ -0,0 +1,240 @@
+"""
+Outbox service for the emails app.
+
+Requests call ``enqueue_email`` and return immediately; a worker calls
+``deliver_pending`` to send due messages over a single SMTP connection.
+"""
+
+import logging
+import random
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.emails.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(
+    subject: str,
+    body: str,
+    to: List[str],
+    from_email: Optional[str] = None,
+    html_body: str = "",
+) -> OutboxMessage:
+    """
+    Store an email in the outbox and schedule its delivery.
+
+    The row is written in the caller's transaction, and the worker is only
+    notified once that transaction commits, so a rolled back request never
+    sends mail.
+
+    Args:
+        subject: The email subject.
+        body: The plain text body.
+        to: A list of recipient addresses.
+        from_email: The sender address. Defaults to ``DEFAULT_FROM_EMAIL``.
+        html_body: An optional HTML alternative.
+
+    Returns:
+        The queued outbox message.
+    """
+    message = OutboxMessage.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+    transaction.on_commit(schedule_delivery)
+    return message
+
+
+def schedule_delivery(countdown: Optional[float] = None) -> None:
+    """
+    Ask the configured runner to drain the outbox.
+
+    ``EMAIL_OUTBOX_RUNNER`` is a dotted path to a callable accepting an
+    optional countdown in seconds, or empty to rely on the periodic
+    ``drain_email_outbox`` command.
+    """
+    runner_path = settings.EMAIL_OUTBOX_RUNNER
+    if not runner_path:
+        return
+    try:
+        import_string(runner_path)(countdown)
+    except Exception:
+        # The message is safely stored; the periodic drain will pick it up.
+        logger.exception("Failed to schedule email outbox delivery")
+
+
+def run_inline(countdown: Optional[float] = None) -> None:
+    """
+    Drain the outbox in the current process.
+
+    Used in development and tests. Retries are not rescheduled here.
+    """
+    if countdown is None:
+        deliver_pending()
+
+
+def run_celery(countdown: Optional[float] = None) -> None:
+    """
+    Drain the outbox on a Celery worker.
+    """
+    from apps.emails.tasks import drain_outbox
+
+    drain_outbox.apply_async(countdown=countdown)
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """
+    Return the exponential backoff delay, with jitter, after a failed attempt.
+
+    Args:
+        attempts: The number of attempts made so far.
+
+    Returns:
+        How long to wait before the next attempt.
+    """
+    base = settings.EMAIL_OUTBOX_RETRY_DELAY
+    delay = min(base * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_MAX_RETRY_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size: int) -> List[OutboxMessage]:
+    """
+    Lock and mark a batch of due messages as being sent.
+
+    Rows are claimed with ``SKIP LOCKED`` where the database supports it, so
+    several workers can drain concurrently. A claim is a lease: messages left
+    in ``sending`` by a crashed worker become due again once it expires.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboxMessage.Status.PENDING, OutboxMessage.Status.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+                status=OutboxMessage.Status.SENDING,
+                next_attempt_at=now
+                + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+            )
+    return messages
+
+
+def build_email(message: OutboxMessage, connection) -> EmailMultiAlternatives:
+    """
+    Build a Django email from an outbox message.
+    """
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or None,
+        to=message.to,
+        connection=connection,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, "text/html")
+    return email
+
+
+def mark_failed(message: OutboxMessage, error: Exception) -> None:
+    """
+    Record a failed attempt and schedule a retry, or give up.
+    """
+    message.attempts += 1
+    message.last_error = f"{type(error).__name__}: {error}"
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxMessage.Status.FAILED
+        logger.error(
+            f"Giving up on outbox message {message.pk} after "
+            f"{message.attempts} attempts: {message.last_error}"
+        )
+    else:
+        message.status = OutboxMessage.Status.PENDING
+        message.next_attempt_at = timezone.now() + get_retry_delay(message.attempts)
+    message.save(
+        update_fields=[
+            "attempts",
+            "last_error",
+            "status",
+            "next_attempt_at",
+            "updated_at",
+        ]
+    )
+
+
+def deliver_pending(batch_size: Optional[int] = None) -> int:
+    """
+    Send due outbox messages, batch by batch, over one SMTP connection.
+
+    Args:
+        batch_size: Messages to claim per batch. Defaults to
+            ``EMAIL_OUTBOX_BATCH_SIZE``.
+
+    Returns:
+        The number of messages sent.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = 0
+    connection = None
+    try:
+        while True:
+            messages = claim_batch(batch_size)
+            if not messages:
+                break
+
+            for index, message in enumerate(messages):
+                if connection is None:
+                    connection = get_connection(fail_silently=False)
+                    try:
+                        # Opened explicitly so send_messages() keeps it open.
+                        connection.open()
+                    except Exception as error:
+                        # The server is unreachable; push the rest back.
+                        for unsent in messages[index:]:
+                            mark_failed(unsent, error)
+                        connection = None
+                        return sent
+                try:
+                    connection.send_messages([build_email(message, connection)])
+                except Exception as error:
+                    mark_failed(message, error)
+                    # The connection may be broken; reconnect for the next one.
+                    connection.close()
+                    connection = None
+                    continue
+                message.status = OutboxMessage.Status.SENT
+                message.attempts += 1
+                message.sent_at = timezone.now()
+                message.last_error = ""
+                message.save(
+                    update_fields=[
+                        "status",
+                        "attempts",
+                        "sent_at",
+                        "last_error",
+                        "updated_at",
+                    ]
+                )
+                sent += 1
+
+            if len(messages) < batch_size:
+                break
+    finally:
+        if connection is not None:
+            connection.close()
+    return sent
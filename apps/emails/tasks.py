@@ -0,0 +1,19 @@
+"""
+Celery tasks for the emails app.
+"""
+
+from celery import shared_task
+
+from apps.emails.services.outbox import deliver_pending
+
+
+@shared_task(name="emails.drain_outbox", ignore_result=True)
+def drain_outbox(batch_size=None):
+    """
+    Send due outbox messages.
+
+    Failed messages are retried by the beat schedule's periodic drain, not
+    by a wake-up scheduled here: every enqueue also starts a drain, and each
+    would otherwise start its own rescheduling chain during an outage.
+    """
+    return deliver_pending(batch_size)
@@ -0,0 +1,134 @@
+"""
+Tests for the emails app outbox service.
+"""
+
+import re
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.emails.models import OutboxMessage
+from apps.emails.services.outbox import deliver_pending, enqueue_email
+
+User = get_user_model()
+
+
+@override_settings(EMAIL_OUTBOX_RUNNER="")
+class OutboxServiceTests(TestCase):
+    """
+    Tests for enqueueing and delivering outbox messages.
+    """
+
+    def test_enqueue_does_not_send(self):
+        """
+        Test that enqueueing only stores the message.
+        """
+        message = enqueue_email("Hello", "Body", ["a@example.com"])
+        self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_deliver_pending_sends_batches_over_one_connection(self):
+        """
+        Test that due messages are sent and marked as sent.
+        """
+        for i in range(5):
+            enqueue_email(f"Hello {i}", "Body", [f"user{i}@example.com"])
+
+        with mock.patch(
+            "apps.emails.services.outbox.get_connection",
+            wraps=mail.get_connection,
+        ) as get_connection:
+            sent = deliver_pending(batch_size=2)
+
+        self.assertEqual(sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT).exists()
+        )
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_delivery_is_retried_with_backoff(self):
+        """
+        Test that failures are rescheduled and eventually given up on.
+        """
+        message = enqueue_email("Hello", "Body", ["a@example.com"])
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=SMTPServerDisconnected("gone"),
+        ):
+            self.assertEqual(deliver_pending(), 0)
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+            self.assertEqual(message.attempts, 1)
+            self.assertGreater(message.next_attempt_at, message.updated_at)
+
+            # Not due yet, so nothing is attempted
+            self.assertEqual(deliver_pending(), 0)
+            message.refresh_from_db()
+            self.assertEqual(message.attempts, 1)
+
+            OutboxMessage.objects.update(next_attempt_at=message.created_at)
+            deliver_pending()
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboxMessage.Status.FAILED)
+            self.assertIn("gone", message.last_error)
+
+
+class PasswordResetEmailTests(APITestCase):
+    """
+    Tests for the password reset email.
+    """
+
+    def test_password_reset_request_queues_email(self):
+        """
+        Test that the password reset endpoint delivers through the outbox.
+        """
+        User.objects.create_user(email="test@example.com", password="testpassword")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("password_reset_request"), {"email": "test@example.com"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("reset_link", response.data.get("data") or {})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["test@example.com"])
+
+        # The link only reaches the user by email, and it works
+        uid, token = re.search(
+            r"/reset-password/([^/]+)/([^/]+)/", mail.outbox[0].body
+        ).groups()
+        response = self.client.post(
+            reverse("password_reset_confirm"),
+            {
+                "uid": uid,
+                "token": token,
+                "new_password": "N3w-passw0rd!",
+                "new_password_confirm": "N3w-passw0rd!",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unknown_email_gets_the_same_response(self):
+        """
+        Test that the response does not reveal whether the email exists.
+        """
+        User.objects.create_user(email="test@example.com", password="testpassword")
+        url = reverse("password_reset_request")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            known = self.client.post(url, {"email": "test@example.com"})
+            unknown = self.client.post(url, {"email": "nobody@example.com"})
+
+        self.assertEqual(known.status_code, unknown.status_code)
+        self.assertEqual(known.data, unknown.data)
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+from apps.core.db.operations import AddIndexConcurrently
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction
+    atomic = False
+
+    dependencies = [
+        ("users", "0002_user_profile_picture_thumbnails"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(fields=["created_at", "id"], name="users_user_ca_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(fields=["updated_at"], name="users_user_ua_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="users_user_email_upper_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["created_at", "id"],
+                name="users_user_active_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_staff", True)),
+                fields=["created_at", "id"],
+                name="users_user_staff_idx",
+            ),
+        ),
+    ]
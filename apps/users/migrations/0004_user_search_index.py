@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from apps.core.db.operations import AddSearchIndex
+
+
+class Migration(migrations.Migration):
+    # Trigram indexes are built concurrently on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ("users", "0003_user_indexes"),
+    ]
+
+    operations = [
+        AddSearchIndex(model_name="user", fields=["email", "first_name", "last_name"]),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:51
+
+import apps.core.utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_user_search_index"),
+    ]
+
+    operations = [
+        # Defaults live in Python, so only the migration state changes; this
+        # also avoids a full table rebuild on SQLite.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="user",
+                    name="id",
+                    field=models.UUIDField(
+                        default=apps.core.utils.ids.uuid7,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -4,6 +4,8 @@ User models for the project.
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -75,6 +77,10 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     profile_picture = models.ImageField(
         _("Profile picture"), upload_to="profile_pictures/", blank=True, null=True
     )
+    # Maps thumbnail size to format to storage name; filled in the background
+    profile_picture_thumbnails = models.JSONField(
+        _("Profile picture thumbnails"), default=dict, blank=True, editable=False
+    )
     phone_number = models.CharField(_("Phone number"), max_length=20, blank=True)
     
     # Settings
@@ -85,9 +91,23 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
     
-    class Meta:
+    class Meta(BaseModel.Meta):
         verbose_name = _("user")
         verbose_name_plural = _("users")
+        indexes = BaseModel.Meta.indexes + [
+            # Matches the UPPER(email) = UPPER(...) that email__iexact compiles to
+            models.Index(Upper("email"), name="users_user_email_upper_idx"),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(is_active=True),
+                name="users_user_active_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(is_staff=True),
+                name="users_user_staff_idx",
+            ),
+        ]
     
     def __str__(self):
         return self.email
@@ -2,11 +2,13 @@
 Serializers for the users app.
 """
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
-from apps.core.serializers import BaseModelSerializer
+from apps.core.serializers import BaseModelSerializer, UploadedImageField
+from apps.users.services.profile_picture import schedule_processing
 
 User = get_user_model()
 
@@ -16,6 +18,8 @@ class UserSerializer(BaseModelSerializer):
     Serializer for the User model.
     """
     
+    profile_picture_thumbnails = serializers.SerializerMethodField()
+    
     class Meta:
         model = User
         fields = [
@@ -25,12 +29,33 @@ class UserSerializer(BaseModelSerializer):
             "last_name",
             "bio",
             "profile_picture",
+            "profile_picture_thumbnails",
             "phone_number",
             "date_joined",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "date_joined", "created_at", "updated_at"]
+    
+    def get_profile_picture_thumbnails(self, obj):
+        """
+        Return thumbnail URLs keyed by size and format.
+        
+        Empty until the background pipeline has processed the picture.
+        """
+        if not obj.profile_picture:
+            return {}
+        storage = obj.profile_picture.storage
+        request = self.context.get("request")
+        thumbnails = {}
+        for size, formats in obj.profile_picture_thumbnails.items():
+            thumbnails[size] = {}
+            for image_format, name in formats.items():
+                url = storage.url(name)
+                thumbnails[size][image_format] = (
+                    request.build_absolute_uri(url) if request else url
+                )
+        return thumbnails
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -80,6 +105,8 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     Serializer for updating a user.
     """
     
+    profile_picture = UploadedImageField(required=False, allow_null=True)
+    
     class Meta:
         model = User
         fields = [
@@ -89,6 +116,21 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             "profile_picture",
             "phone_number",
         ]
+    
+    def update(self, instance, validated_data):
+        """
+        Update the user and hand a new profile picture to the image pipeline.
+        """
+        picture_changed = "profile_picture" in validated_data
+        stale_thumbnails = instance.profile_picture_thumbnails
+        if picture_changed:
+            instance.profile_picture_thumbnails = {}
+        
+        instance = super().update(instance, validated_data)
+        
+        if picture_changed:
+            schedule_processing(instance, stale_thumbnails)
+        return instance
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -120,3 +162,38 @@ class ChangePasswordSerializer(serializers.Serializer):
         if not user.check_password(value):
             raise serializers.ValidationError("Old password is not correct.")
         return value
+
+
+class ProfilePictureUploadSerializer(serializers.Serializer):
+    """
+    Serializer for requesting a direct profile picture upload.
+    """
+    
+    CONTENT_TYPES = {
+        "image/jpeg": "jpg",
+        "image/png": "png",
+        "image/gif": "gif",
+        "image/webp": "webp",
+    }
+    
+    content_type = serializers.ChoiceField(choices=list(CONTENT_TYPES))
+    size = serializers.IntegerField(min_value=1)
+    
+    def validate_size(self, value):
+        """
+        Validate that the file is not larger than allowed.
+        """
+        max_size = settings.IMAGE_UPLOAD_MAX_SIZE
+        if value > max_size:
+            raise serializers.ValidationError(
+                f"Image files may not be larger than {max_size} bytes."
+            )
+        return value
+
+
+class ProfilePictureCompleteSerializer(serializers.Serializer):
+    """
+    Serializer for completing a direct profile picture upload.
+    """
+    
+    upload_id = serializers.CharField(required=True)
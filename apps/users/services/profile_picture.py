@@ -0,0 +1,196 @@
+"""
+Profile picture service for the users app.
+
+Uploads are stored as-is on the request; decoding, validation and thumbnail
+generation run afterwards through ``PROFILE_PICTURE_RUNNER``.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from apps.core.exceptions import BadRequestError
+from apps.core.uploads import (
+    create_upload_id,
+    generate_upload_name,
+    get_upload_backend,
+    read_upload_id,
+)
+from apps.core.utils.images import make_thumbnails, supported_output_formats
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def create_direct_upload(
+    user, extension: str, content_type: str, size: int, request=None
+) -> Dict:
+    """
+    Create an upload intent for sending a profile picture straight to storage.
+
+    Args:
+        user: The user uploading the picture.
+        extension: The file extension for the stored object.
+        content_type: The declared content type, enforced by the upload URL.
+        size: The declared size in bytes, used as the upload size limit.
+        request: The current request, used to build absolute URLs.
+
+    Returns:
+        The upload instructions plus an ``upload_id`` for completion.
+    """
+    field = User._meta.get_field("profile_picture")
+    name = generate_upload_name(field.upload_to, extension)
+    upload = get_upload_backend(field.storage).create_upload(
+        name, content_type, size, settings.DIRECT_UPLOAD_EXPIRES, request=request
+    )
+    upload["upload_id"] = create_upload_id(name, user.pk)
+    upload["expires_in"] = settings.DIRECT_UPLOAD_EXPIRES
+    return upload
+
+
+def complete_direct_upload(user, upload_id: str):
+    """
+    Verify a finished direct upload and attach it as the user's picture.
+
+    Raises:
+        BadRequestError: If the intent is invalid or the object is missing.
+    """
+    name = read_upload_id(upload_id, user.pk)
+    if name is None:
+        raise BadRequestError("Invalid or expired upload.")
+
+    field = User._meta.get_field("profile_picture")
+    size = get_upload_backend(field.storage).get_size(name)
+    if size is None:
+        raise BadRequestError("The uploaded file was not found.")
+    if size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        field.storage.delete(name)
+        raise BadRequestError("The uploaded file is too large.")
+
+    stale_thumbnails = user.profile_picture_thumbnails
+    with transaction.atomic():
+        user.profile_picture = name
+        user.profile_picture_thumbnails = {}
+        user.save(
+            update_fields=[
+                "profile_picture",
+                "profile_picture_thumbnails",
+                "updated_at",
+            ]
+        )
+        # Decoding and validation happen in the background pipeline
+        schedule_processing(user, stale_thumbnails)
+    return user
+
+
+def schedule_processing(user, stale_thumbnails: Optional[Dict] = None) -> None:
+    """
+    Process a user's profile picture once the current transaction commits.
+
+    Args:
+        user: The user whose picture changed.
+        stale_thumbnails: Thumbnails of the previous picture, to be deleted.
+    """
+    stale_names = get_thumbnail_names(stale_thumbnails or {})
+    runner = import_string(settings.PROFILE_PICTURE_RUNNER)
+    transaction.on_commit(lambda: runner(str(user.pk), stale_names))
+
+
+def run_inline(user_id: str, stale_names: List[str]) -> None:
+    """
+    Process the picture in the current process.
+    """
+    process_profile_picture(user_id, stale_names)
+
+
+def run_celery(user_id: str, stale_names: List[str]) -> None:
+    """
+    Process the picture on a Celery worker.
+    """
+    from apps.users.tasks import process_profile_picture_task
+
+    process_profile_picture_task.delay(user_id, stale_names)
+
+
+def get_thumbnail_names(thumbnails: Dict) -> List[str]:
+    """
+    Flatten a thumbnails mapping into a list of storage names.
+    """
+    return [name for formats in thumbnails.values() for name in formats.values()]
+
+
+def delete_unshared(storage, names: List[str]) -> None:
+    """
+    Delete thumbnails, unless the storage may share them between users.
+
+    Content-addressed storages map identical thumbnails to a single object,
+    so those are left for a lifecycle rule to expire instead.
+    """
+    if getattr(storage, "deduplicates", False):
+        return
+    for name in names:
+        storage.delete(name)
+
+
+def process_profile_picture(
+    user_id: str, stale_names: Optional[List[str]] = None
+) -> None:
+    """
+    Validate a user's profile picture and generate its thumbnails.
+
+    Invalid images are deleted and removed from the user. The result is only
+    attached if the picture was not replaced while processing.
+
+    Args:
+        user_id: The primary key of the user.
+        stale_names: Storage names of thumbnails to delete first.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    field = User._meta.get_field("profile_picture")
+    storage = field.storage
+
+    delete_unshared(storage, stale_names or [])
+
+    user = User.objects.filter(pk=user_id).only("profile_picture").first()
+    if user is None or not user.profile_picture:
+        return
+    name = user.profile_picture.name
+
+    try:
+        with storage.open(name, "rb") as file:
+            thumbnails = make_thumbnails(
+                file,
+                settings.PROFILE_PICTURE_THUMBNAIL_SIZES,
+                supported_output_formats(settings.PROFILE_PICTURE_THUMBNAIL_FORMATS),
+            )
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        logger.warning(f"Discarding invalid profile picture {name} of user {user_id}")
+        User.objects.filter(pk=user_id, profile_picture=name).update(
+            profile_picture=None, profile_picture_thumbnails={}
+        )
+        storage.delete(name)
+        return
+
+    stem = os.path.splitext(os.path.basename(name))[0]
+    saved = {}
+    for size, encoded in thumbnails.items():
+        for image_format, content in encoded.items():
+            saved.setdefault(str(size), {})[image_format] = storage.save(
+                f"profile_pictures/thumbnails/{stem}_{size}.{image_format}",
+                ContentFile(content),
+            )
+
+    attached = User.objects.filter(pk=user_id, profile_picture=name).update(
+        profile_picture_thumbnails=saved
+    )
+    if not attached:
+        # A newer upload won the race; its own job produces its thumbnails.
+        delete_unshared(storage, get_thumbnail_names(saved))
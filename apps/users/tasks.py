@@ -0,0 +1,15 @@
+"""
+Celery tasks for the users app.
+"""
+
+from celery import shared_task
+
+from apps.users.services.profile_picture import process_profile_picture
+
+
+@shared_task(name="users.process_profile_picture", ignore_result=True)
+def process_profile_picture_task(user_id, stale_names=None):
+    """
+    Validate a profile picture and generate its thumbnails.
+    """
+    process_profile_picture(user_id, stale_names)
@@ -0,0 +1,185 @@
+"""
+Tests for the users app profile picture pipeline.
+"""
+
+import importlib
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    PROFILE_PICTURE_THUMBNAIL_SIZES=[32, 64],
+    PROFILE_PICTURE_THUMBNAIL_FORMATS=["webp"],
+)
+class ProfilePictureTests(APITestCase):
+    """
+    Tests for uploading and processing profile pictures.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """
+        Set up test data.
+        """
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpassword"
+        )
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.user_detail_url = reverse("user-detail", kwargs={"pk": self.user.pk})
+
+    def _upload(self, content, name="avatar.png"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(
+                self.user_detail_url,
+                {"profile_picture": SimpleUploadedFile(name, content)},
+                format="multipart",
+            )
+
+    def _png(self, size=(300, 200)):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, "red").save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def test_upload_generates_thumbnails(self):
+        """
+        Test that an uploaded picture gets thumbnails after commit.
+        """
+        response = self._upload(self._png())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        thumbnails = self.user.profile_picture_thumbnails
+        self.assertEqual(set(thumbnails), {"32", "64"})
+        storage = self.user.profile_picture.storage
+        with storage.open(thumbnails["64"]["webp"]) as file:
+            with Image.open(file) as image:
+                self.assertEqual(image.size, (64, 64))
+                self.assertEqual(image.format, "WEBP")
+
+    def test_non_image_upload_is_rejected(self):
+        """
+        Test that files without an image signature are rejected up front.
+        """
+        response = self._upload(b"not an image at all", name="avatar.png")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_corrupt_image_is_discarded(self):
+        """
+        Test that an image which fails to decode is removed in the background.
+        """
+        response = self._upload(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_picture)
+        self.assertEqual(self.user.profile_picture_thumbnails, {})
+
+    def test_replacing_picture_removes_stale_thumbnails(self):
+        """
+        Test that thumbnails of a replaced picture are deleted.
+        """
+        self._upload(self._png())
+        self.user.refresh_from_db()
+        storage = self.user.profile_picture.storage
+        old_thumbnail = self.user.profile_picture_thumbnails["32"]["webp"]
+
+        self._upload(self._png(size=(50, 80)))
+        self.assertFalse(storage.exists(old_thumbnail))
+
+    def test_direct_upload(self):
+        """
+        Test uploading through an upload intent and completing it.
+        """
+        content = self._png()
+        response = self.client.post(
+            reverse("user-profile-picture-upload"),
+            {"content_type": "image/png", "size": len(content)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload = response.data["data"]
+        self.assertEqual(upload["method"], "PUT")
+
+        response = self.client.generic(
+            "PUT", upload["url"], content, content_type="image/png"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("user-profile-picture-complete"),
+                {"upload_id": upload["upload_id"]},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.profile_picture.name.startswith("profile_pictures/"))
+        self.assertEqual(set(self.user.profile_picture_thumbnails), {"32", "64"})
+
+    def test_direct_upload_rejects_oversized_body(self):
+        """
+        Test that the upload URL enforces the declared size.
+        """
+        response = self.client.post(
+            reverse("user-profile-picture-upload"),
+            {"content_type": "image/png", "size": 10},
+        )
+        upload = response.data["data"]
+        response = self.client.generic(
+            "PUT", upload["url"], self._png(), content_type="image/png"
+        )
+        self.assertEqual(response.status_code, 413)
+
+    def test_complete_requires_uploaded_object(self):
+        """
+        Test that completing an upload that never happened fails.
+        """
+        response = self.client.post(
+            reverse("user-profile-picture-upload"),
+            {"content_type": "image/png", "size": 100},
+        )
+        response = self.client.post(
+            reverse("user-profile-picture-complete"),
+            {"upload_id": response.data["data"]["upload_id"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_local_upload_endpoint_needs_local_backend(self):
+        """
+        Test that the local upload endpoint is not routed for other backends.
+        """
+        import config.urls
+
+        def reload_urls():
+            clear_url_caches()
+            return importlib.reload(config.urls)
+
+        self.addCleanup(reload_urls)
+        with override_settings(
+            DIRECT_UPLOAD_BACKEND="apps.core.uploads.S3DirectUploadBackend"
+        ):
+            urls = reload_urls()
+        with self.assertRaises(NoReverseMatch):
+            reverse("local-direct-upload", urlconf=urls, kwargs={"token": "x"})
+
+        urls = reload_urls()
+        reverse("local-direct-upload", urlconf=urls, kwargs={"token": "x"})
@@ -3,17 +3,26 @@ Views for the users app.
 """
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
+from apps.authentication.services.email_service import send_verification_email
+from apps.core.permissions import HasRowPolicy, Owner, Staff
 from apps.core.views import ModelViewSet
 from apps.users.serializers import (
     ChangePasswordSerializer,
+    ProfilePictureCompleteSerializer,
+    ProfilePictureUploadSerializer,
     UserCreateSerializer,
     UserSerializer,
     UserUpdateSerializer,
 )
+from apps.users.services.profile_picture import (
+    complete_direct_upload,
+    create_direct_upload,
+)
 
 User = get_user_model()
 
@@ -25,6 +34,9 @@ class UserViewSet(ModelViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    search_fields = ["email", "first_name", "last_name"]
+    # Staff see everyone; other users only see their own profile
+    row_policy = Staff() | Owner("pk")
 
     def get_permissions(self):
         """
@@ -33,7 +45,7 @@ class UserViewSet(ModelViewSet):
         if self.action == "create":
             permission_classes = [AllowAny]
         else:
-            permission_classes = [IsAuthenticated]
+            permission_classes = [IsAuthenticated, HasRowPolicy]
         return [permission() for permission in permission_classes]
 
     def get_serializer_class(self):
@@ -46,17 +58,19 @@ class UserViewSet(ModelViewSet):
             return UserUpdateSerializer
         elif self.action == "change_password":
             return ChangePasswordSerializer
+        elif self.action == "profile_picture_upload":
+            return ProfilePictureUploadSerializer
+        elif self.action == "profile_picture_complete":
+            return ProfilePictureCompleteSerializer
         return UserSerializer
 
-    def get_queryset(self):
+    def perform_create(self, serializer):
         """
-        Return the queryset for the view.
+        Create the user and queue their verification email.
         """
-        # Regular users can only see their own profile
-        if not self.request.user.is_staff:
-            return User.objects.filter(id=self.request.user.id)
-        # Staff users can see all users
-        return User.objects.all()
+        with transaction.atomic():
+            user = serializer.save()
+            send_verification_email(user)
 
     @action(detail=False, methods=["get"])
     def me(self, request):
@@ -84,3 +98,51 @@ class UserViewSet(ModelViewSet):
         return self.get_response(
             message="Password changed successfully.", code=status.HTTP_200_OK
         )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="me/profile-picture/upload",
+        permission_classes=[IsAuthenticated],
+    )
+    def profile_picture_upload(self, request):
+        """
+        Return a URL for uploading a profile picture directly to storage.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        content_type = serializer.validated_data["content_type"]
+        upload = create_direct_upload(
+            request.user,
+            extension=ProfilePictureUploadSerializer.CONTENT_TYPES[content_type],
+            content_type=content_type,
+            size=serializer.validated_data["size"],
+            request=request,
+        )
+        return self.get_response(
+            data=upload,
+            message="Upload URL created successfully.",
+            code=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="me/profile-picture/complete",
+        permission_classes=[IsAuthenticated],
+    )
+    def profile_picture_complete(self, request):
+        """
+        Attach a directly uploaded file as the current user's profile picture.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = complete_direct_upload(
+            request.user, serializer.validated_data["upload_id"]
+        )
+        return self.get_response(
+            data=UserSerializer(user, context=self.get_serializer_context()).data,
+            message="Profile picture updated successfully.",
+        )
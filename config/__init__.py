@@ -1 +1,6 @@
+try:
+    from .celery import app as celery_app
+except ImportError:  # Celery is only installed with the production requirements
+    celery_app = None
 
+__all__ = ("celery_app",)
@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_asgi_application()
+
+# Pay the per-process first-request costs before accepting traffic; the
+# database phase is skipped, as sync views use executor threads' connections
+from apps.core.warmup import warm_up  # noqa: E402
+
+warm_up(asgi=True)
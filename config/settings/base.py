@@ -52,23 +52,53 @@ LOCAL_APPS = [
     "apps.core",
     "apps.users",
     "apps.authentication",
+    "apps.emails",
     "apps.api",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # First, so everything logged for a request carries its trace
+    "apps.core.middleware.tracing.TraceContextMiddleware",
+    "apps.core.middleware.sql_comments.SQLCommentMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Must come before RequestResponseMiddleware so the final body is compressed once
+    "apps.core.middleware.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.core.middleware.replicas.ReplicaRoutingMiddleware",
+    # Runs the SCOPED_MIDDLEWARE stack matching the request path
+    "apps.core.middleware.dispatch.PathMiddlewareDispatcher",
     "apps.core.middleware.request_response.RequestResponseMiddleware",
 ]
 
+# Middleware only some URL prefixes need; the longest matching prefix wins
+SCOPED_MIDDLEWARE = {
+    # The API authenticates with JWT and never uses sessions or messages
+    "/api/v1/": [],
+    # Schema and documentation pages
+    "/api/": ["django.middleware.clickjacking.XFrameOptionsMiddleware"],
+    # Admin and everything else
+    "": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+}
+
+# The admin and deploy checks only look for these middleware in MIDDLEWARE;
+# they run for the admin through SCOPED_MIDDLEWARE
+SILENCED_SYSTEM_CHECKS = [
+    "admin.E408",
+    "admin.E409",
+    "admin.E410",
+    "security.W002",
+    "security.W003",
+]
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -95,10 +125,57 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": env.db_url("DATABASE_URL", default="sqlite:///db.sqlite3"),
 }
+# Keep connections open across requests and ping them before reuse
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Optional in-process pool (psycopg 3) for threaded or async workers
+if env.bool("DB_POOL", default=False):
+    DATABASES["default"].update(
+        {
+            "ENGINE": "apps.core.db.backends.postgresql",
+            # Connections go back to the pool instead of staying on the thread
+            "CONN_MAX_AGE": 0,
+            "POOL": {
+                "MIN_SIZE": env.int("DB_POOL_MIN_SIZE", default=2),
+                "MAX_SIZE": env.int("DB_POOL_MAX_SIZE", default=10),
+                "TIMEOUT": env.float("DB_POOL_TIMEOUT", default=10.0),
+            },
+        }
+    )
+
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgresql://...@replica-1/app,...
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{index}"
+    DATABASES[alias] = env.db_url_config(url)
+    DATABASES[alias]["CONN_MAX_AGE"] = DATABASES["default"]["CONN_MAX_AGE"]
+    DATABASES[alias]["CONN_HEALTH_CHECKS"] = True
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["apps.core.db.routers.PrimaryReplicaRouter"]
+
+# Seconds a client reads from the primary after a write
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=10)
+REPLICA_PIN_COOKIE_NAME = "db_pin"
+# Replicas further behind than this many seconds are skipped
+REPLICA_MAX_LAG = env.float("REPLICA_MAX_LAG", default=5.0)
+REPLICA_LAG_CHECK_INTERVAL = env.float("REPLICA_LAG_CHECK_INTERVAL", default=5.0)
 
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["apps.authentication.backends.EmailBackend"]
+
+# Resolved permission sets, cached per user (seconds)
+PERMISSION_CACHE_TIMEOUT = env.int("PERMISSION_CACHE_TIMEOUT", default=3600)
+# How long a process trusts its in-memory copy before rechecking the cache
+PERMISSION_CACHE_LOCAL_TIMEOUT = env.float(
+    "PERMISSION_CACHE_LOCAL_TIMEOUT", default=5.0
+)
+PERMISSION_CACHE_LOCAL_SIZE = 10000
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -139,6 +216,22 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Image upload settings
+IMAGE_UPLOAD_MAX_SIZE = env.int("IMAGE_UPLOAD_MAX_SIZE", default=10 * 1024 * 1024)
+# Direct-to-storage uploads; production switches to presigned S3 URLs
+DIRECT_UPLOAD_BACKEND = env(
+    "DIRECT_UPLOAD_BACKEND", default="apps.core.uploads.LocalDirectUploadBackend"
+)
+# Seconds an upload URL and its intent stay valid
+DIRECT_UPLOAD_EXPIRES = env.int("DIRECT_UPLOAD_EXPIRES", default=900)
+# Dotted path to the callable that processes new profile pictures after commit
+PROFILE_PICTURE_RUNNER = env(
+    "PROFILE_PICTURE_RUNNER", default="apps.users.services.profile_picture.run_inline"
+)
+# Square thumbnail edge lengths in pixels, and formats to encode them in
+PROFILE_PICTURE_THUMBNAIL_SIZES = [64, 128, 256]
+PROFILE_PICTURE_THUMBNAIL_FORMATS = ["webp", "avif"]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -147,7 +240,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.CachedJWTAuthentication",
         # "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
@@ -157,8 +250,9 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.StandardResultsSetPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": (
+        "apps.core.filters.RowPolicyFilterBackend",
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
+        "apps.core.filters.IndexedSearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
     "DEFAULT_RENDERER_CLASSES": (
@@ -190,12 +284,35 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 }
 
+# PEM files of EdDSA/RS256 keys, newest first; when set they replace the
+# SIMPLE_JWT algorithm and key, and are published as a JWKS document
+JWT_KEY_FILES = env.list("JWT_KEY_FILES", default=[])
+JWKS_MAX_AGE = env.int("JWKS_MAX_AGE", default=3600)
+
+# How long a process trusts a token's signature and claims before verifying
+# them again; revocation is checked in the shared cache on every request
+TOKEN_CACHE_LOCAL_TIMEOUT = env.float("TOKEN_CACHE_LOCAL_TIMEOUT", default=60.0)
+TOKEN_CACHE_LOCAL_SIZE = 10000
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = env.list(
     "CORS_ALLOWED_ORIGINS", default=["http://localhost:3000", "http://127.0.0.1:3000"]
 )
 CORS_ALLOW_CREDENTIALS = True
 
+# Response compression settings
+# Codings in order of server preference; unavailable optional codecs are skipped
+COMPRESSION_ENCODINGS = env.list(
+    "COMPRESSION_ENCODINGS", default=["zstd", "br", "gzip"]
+)
+# Bodies smaller than this (in bytes) are sent uncompressed
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+# Above this size (in bytes) brotli is only used if nothing cheaper is accepted
+COMPRESSION_LARGE_SIZE = env.int("COMPRESSION_LARGE_SIZE", default=1024 * 1024)
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=5)
+COMPRESSION_ZSTD_LEVEL = env.int("COMPRESSION_ZSTD_LEVEL", default=3)
+
 # Email settings
 EMAIL_BACKEND = env(
     "EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend"
@@ -207,13 +324,67 @@ EMAIL_HOST_USER = env("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="noreply@example.com")
 
+# Email outbox settings
+# Dotted path to the callable that drains the outbox after a commit, or empty
+# to rely on the periodic drain_email_outbox command
+EMAIL_OUTBOX_RUNNER = env(
+    "EMAIL_OUTBOX_RUNNER", default="apps.emails.services.outbox.run_inline"
+)
+EMAIL_OUTBOX_BATCH_SIZE = env.int("EMAIL_OUTBOX_BATCH_SIZE", default=50)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int("EMAIL_OUTBOX_MAX_ATTEMPTS", default=6)
+# Retry delays in seconds, doubling after each failed attempt
+EMAIL_OUTBOX_RETRY_DELAY = env.int("EMAIL_OUTBOX_RETRY_DELAY", default=30)
+EMAIL_OUTBOX_MAX_RETRY_DELAY = env.int("EMAIL_OUTBOX_MAX_RETRY_DELAY", default=3600)
+# How long a worker may hold claimed messages before others can retry them
+EMAIL_OUTBOX_LEASE_SECONDS = env.int("EMAIL_OUTBOX_LEASE_SECONDS", default=300)
+
+# Base URL of the client application, used to build links in emails
+FRONTEND_URL = env("FRONTEND_URL", default="http://localhost:3000")
+
+# Warm each worker up at startup (see apps.core.warmup)
+WARMUP_ENABLED = env.bool("WARMUP_ENABLED", default=True)
+# Extra hot modules to import during warm-up
+WARMUP_IMPORTS = env.list("WARMUP_IMPORTS", default=[])
+# Leave connections to a post-fork hook; set by config/gunicorn.py
+WARMUP_DEFER_CONNECTIONS = env.bool("WARMUP_DEFER_CONNECTIONS", default=False)
+
+# Tracing
+# OpenTelemetry span export: "", "memory", "file" or "otlp" (see
+# apps.core.tracing); request and trace IDs are propagated regardless
+TRACING_EXPORTER = env("TRACING_EXPORTER", default="")
+TRACING_FILE = env("TRACING_FILE", default=str(BASE_DIR / "logs/traces.jsonl"))
+TRACING_SERVICE_NAME = env("TRACING_SERVICE_NAME", default="api")
+# sqlcommenter tags appended to each query: route, view, request_id,
+# traceparent (the last two make every request's SQL text unique); empty
+# disables tagging
+SQL_COMMENT_TAGS = env.list("SQL_COMMENT_TAGS", default=["route", "view"])
+# Queries taking at least this long are sampled with their plan (see
+# apps.core.db.slow_queries); 0 disables the recorder
+SLOW_QUERY_THRESHOLD_MS = env.float("SLOW_QUERY_THRESHOLD_MS", default=500)
+# Samples kept per process for the slow query endpoint
+SLOW_QUERY_BUFFER_SIZE = env.int("SLOW_QUERY_BUFFER_SIZE", default=100)
+# Run the query again under EXPLAIN ANALYZE for actual timings (PostgreSQL)
+SLOW_QUERY_EXPLAIN_ANALYZE = env.bool("SLOW_QUERY_EXPLAIN_ANALYZE", default=False)
+
+# Networks allowed to scrape /metrics when django_prometheus is installed;
+# the connecting address is checked, not X-Forwarded-For
+METRICS_ALLOWED_NETWORKS = env.list(
+    "METRICS_ALLOWED_NETWORKS",
+    default=["127.0.0.0/8", "::1/128", "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"],
+)
+
 # Logging configuration
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "trace_context": {"()": "apps.core.tracing.TraceContextFilter"},
+    },
     "formatters": {
         "verbose": {
-            "format": "{levelname} {asctime} {module} {message}",
+            "format": (
+                "{levelname} {asctime} {module} [{request_id} {trace_id}] {message}"
+            ),
             "style": "{",
         },
         "simple": {
@@ -226,12 +397,14 @@ LOGGING = {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "verbose",
+            "filters": ["trace_context"],
         },
         "file": {
             "level": "INFO",
             "class": "logging.FileHandler",
             "filename": BASE_DIR / "logs/django.log",
             "formatter": "verbose",
+            "filters": ["trace_context"],
         },
     },
     "loggers": {
@@ -48,3 +48,8 @@ SHELL_PLUS_IMPORTS = [
 # Logging
 LOGGING["loggers"]["django"]["level"] = "INFO"  # noqa: F405
 LOGGING["loggers"]["apps"]["level"] = "DEBUG"  # noqa: F405
+
+# Include actual row counts and timings in slow query plans
+SLOW_QUERY_EXPLAIN_ANALYZE = env.bool(  # noqa: F405
+    "SLOW_QUERY_EXPLAIN_ANALYZE", default=True
+)
@@ -4,9 +4,6 @@ Production settings for the project.
 These settings extend the base settings and add production-specific settings.
 """
 
-import sentry_sdk
-from sentry_sdk.integrations.django import DjangoIntegration
-
 from .base import *  # noqa
 from .base import env
 
@@ -31,9 +28,16 @@ CORS_ALLOWED_ORIGINS = env.list(
 )
 CORS_ALLOW_ALL_ORIGINS = False
 
+# Metrics, exported at /metrics to METRICS_ALLOWED_NETWORKS
+INSTALLED_APPS += ["django_prometheus"]  # noqa: F405
+
 # Static files
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")  # noqa: F405
+# Right after SecurityMiddleware, so static responses get HSTS and SSL redirects
+MIDDLEWARE.insert(  # noqa: F405
+    MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,  # noqa: F405
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+)
 
 # AWS S3 settings (if using S3 for static/media files)
 if env.bool("USE_S3", default=False):
@@ -52,10 +56,26 @@ if env.bool("USE_S3", default=False):
     
     # Media files
     DEFAULT_FILE_STORAGE = "apps.core.storage.MediaStorage"
+    # "hash" deduplicates identical uploads, "uuid" gives every upload its own key
+    MEDIA_STORAGE_NAMING = env("MEDIA_STORAGE_NAMING", default="hash")
+    # Maximum number of media URLs cached per process
+    MEDIA_URL_CACHE_SIZE = env.int("MEDIA_URL_CACHE_SIZE", default=10000)
     MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 
+    # Clients upload media straight to S3 with presigned POST policies
+    DIRECT_UPLOAD_BACKEND = "apps.core.uploads.S3DirectUploadBackend"
+
+# Process uploaded profile pictures on the Celery worker
+PROFILE_PICTURE_RUNNER = env(
+    "PROFILE_PICTURE_RUNNER", default="apps.users.services.profile_picture.run_celery"
+)
+
 # Sentry configuration for error tracking
 if env("SENTRY_DSN", default=None):
+    # Imported only when enabled: sentry_sdk is slow to import
+    import sentry_sdk
+    from sentry_sdk.integrations.django import DjangoIntegration
+
     sentry_sdk.init(
         dsn=env("SENTRY_DSN"),
         integrations=[DjangoIntegration()],
@@ -67,10 +87,16 @@ if env("SENTRY_DSN", default=None):
 # Cache settings
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # django-redis behind a per-process LRU (see apps.core.cache.backends)
+        "BACKEND": "apps.core.cache.backends.TieredRedisCache",
         "LOCATION": env("REDIS_URL", default="redis://redis:6379/0"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "LOCAL_MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES", default=10000),
+            # Longest a process may serve a value whose invalidation was lost
+            "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT", default=5),
+            # Rewritten on nearly every request, so not worth holding locally
+            "LOCAL_EXCLUDE": ["throttle_*"],
         },
     }
 }
@@ -83,8 +109,28 @@ EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="noreply@example.com")
+EMAIL_OUTBOX_RUNNER = env(
+    "EMAIL_OUTBOX_RUNNER", default="apps.emails.services.outbox.run_celery"
+)
+
+# Celery settings
+CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="redis://redis:6379/0")
+CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default=None)
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    # Retries failed messages once their backoff has passed, and catches
+    # messages whose wake-up was lost
+    "drain-email-outbox": {
+        "task": "emails.drain_outbox",
+        "schedule": 60.0,
+    },
+}
 
 # Logging
 LOGGING["handlers"]["file"]["level"] = "WARNING"  # noqa: F405
 LOGGING["loggers"]["django"]["level"] = "WARNING"  # noqa: F405
 LOGGING["loggers"]["apps"]["level"] = "WARNING"  # noqa: F405
+
+# EXPLAIN ANALYZE executes the query a second time; never on live traffic
+SLOW_QUERY_EXPLAIN_ANALYZE = False
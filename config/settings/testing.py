@@ -15,8 +15,15 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
+    },
+    # A separate database standing in for an unsynchronised read replica;
+    # replica routing tests opt in with DATABASE_REPLICAS=["replica"]
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
+DATABASE_REPLICAS = []
 
 # Disable password hashing to speed up tests
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
@@ -27,6 +34,9 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 # Disable logging during tests
 LOGGING = {}
 
+# Tests that need the slow query recorder install it themselves
+SLOW_QUERY_THRESHOLD_MS = 0
+
 # Use a faster password hasher for testing
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
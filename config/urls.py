@@ -6,6 +6,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
+from django.utils.module_loading import import_string
 
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -13,13 +14,26 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from apps.core.uploads import LocalDirectUploadBackend
+from apps.core.views import SlowQueryListView, metrics_view
+
 # API URL patterns
 api_urlpatterns = [
     path("users/", include("apps.users.urls")),
     path("auth/", include("apps.authentication.urls")),
+    path(
+        "diagnostics/slow-queries/",
+        SlowQueryListView.as_view(),
+        name="slow-queries",
+    ),
     # Add other API endpoints here
 ]
 
+# The local upload endpoint writes straight to default storage, so it only
+# exists while it stands in for presigned storage URLs
+if issubclass(import_string(settings.DIRECT_UPLOAD_BACKEND), LocalDirectUploadBackend):
+    api_urlpatterns += [path("uploads/", include("apps.core.urls"))]
+
 # Main URL patterns
 urlpatterns = [
     # Admin
@@ -43,6 +57,12 @@ urlpatterns = [
     ),
 ]
 
+# Prometheus metrics
+if "django_prometheus" in settings.INSTALLED_APPS:
+    urlpatterns += [
+        path("metrics", metrics_view, name="prometheus-django-metrics"),
+    ]
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_wsgi_application()
+
+# Pay the per-process first-request costs before accepting traffic
+from apps.core.warmup import warm_up  # noqa: E402
+
+warm_up()